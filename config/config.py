@@ -12,6 +12,8 @@ NEWS_API_KEY = os.getenv('NEWS_API_KEY', '')
 ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY', '')
 OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY', '')
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+NCBI_API_KEY = os.getenv('NCBI_API_KEY', '')  # PubMed E-utilities: 10 requests/second instead of 3
+STACKEXCHANGE_KEY = os.getenv('STACKEXCHANGE_KEY', '')  # raises the daily quota from 300 to 10,000 requests
 REDDIT_CLIENT_ID = os.getenv('REDDIT_CLIENT_ID', '')
 REDDIT_CLIENT_SECRET = os.getenv('REDDIT_CLIENT_SECRET', '')
 
@@ -20,9 +22,247 @@ DEFAULT_DELAY = 1  # seconds between requests
 MAX_RETRIES = 3
 TIMEOUT = 30  # seconds
 
+# HTTP Settings (one pooled session shared by every scraper in the process)
+USER_AGENT = 'Botsy Information Scraper 1.0'
+HTTP_POOL_CONNECTIONS = 32  # distinct hosts kept in the default adapter's pool cache
+HTTP_POOL_MAXSIZE = 10  # keep-alive connections per host unless overridden below
+HTTP_HOST_POOL_SIZES = {  # hosts hit with many concurrent requests
+    'hacker-news.firebaseio.com': 32,
+    'api.github.com': 8,
+    'export.arxiv.org': 4,
+    'api.stackexchange.com': 8,
+    'eutils.ncbi.nlm.nih.gov': 4
+}
+
+# Retry Settings (per host; other hosts use 'default'). Only connection
+# errors, timeouts, 5xx and 429 are retried, with full-jitter backoff or the
+# server's Retry-After, all within 'deadline' seconds per call.
+RETRY_POLICIES = {
+    'default': {
+        'max_attempts': MAX_RETRIES,
+        'backoff_base': 1.0,
+        'backoff_max': 30.0,
+        'connect_timeout': 5.0,
+        'read_timeout': TIMEOUT,
+        'deadline': 90.0
+    },
+    'www.reddit.com': {'backoff_base': 5.0, 'backoff_max': 120.0, 'deadline': 180.0},  # strict 429s
+    'api.github.com': {'max_attempts': 2},  # rate-limit 403s are not retried
+    'api.stackexchange.com': {'backoff_base': 5.0, 'backoff_max': 60.0},
+    'hacker-news.firebaseio.com': {'read_timeout': 10.0, 'deadline': 30.0},
+    # Latency-sensitive sources: hedge a slow GET with a second copy after the host's p95
+    'feeds.finance.yahoo.com': {'hedge': True},
+    'www.alphavantage.co': {'hedge': True},
+    'www.espn.com': {'hedge': True}
+}
+
+# Hedged request Settings
+HEDGE_BUDGET_RATIO = 0.05  # hedges allowed per hedge-eligible request, process-wide
+HEDGE_BURST = 2  # hedges allowed before the ratio has any requests to work from
+HEDGE_WORKERS = 16  # threads running hedged requests
+
 # Output Settings
 OUTPUT_DIR = 'data'
-LOG_LEVEL = 'INFO'
+# 'partitioned': compressed NDJSON parts under data/<category>/<yyyy>/<mm>/<dd>/ with a
+# per-partition manifest; 'json': one pretty-printed JSON file per run directly in data/
+OUTPUT_LAYOUT = os.getenv('BOTSY_OUTPUT_LAYOUT', 'partitioned')
+OUTPUT_CODEC = 'auto'  # 'zstd', 'gzip', or 'auto' (zstd when the zstandard package is installed)
+OUTPUT_ROTATE_BYTES = 64 * 1024 * 1024  # start a new part file past this size
+OUTPUT_ROTATE_SECONDS = 3600  # ...or once a part has been open this long
+LOG_LEVEL = os.getenv('BOTSY_LOG_LEVEL', 'INFO')  # REQUEST logs every HTTP call
+
+# Feed Settings
+FEED_FETCH_WORKERS = 8  # feeds downloaded concurrently per scraper
+FEED_PARSE_WORKERS = None  # feed parsing processes; None = one per CPU
+FEED_POLL_INTERVAL = 900  # default seconds between polls of a feed
+FEED_SWEEP_WINDOW = 60  # seconds a queue worker reuses fetched feeds across units
+FEEDS_FILE = os.getenv('BOTSY_FEEDS_FILE', 'config/feeds.json')  # optional extra feeds, same shape as FEEDS
+
+# Feed registry: each feed is fetched once per sweep and routed to every
+# subscribing category; 'categories' maps category -> max entries taken.
+FEEDS = {
+    'reuters': {
+        'url': 'https://feeds.reuters.com/reuters/topNews',
+        'categories': {'news': 10}
+    },
+    'bbc': {
+        'url': 'https://feeds.bbci.co.uk/news/rss.xml',
+        'categories': {'news': 10}
+    },
+    'techcrunch': {
+        'url': 'https://techcrunch.com/feed/',
+        'categories': {'news': 10, 'technology': 5}
+    },
+    'reuters_tech': {
+        'url': 'https://feeds.reuters.com/reuters/technologyNews',
+        'categories': {'news': 10}
+    },
+    'the_verge': {
+        'url': 'https://www.theverge.com/rss/index.xml',
+        'categories': {'technology': 5}
+    },
+    'ars_technica': {
+        'url': 'https://feeds.arstechnica.com/arstechnica/index',
+        'categories': {'technology': 5}
+    },
+    'wired': {
+        'url': 'https://www.wired.com/feed/rss',
+        'categories': {'technology': 5}
+    },
+    'yahoo_finance': {
+        'url': 'https://feeds.finance.yahoo.com/rss/2.0/headline',
+        'categories': {'finance': 10},
+        'source': 'Yahoo Finance',
+        'poll_interval': 300
+    },
+    'cdc': {
+        'url': 'https://tools.cdc.gov/api/v2/resources/media/316422.rss',
+        'categories': {'health': 10},
+        'source': 'CDC RSS',
+        'poll_interval': 3600
+    },
+    'who': {
+        'url': 'https://www.who.int/rss-feeds/news-english.xml',
+        'categories': {'health': 20},
+        'source': 'WHO RSS',
+        'poll_interval': 3600
+    },
+    'espn': {
+        'url': 'https://www.espn.com/espn/rss/news',
+        'categories': {'sports': 10},
+        'source': 'ESPN RSS',
+        'poll_interval': 600
+    }
+}
+
+# Storage Settings (SQLAlchemy URL; one table per category)
+DATABASE_URL = os.getenv('BOTSY_DATABASE_URL', f'sqlite:///{OUTPUT_DIR}/botsy.db')
+STORAGE_BATCH_SIZE = 500  # rows per upsert transaction
+
+# Source Health Settings (per host, persisted across runs)
+HEALTH_DB_PATH = os.path.join(OUTPUT_DIR, 'health.db')
+HEALTH_WINDOW = 100  # recent requests kept per host
+HEALTH_FAILURE_THRESHOLD = 5  # consecutive transient failures that open a circuit
+HEALTH_OPEN_SECONDS = 600  # open circuits reject requests this long before a half-open probe
+HEALTH_MIN_SAMPLES = 20  # successful requests needed before timeouts adapt
+HEALTH_TIMEOUT_MULTIPLIER = 3.0  # adaptive read timeout = observed p99 latency x this
+HEALTH_MIN_TIMEOUT = 2.0  # adaptive read timeouts never drop below this (seconds)
+
+# Work unit Settings
+UNIT_RETRIES = 1  # extra passes over failed work units at the end of an in-process scrape
+
+# Work queue Settings (--enqueue / --worker)
+WORK_QUEUE_URL = os.getenv('BOTSY_QUEUE_URL', f'sqlite:///{OUTPUT_DIR}/queue.db')
+WORK_QUEUE_VISIBILITY_TIMEOUT = 600  # seconds a lease lasts; running workers keep extending it
+WORK_QUEUE_MAX_ATTEMPTS = 3  # attempts before a unit is dead-lettered
+WORK_QUEUE_RETRY_DELAY = 60  # seconds before a failed unit is retried
+WORK_QUEUE_POLL_INTERVAL = 5  # seconds an idle worker waits for leased units to finish or reappear
+
+# Profiling Settings (--profile cpu|memory)
+PROFILE_DIR = 'profiles'
+PROFILE_TOP_N = 15  # allocation sites written per category in memory mode
+PROFILE_MEMORY_FRAMES = 1  # traceback depth kept by tracemalloc; more is slower
+
+# Adaptive schedule Settings (--schedule)
+SCHEDULE_DB_PATH = os.path.join(OUTPUT_DIR, 'schedule.db')
+SCHEDULE_DEFAULT_INTERVAL = 1800  # starting interval for units without a feed poll_interval
+SCHEDULE_BOUNDS = {  # (min, max) poll interval in seconds per category
+    'default': (300, 6 * 3600),
+    'finance': (60, 3600),
+    'sports': (120, 3600),
+    'weather': (900, 3 * 3600),
+    'research': (3600, 24 * 3600),
+    'government': (3600, 24 * 3600),
+}
+SCHEDULE_BACKOFF = 1.5  # interval multiplier after a poll with nothing new
+SCHEDULE_SPEEDUP = 0.5  # interval multiplier after a poll with some new records
+SCHEDULE_BURST_RATIO = 0.5  # share of new records that drops the interval straight to the minimum
+SCHEDULE_BUDGET = 20  # most units polled per tick
+SCHEDULE_TICK = 30  # longest sleep between ticks, in seconds
+SCHEDULE_SEEN_RETENTION = 14 * 24 * 3600  # seconds a key is remembered after it stops appearing
+
+# Change feed Settings (--changes-only)
+CDC_STATE_PATH = os.path.join(OUTPUT_DIR, 'changes.db')
+CDC_IGNORE_FIELDS = ('scraped_at',)  # fields that differ on every sweep and never count as a change
+
+# Hacker News Settings
+HN_MODE = os.getenv('BOTSY_HN_MODE', 'sync')  # 'sync': incremental mirror via maxitem/updates; 'top': top 20 stories
+HN_DB_PATH = os.path.join(OUTPUT_DIR, 'hackernews.db')
+HN_SYNC_WORKERS = 16  # concurrent item fetches
+HN_SYNC_BATCH = 100  # new item IDs per batch; the watermark advances after each batch
+HN_SYNC_BACKFILL = 500  # recent items fetched by the very first sync
+HN_SYNC_MAX_ITEMS = 5000  # new items per sync at most; a backlog is worked off over several syncs
+
+# GitHub Settings
+GITHUB_CACHE_PATH = os.path.join(OUTPUT_DIR, 'github_cache.db')  # ETags and bodies for conditional requests
+GITHUB_TRENDING_DAYS = 30  # trending = most starred among repositories created this recently
+GITHUB_LANGUAGE_WORKERS = 4  # languages searched concurrently
+GITHUB_GRAPHQL_BATCH = 50  # repositories enriched per GraphQL query
+GITHUB_RATE_RESERVE = 1  # calls left unused per resource before waiting for the reset
+GITHUB_MAX_RATE_WAIT = 90  # longest wait (seconds) for a quota reset before giving up on a call
+
+# Stack Exchange Settings
+STACKEXCHANGE_SITE = 'stackoverflow'
+STACKEXCHANGE_TAGS = [
+    'python', 'javascript', 'typescript', 'java', 'c#', 'c++', 'c', 'go', 'rust', 'kotlin',
+    'swift', 'php', 'ruby', 'scala', 'r', 'sql', 'postgresql', 'mysql', 'sqlite', 'mongodb',
+    'redis', 'elasticsearch', 'apache-kafka', 'apache-spark', 'pandas', 'numpy', 'django', 'flask', 'fastapi',
+    'reactjs', 'vue.js', 'angular', 'node.js', 'next.js', 'spring-boot', '.net', 'docker', 'kubernetes',
+    'terraform', 'amazon-web-services', 'azure', 'google-cloud-platform', 'linux', 'bash', 'git',
+    'tensorflow', 'pytorch', 'machine-learning', 'large-language-model', 'webassembly'
+]
+# Tags ORed into one query; watermarks are kept per group, so regrouping backfills the new groups
+STACKEXCHANGE_TAG_GROUP_SIZE = 10
+STACKEXCHANGE_STATE_PATH = os.path.join(OUTPUT_DIR, 'stackexchange.db')
+STACKEXCHANGE_BACKFILL = 24 * 3600  # seconds of activity fetched the first time a tag group is synced
+STACKEXCHANGE_MAX_PAGES = 10  # pages of 100 per tag group per run; a larger backlog carries over
+STACKEXCHANGE_QUOTA_RESERVE = 50  # stop harvesting with this many requests of the daily quota left
+
+# E-commerce Settings
+ECOMMERCE_BASE_URL = os.getenv('BOTSY_ECOMMERCE_URL', 'https://fakestoreapi.com')  # any Fake Store-compatible API
+ECOMMERCE_DB_PATH = os.path.join(OUTPUT_DIR, 'prices.db')
+ECOMMERCE_PAGE_SIZE = 100  # products per listing page (limit/offset)
+ECOMMERCE_MAX_PAGES = 10000  # listing pages per category at most
+ECOMMERCE_WORKERS = 8  # listing pages and product details fetched concurrently
+
+# Government (CKAN) Settings
+CKAN_BASE_URL = 'https://catalog.data.gov'
+CKAN_QUERIES = {  # package_search filters per configured agency / data type; others search their name
+    'SEC': {'fq': 'organization:sec-gov'},
+    'FDA': {'fq': 'organization:fda-gov'},
+    'EPA': {'fq': 'organization:epa-gov'},
+    'press_releases': {'q': '"press release"'},
+    'regulations': {'q': 'regulation OR regulations'}
+}
+CKAN_STATE_PATH = os.path.join(OUTPUT_DIR, 'ckan.db')
+CKAN_BACKFILL_DAYS = 30  # history harvested the first time a query runs
+CKAN_MAX_PAGES = 20  # pages of 1000 per query per run; a larger backlog carries over
+CKAN_WORKERS = 4  # queries run concurrently
+CKAN_NOTES_CHARS = 500  # dataset descriptions are cut to this length
+
+# PubMed Settings (shared by research and health)
+PUBMED_CACHE_PATH = os.path.join(OUTPUT_DIR, 'pubmed_cache.db')  # parsed articles by PMID
+PUBMED_BATCH = 200  # PMIDs per efetch call
+PUBMED_TOPIC_RESULTS = 20  # newest PMIDs taken per health topic
+PUBMED_WORKERS = 3  # topic searches run concurrently (E-utilities allows 3/s without a key)
+
+# Full-text search index (SQLite FTS5)
+SEARCH_INDEX_PATH = os.path.join(OUTPUT_DIR, 'search.db')
+
+# Article full-text extraction (--extract)
+EXTRACTION_FETCH_WORKERS = 8  # concurrent page downloads
+EXTRACTION_PROCESS_WORKERS = None  # extraction processes; None = one per CPU
+EXTRACTION_MAX_BYTES = 5 * 1024 * 1024  # ignore the rest of very large pages
+EXTRACTION_CACHE_PATH = os.path.join(OUTPUT_DIR, 'extraction_cache.db')
+
+# Streaming pipeline: records buffered before each flush to stages and sinks
+PIPELINE_BUFFER_SIZE = 100
+
+# Logging Settings
+LOG_DIR = 'logs'
+LOG_FILE_FORMAT = 'json'  # 'json' (JSON lines) or 'text'
+LOG_MAX_BYTES = 10 * 1024 * 1024  # rotate the log file at 10 MB
+LOG_BACKUP_COUNT = 5
 
 # Category-specific settings
 CATEGORIES = {
@@ -40,7 +280,7 @@ CATEGORIES = {
     },
     'technology': {
         'languages': ['Python', 'JavaScript', 'Go', 'Rust'],
-        'trending_repos': 10
+        'trending_repos': 100  # per language
     },
     'social': {
         'platforms': ['reddit'],
@@ -64,6 +304,6 @@ CATEGORIES = {
     },
     'health': {
         'topics': ['covid-19', 'vaccine', 'mental health'],
-        'source_types': ['pubmed', 'who']
+        'source_types': ['pubmed', 'cdc', 'who']  # PubMed searches plus these registry feeds
     }
 }
\ No newline at end of file
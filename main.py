@@ -5,6 +5,12 @@ Main orchestrator for the Botsy information scraping framework.
 import sys
 import os
 import argparse
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from itertools import zip_longest
 from datetime import datetime
 from typing import Dict, List, Any
 
@@ -24,12 +30,36 @@ from scrapers.ecommerce.ecommerce_scraper import EcommerceScraper
 from scrapers.health.health_scraper import HealthScraper
 
 from utils.logger import setup_logger
+from utils.pipeline import Pipeline, JsonFileSink
+from utils.partitioned import PartitionedSink
+from utils.profiling import MODES as PROFILE_MODES, CategoryProfiler
+from utils.storage import Storage, StorageSink
+from utils.search import SearchIndex, SearchIndexSink, parse_since
+from utils.extraction import ArticleExtractionStage
+from utils.cdc import ChangeFeedSink
+from utils.feed_registry import FeedSweep
+from utils.health import get_health_registry
+from utils.hedge import budget as hedge_budget
+from utils.deadline import DeadlineExceeded, expired, time_left, time_limit
+from utils.scheduler import PollScheduler
+from utils.scraper_base import UNIT_FAILED, UNIT_OK, UNIT_TIMED_OUT, WorkUnit, WorkUnitError
+from utils.work_queue import QueueBackend, WorkItem, open_queue
+from config.config import (FEED_SWEEP_WINDOW, OUTPUT_LAYOUT, SCHEDULE_BUDGET, SCHEDULE_TICK, WORK_QUEUE_POLL_INTERVAL,
+                           WORK_QUEUE_RETRY_DELAY, WORK_QUEUE_URL, WORK_QUEUE_VISIBILITY_TIMEOUT)
 
 class BotsyOrchestrator:
     """Main orchestrator for all scraping categories."""
     
-    def __init__(self):
+    def __init__(self, store: bool = False, index: bool = False, extract: bool = False,
+                 profile: str = None, changes_only: bool = False):
         self.logger = setup_logger('botsy_main')
+        self.extract = extract
+        self.changes_only = changes_only
+        self.profiler = CategoryProfiler(profile) if profile else None
+        # Work unit outcomes (label -> ok/failed/timed_out) per category run
+        self.unit_status: Dict[str, Dict[str, str]] = {}
+        self.storage = Storage() if store else None
+        self.search_index = SearchIndex() if index else None
         self.scrapers = {
             'news': NewsScraper,
             'finance': FinanceScraper,
@@ -43,45 +73,323 @@ class BotsyOrchestrator:
             'health': HealthScraper
         }
     
-    def run_category(self, category: str) -> List[Dict[str, Any]]:
-        """Run scraper for a specific category."""
+    def run_category(self, category: str, feed_sweep: FeedSweep = None,
+                     deadline: float = None) -> List[Dict[str, Any]]:
+        """Run scraper for a specific category, within ``deadline`` seconds if given."""
         if category not in self.scrapers:
-            self.logger.error(f"Unknown category: {category}")
+            self.logger.error("Unknown category: %s", category)
             return []
         
         try:
             scraper_class = self.scrapers[category]
             scraper = scraper_class()
+            scraper.feed_sweep = feed_sweep
             
-            self.logger.info(f"Starting scraper for category: {category}")
+            self.logger.info("Starting scraper for category: %s", category)
             start_time = datetime.now()
+            hedges_before = hedge_budget.stats()
             
-            data = scraper.scrape()
-            
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
-            self.logger.info(f"Completed {category} scraping in {duration:.2f} seconds. Collected {len(data)} items.")
+            with time_limit(deadline), self._profile(category):
+                data = scraper.scrape()
+                self.unit_status[category] = scraper.unit_status
+                
+                end_time = datetime.now()
+                duration = (end_time - start_time).total_seconds()
+                
+                self.logger.info("Completed %s scraping in %.2f seconds. Collected %s items.", category, duration, len(data))
+                self.log_hedge_stats(category, hedges_before)
+                
+                if self.storage is not None:
+                    self.storage.upsert(category, data)
+                if self.search_index is not None:
+                    self.search_index.add(category, data)
             
             return data
             
         except Exception as e:
-            self.logger.error(f"Error running {category} scraper: {e}")
+            self.logger.error("Error running %s scraper: %s", category, e)
             return []
     
-    def run_all(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Run all scrapers."""
+    def _profile(self, category: str):
+        """Profiling context for one category run (a no-op without --profile)."""
+        return self.profiler.profile(category) if self.profiler else nullcontext()
+    
+    def run_all(self, deadline: float = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Run all scrapers, within ``deadline`` seconds overall if given."""
         self.logger.info("Starting comprehensive scraping for all categories")
         results = {}
+        feed_sweep = FeedSweep()
         
-        for category in self.scrapers.keys():
-            results[category] = self.run_category(category)
+        with time_limit(deadline):
+            for category in self.scrapers.keys():
+                results[category] = self.run_category(category, feed_sweep)
         
+        self.logger.info("Feed sweep fetched %s unique feeds for %s subscriptions", feed_sweep.fetched, feed_sweep.requested)
+        self.log_hedge_stats()
         total_items = sum(len(data) for data in results.values())
-        self.logger.info(f"Comprehensive scraping completed. Total items collected: {total_items}")
+        self.logger.info("Comprehensive scraping completed. Total items collected: %s", total_items)
         
         return results
     
+    def build_pipeline(self, category: str) -> Pipeline:
+        """Create the stages and sinks a streamed category run writes through."""
+        if OUTPUT_LAYOUT == 'partitioned':
+            sinks = [PartitionedSink(category)]
+        else:
+            sinks = [JsonFileSink(category, f"stream_{datetime.now().strftime('%Y%m%d_%H%M%S')}")]
+        if self.changes_only:
+            sinks = [ChangeFeedSink(sinks[0], category)]
+        if self.storage is not None:
+            sinks.append(StorageSink(self.storage, category))
+        if self.search_index is not None:
+            sinks.append(SearchIndexSink(self.search_index, category))
+        stages = [ArticleExtractionStage()] if self.extract else []
+        return Pipeline(sinks, stages)
+    
+    def stream_category(self, category: str, pipeline: Pipeline = None, feed_sweep: FeedSweep = None,
+                        deadline: float = None) -> int:
+        """Stream a category's records through a pipeline; returns the record count."""
+        if category not in self.scrapers:
+            self.logger.error("Unknown category: %s", category)
+            return 0
+        
+        try:
+            scraper = self.scrapers[category]()
+            scraper.feed_sweep = feed_sweep
+            pipeline = pipeline or self.build_pipeline(category)
+            
+            self.logger.info("Streaming scraper for category: %s", category)
+            start_time = datetime.now()
+            hedges_before = hedge_budget.stats()
+            
+            with time_limit(deadline), self._profile(category):
+                count = pipeline.run(scraper.iter_scrape())
+                self.unit_status[category] = scraper.unit_status
+            
+            duration = (datetime.now() - start_time).total_seconds()
+            self.logger.info("Streamed %s in %.2f seconds. Wrote %s items.", category, duration, count)
+            self.log_hedge_stats(category, hedges_before)
+            
+            return count
+            
+        except Exception as e:
+            self.logger.error("Error streaming %s scraper: %s", category, e)
+            return 0
+    
+    def stream_all(self, deadline: float = None) -> Dict[str, int]:
+        """Stream all scrapers one after another, keeping only per-category counts."""
+        self.logger.info("Starting streamed scraping for all categories")
+        feed_sweep = FeedSweep()
+        with time_limit(deadline):
+            counts = {category: self.stream_category(category, feed_sweep=feed_sweep) for category in self.scrapers}
+        self.logger.info("Feed sweep fetched %s unique feeds for %s subscriptions", feed_sweep.fetched, feed_sweep.requested)
+        self.log_hedge_stats()
+        self.logger.info("Streamed scraping completed. Total items written: %s", sum(counts.values()))
+        return counts
+    
+    def plan(self, categories: List[str]) -> List[WorkUnit]:
+        """Plan every category's work units, interleaved so long categories don't queue up behind each other."""
+        plans = [self.scrapers[category]().plan() for category in categories]
+        return [unit for round_ in zip_longest(*plans) for unit in round_ if unit is not None]
+    
+    def enqueue(self, categories: List[str], queue: QueueBackend) -> int:
+        """Coordinator: add the categories' work units (one feed, symbol, subreddit...) to the queue."""
+        count = queue.enqueue(unit.to_payload() for unit in self.plan(categories))
+        self.logger.info("Enqueued %s work units from %s categories", count, len(categories))
+        return count
+    
+    def work(self, queue: QueueBackend) -> int:
+        """Worker: lease, run and ack units until the queue has nothing left; returns units completed.
+        
+        Each unit's records go straight into its category's pipeline, which stays
+        open across units and is closed when the worker finishes.
+        """
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        completed = 0
+        feed_sweep, sweep_started = None, 0.0
+        scrapers = {}
+        pipelines = {}
+        self.logger.info("Worker %s started", worker)
+        
+        try:
+            while True:
+                item = queue.lease(worker, WORK_QUEUE_VISIBILITY_TIMEOUT)
+                if item is None:
+                    if not queue.pending():
+                        break
+                    # Other workers hold leases; wait in case one expires or is retried
+                    time.sleep(WORK_QUEUE_POLL_INTERVAL)
+                    continue
+                
+                unit = WorkUnit.from_payload(item.payload)
+                self.logger.info("Leased %s (attempt %s of %s)", unit.label, item.attempts, item.max_attempts)
+                stop = threading.Event()
+                heartbeat = threading.Thread(target=self._extend_lease, args=(queue, item, stop), daemon=True)
+                heartbeat.start()
+                try:
+                    if feed_sweep is None or time.monotonic() - sweep_started > FEED_SWEEP_WINDOW:
+                        # Units leased close together share feeds; older results are refetched
+                        feed_sweep, sweep_started = FeedSweep(), time.monotonic()
+                    if unit.category not in scrapers:
+                        scrapers[unit.category] = self.scrapers[unit.category]()
+                        pipelines[unit.category] = self.build_pipeline(unit.category)
+                    scrapers[unit.category].feed_sweep = feed_sweep
+                    records = scrapers[unit.category].execute(unit)
+                    pipelines[unit.category].write(records)
+                except WorkUnitError as e:
+                    if e.open_circuits:
+                        # The unit never reached its host; wait for the half-open probe instead of burning attempts
+                        delay = max(WORK_QUEUE_RETRY_DELAY, max(circuit.retry_after for circuit in e.open_circuits))
+                        hosts = ', '.join(sorted({circuit.host for circuit in e.open_circuits}))
+                        self.logger.warning("Work unit %s hit an open circuit (%s); retrying in %.0fs",
+                                            unit.label, hosts, delay)
+                        queue.nack(item, str(e), delay=delay, count_attempt=False)
+                    else:
+                        self.logger.warning("Work unit %s failed: %s", unit.label, e)
+                        queue.nack(item, str(e))
+                except Exception as e:
+                    self.logger.warning("Work unit %s failed: %s", unit.label, e)
+                    queue.nack(item, str(e))
+                else:
+                    if queue.ack(item):
+                        completed += 1
+                    else:
+                        self.logger.warning("Lease on %s expired before it finished", unit.label)
+                finally:
+                    stop.set()
+                    heartbeat.join()
+        finally:
+            for pipeline in pipelines.values():
+                pipeline.close()
+            for scraper in scrapers.values():
+                scraper.close()
+        
+        self.logger.info("Worker %s finished %s units", worker, completed)
+        return completed
+    
+    def schedule(self, categories: List[str], deadline: float = None) -> int:
+        """Poll the categories' work units as they fall due, adapting each unit's interval; returns units run.
+        
+        Runs until interrupted (or until the deadline). Each tick re-plans, polls
+        at most SCHEDULE_BUDGET due units through their category's pipeline and
+        sleeps until the next unit is due.
+        """
+        scheduler = PollScheduler()
+        scrapers = {category: self.scrapers[category]() for category in categories}
+        pipelines = {}
+        polled = 0
+        self.logger.info("Scheduler started for %s", ', '.join(categories))
+        
+        try:
+            with time_limit(deadline):
+                while not expired():
+                    units = self.plan(categories)
+                    feed_sweep = FeedSweep()  # feeds shared by units due in the same tick are fetched once
+                    for unit in scheduler.due(units, limit=SCHEDULE_BUDGET):
+                        scraper = scrapers[unit.category]
+                        scraper.feed_sweep = feed_sweep
+                        try:
+                            records = scraper.execute(unit)
+                        except (WorkUnitError, DeadlineExceeded) as e:
+                            self.logger.warning("Scheduled unit %s failed: %s", unit.label, e)
+                            scheduler.record_failure(unit)
+                            continue
+                        if unit.category not in pipelines:
+                            pipelines[unit.category] = self.build_pipeline(unit.category)
+                        pipelines[unit.category].write(records)
+                        interval = scheduler.record_poll(unit, records)
+                        polled += 1
+                        self.logger.info("Polled %s: %s records, next in %.0fs", unit.label, len(records), interval)
+                    scheduler.prune()
+        
+                    next_due = scheduler.next_due(units)
+                    wait = SCHEDULE_TICK if next_due is None else max(1.0, min(SCHEDULE_TICK, next_due - time.time()))
+                    left = time_left()
+                    time.sleep(wait if left is None else min(wait, left))
+        except KeyboardInterrupt:
+            self.logger.info("Scheduler interrupted")
+        finally:
+            for pipeline in pipelines.values():
+                pipeline.close()
+            for scraper in scrapers.values():
+                scraper.close()
+            scheduler.close()
+        
+        self.logger.info("Scheduler polled %s units", polled)
+        return polled
+    
+    def show_schedule(self):
+        """Print each scheduled unit's current interval, poll count and new records seen."""
+        scheduler = PollScheduler()
+        now = time.time()
+        print("\n🗓️  POLL SCHEDULE\n" + "="*50)
+        print(f"{'unit':<55} {'interval':>9} {'due in':>8} {'polls':>6} {'new':>6}")
+        for source in scheduler.stats():
+            print(f"{source['label']:<55} {source['interval']:>8.0f}s {max(0, source['next_due'] - now):>7.0f}s "
+                  f"{source['polls']:>6} {source['new_items']:>6}")
+        scheduler.close()
+    
+    def _extend_lease(self, queue: QueueBackend, item: WorkItem, stop: threading.Event):
+        """Keep a lease alive while its unit runs."""
+        while not stop.wait(WORK_QUEUE_VISIBILITY_TIMEOUT / 3):
+            if not queue.extend(item, WORK_QUEUE_VISIBILITY_TIMEOUT):
+                return
+    
+    def show_queue_status(self, queue: QueueBackend):
+        """Print work unit counts by state and any dead-lettered units."""
+        print("\n📬 WORK QUEUE\n" + "="*50)
+        for status, count in sorted(queue.counts().items()):
+            print(f"{status:<10} {count}")
+        for dead in queue.dead_letters():
+            print(f"\n☠️  {dead['payload']} after {dead['attempts']} attempts: {dead['last_error']}")
+    
+    def search(self, query: str, category: str = None, since: str = None, limit: int = 20):
+        """Print ranked full-text search results from the local index."""
+        index = self.search_index or SearchIndex()
+        results = index.search(query, category=category, since=parse_since(since) if since else None, limit=limit)
+        
+        print(f"\n🔍 {len(results)} RESULTS FOR: {query}\n" + "="*50)
+        for position, result in enumerate(results, 1):
+            print(f"\n{position}. [{result['category']}] {result['title']}")
+            print(f"   {result['source']} | {result['scraped_at'][:19]} | {result['url']}")
+            if result['snippet']:
+                print(f"   {result['snippet']}")
+        
+        return results
+    
+    def print_run_summary(self):
+        """Print per-category work unit outcomes, listing sources that timed out or failed."""
+        print("\n🧾 RUN SUMMARY\n" + "="*50)
+        print(f"{'category':<12} {'ok':>4} {'failed':>7} {'timed out':>10}")
+        for category, statuses in self.unit_status.items():
+            counts = Counter(statuses.values())
+            print(f"{category:<12} {counts[UNIT_OK]:>4} {counts[UNIT_FAILED]:>7} {counts[UNIT_TIMED_OUT]:>10}")
+        for category, statuses in self.unit_status.items():
+            for label, status in statuses.items():
+                if status != UNIT_OK:
+                    print(f"  {status:<10} {label}")
+    
+    def log_hedge_stats(self, category: str = None, since: Dict[str, float] = None):
+        """Log how many latency-sensitive requests were hedged and how often the hedge won.
+        
+        With ``since`` (an earlier ``hedge_budget.stats()``) only requests made after it count.
+        """
+        stats = hedge_budget.stats()
+        since = since or {}
+        eligible, hedges, wins = (stats[key] - since.get(key, 0) for key in ('requests', 'hedges', 'hedge_wins'))
+        if eligible:
+            self.logger.info("%sHedged %s of %s eligible requests (%.1f%%); hedge won %s (%.0f%%)",
+                             f"{category}: " if category else '', hedges, eligible, hedges / eligible * 100,
+                             wins, wins / hedges * 100 if hedges else 0.0)
+    
+    def show_source_health(self):
+        """Print per-host circuit state, success rate and latency percentiles."""
+        print("\n🩺 SOURCE HEALTH\n" + "="*50)
+        for source in get_health_registry().stats():
+            rate = f"{source['success_rate']:.0%}" if source['success_rate'] is not None else '-'
+            latency = ' '.join(f"{pct}={source[pct]:.2f}s" for pct in ('p50', 'p95', 'p99') if source[pct] is not None)
+            print(f"{source['host']:<40} {source['state']:<10} {rate:>5} of {source['requests']:<4} {latency}")
+    
     def show_available_tools(self):
         """Display all available tools for each category."""
         print("\n🔧 AVAILABLE TOOLS BY CATEGORY\n" + "="*50)
@@ -108,19 +416,92 @@ def main():
                        help='Scrape all categories')
     parser.add_argument('--tools', '-t', action='store_true',
                        help='Show available tools for each category')
+    parser.add_argument('--stream', '-s', action='store_true',
+                       help='Stream records through the pipeline instead of collecting them in memory')
+    parser.add_argument('--store', action='store_true',
+                       help='Also upsert records into the SQL storage backend (BOTSY_DATABASE_URL)')
+    parser.add_argument('--index', action='store_true',
+                       help='Also add records to the local full-text search index')
+    parser.add_argument('--extract', action='store_true',
+                       help='Download and extract full article text (implies --stream)')
+    parser.add_argument('--changes-only', action='store_true',
+                       help='Write a change feed of inserted and updated records instead of full snapshots (implies --stream)')
+    parser.add_argument('--enqueue', action='store_true',
+                       help='Queue --category or --all as work units for --worker processes instead of running them')
+    parser.add_argument('--worker', action='store_true',
+                       help='Lease and run queued work units until the queue is drained (records are streamed)')
+    parser.add_argument('--queue-status', action='store_true',
+                       help='Show work queue counts and dead-lettered units')
+    parser.add_argument('--requeue-dead', action='store_true',
+                       help='Retry every dead-lettered work unit')
+    parser.add_argument('--queue', metavar='URL', default=WORK_QUEUE_URL,
+                       help='Work queue URL (default: BOTSY_QUEUE_URL or a local SQLite file)')
+    parser.add_argument('--schedule', action='store_true',
+                       help='Keep polling --category or --all, adapting each source\'s interval to how often it changes')
+    parser.add_argument('--schedule-status', action='store_true',
+                       help='Show each scheduled source\'s poll interval and new records seen')
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                       help='Stop a --category, --all or --schedule run after SECONDS, keeping whatever finished')
+    parser.add_argument('--profile', choices=PROFILE_MODES,
+                       help='Profile each category (cProfile or tracemalloc) and print a summary table')
+    parser.add_argument('--health', action='store_true',
+                       help='Show per-source circuit state, success rate and latency percentiles')
+    parser.add_argument('--search', metavar='QUERY',
+                       help='Search collected records (filter with --category and --since)')
+    parser.add_argument('--since', metavar='WHEN',
+                       help="Only search records scraped since an ISO date or a span like '30d' or '12h'")
+    parser.add_argument('--limit', type=int, default=20,
+                       help='Maximum number of search results')
     
     args = parser.parse_args()
     
-    orchestrator = BotsyOrchestrator()
+    args.stream = args.stream or args.extract or args.changes_only
+    orchestrator = BotsyOrchestrator(store=args.store, index=args.index, extract=args.extract,
+                                     profile=args.profile, changes_only=args.changes_only)
     
-    if args.tools:
+    if args.enqueue or args.worker or args.queue_status or args.requeue_dead:
+        queue = open_queue(args.queue)
+        if args.requeue_dead:
+            print(f"Requeued {queue.requeue_dead()} dead-lettered units")
+        if args.enqueue:
+            categories = [args.category] if args.category else list(orchestrator.scrapers) if args.all else []
+            if not categories:
+                parser.error('--enqueue needs --category or --all')
+            orchestrator.enqueue(categories, queue)
+        if args.worker:
+            orchestrator.work(queue)
+        if args.queue_status:
+            orchestrator.show_queue_status(queue)
+    elif args.schedule:
+        categories = [args.category] if args.category else list(orchestrator.scrapers) if args.all else []
+        if not categories:
+            parser.error('--schedule needs --category or --all')
+        orchestrator.schedule(categories, deadline=args.deadline)
+    elif args.schedule_status:
+        orchestrator.show_schedule()
+    elif args.search:
+        orchestrator.search(args.search, category=args.category, since=args.since, limit=args.limit)
+    elif args.health:
+        orchestrator.show_source_health()
+    elif args.tools:
         orchestrator.show_available_tools()
     elif args.category:
-        orchestrator.run_category(args.category)
+        if args.stream:
+            orchestrator.stream_category(args.category, deadline=args.deadline)
+        else:
+            orchestrator.run_category(args.category, deadline=args.deadline)
     elif args.all:
-        orchestrator.run_all()
+        if args.stream:
+            orchestrator.stream_all(deadline=args.deadline)
+        else:
+            orchestrator.run_all(deadline=args.deadline)
     else:
         parser.print_help()
+    
+    if args.deadline is not None and orchestrator.unit_status:
+        orchestrator.print_run_summary()
+    if orchestrator.profiler:
+        orchestrator.profiler.print_summary()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
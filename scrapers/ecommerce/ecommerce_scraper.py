@@ -2,47 +2,63 @@
 E-commerce & Reviews scraper using free APIs and web scraping.
 """
 import requests
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, List, Optional
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.records import Product, batch_timestamp
+from utils.catalog import CatalogCrawler, PriceHistory
+from config.config import CATEGORIES
 
 class EcommerceScraper(BaseScraper):
     """Scraper for e-commerce and product review data."""
     
     def __init__(self):
         super().__init__('ecommerce')
+        self.categories = CATEGORIES['ecommerce']['categories']
+        self._crawler: Optional[CatalogCrawler] = None
     
-    def scrape_product_data(self) -> List[Dict]:
-        """Scrape product data from free APIs."""
+    def scrape_product_data(self, category: Optional[str] = None) -> List[Product]:
+        """Crawl the catalog (one configured category, or all) and return new or changed products."""
         try:
-            products = []
-            # Fake Store API is free and doesn't require authentication
-            response = self.make_request('https://fakestoreapi.com/products')
-            data = response.json()
+            if self._crawler is None:
+                # Fake Store API is free and doesn't require authentication
+                self._crawler = CatalogCrawler(self.make_request, PriceHistory())
+            
+            details = self._crawler.crawl([category] if category else self.categories)
+            scraped_at = batch_timestamp()
             
-            for product in data[:5]:  # Limit to 5 products
-                products.append({
-                    'title': product.get('title', ''),
-                    'price': product.get('price', 0),
-                    'description': product.get('description', ''),
-                    'category': product.get('category', ''),
-                    'rating': product.get('rating', {}),
-                    'source': 'Fake Store API',
-                    'scraped_at': datetime.now().isoformat()
-                })
+            products = []
+            for product in details:
+                rating = product.get('rating', {})
+                products.append(Product(
+                    id=product.get('id'),
+                    title=product.get('title', ''),
+                    price=product.get('price', 0),
+                    description=product.get('description', ''),
+                    category=product.get('category', ''),
+                    rating=rating.get('rate', 0),
+                    rating_count=rating.get('count', 0),
+                    source=self._crawler.source,
+                    scraped_at=scraped_at
+                ))
             
             return products
         except Exception as e:
-            self.logger.error(f"Error scraping product data: {e}")
+            self.log_error("Error scraping product data: %s", e)
             return []
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        return self.scrape_product_data()
+    def close(self):
+        """Close the crawler's price history store."""
+        if self._crawler is not None:
+            self._crawler.history.close()
+            self._crawler = None
+    
+    def plan(self) -> List[WorkUnit]:
+        """One unit per configured product category."""
+        return [WorkUnit(self.category, 'scrape_product_data', (category,)) for category in self.categories]
     
     def get_available_tools(self) -> Dict[str, str]:
         """Return available tools for e-commerce scraping."""
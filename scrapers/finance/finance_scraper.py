@@ -3,65 +3,73 @@ Finance & Markets scraper using free APIs.
 """
 import yfinance as yf
 import requests
-from typing import Dict, List, Any
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.deadline import check_deadline, time_left
+from utils.records import Article, Quote, batch_timestamp
+from utils.retry import policy_for
 from config.config import ALPHA_VANTAGE_API_KEY, CATEGORIES
 
 class FinanceScraper(BaseScraper):
     """Scraper for financial data and market information."""
     
+    output_name = 'market_data'
+    
     def __init__(self):
         super().__init__('finance')
         self.alpha_vantage_key = ALPHA_VANTAGE_API_KEY
         self.symbols = CATEGORIES['finance']['symbols']
     
-    def scrape_yahoo_finance(self, symbol: str) -> Dict:
+    def scrape_yahoo_finance(self, symbol: str) -> Optional[Quote]:
         """Scrape stock data using yfinance (free)."""
         try:
-            self.logger.info(f"Scraping Yahoo Finance data for: {symbol}")
+            self.logger.info("Scraping Yahoo Finance data for: %s", symbol)
             ticker = yf.Ticker(symbol)
             
             # Get current info
             info = ticker.info
             
+            # yfinance makes its own requests, so the run deadline is applied here
+            check_deadline(f"Yahoo Finance history for {symbol}")
+            
             # Get historical data (last 30 days)
             end_date = datetime.now()
             start_date = end_date - timedelta(days=30)
-            hist = ticker.history(start=start_date, end=end_date)
-            
-            stock_data = {
-                'symbol': symbol,
-                'company_name': info.get('longName', ''),
-                'current_price': info.get('currentPrice', 0),
-                'market_cap': info.get('marketCap', 0),
-                'pe_ratio': info.get('trailingPE', 0),
-                'dividend_yield': info.get('dividendYield', 0),
-                'sector': info.get('sector', ''),
-                'industry': info.get('industry', ''),
-                'historical_data': {
+            hist = ticker.history(start=start_date, end=end_date,
+                                  timeout=policy_for('https://query2.finance.yahoo.com').timeout(time_left()))
+            
+            return Quote(
+                symbol=symbol,
+                source='yahoo_finance',
+                company_name=info.get('longName', ''),
+                price=info.get('currentPrice', 0),
+                market_cap=info.get('marketCap', 0),
+                pe_ratio=info.get('trailingPE', 0),
+                dividend_yield=info.get('dividendYield', 0),
+                sector=info.get('sector', ''),
+                industry=info.get('industry', ''),
+                historical_data={
                     'dates': hist.index.strftime('%Y-%m-%d').tolist(),
                     'close_prices': hist['Close'].round(2).tolist(),
                     'volumes': hist['Volume'].tolist()
                 },
-                'scraped_at': datetime.now().isoformat()
-            }
-            
-            return stock_data
+                scraped_at=batch_timestamp()
+            )
             
         except Exception as e:
-            self.logger.error(f"Error scraping Yahoo Finance for {symbol}: {e}")
-            return {}
+            self.log_error("Error scraping Yahoo Finance for %s: %s", symbol, e)
+            return None
     
-    def scrape_alpha_vantage(self, symbol: str) -> Dict:
+    def scrape_alpha_vantage(self, symbol: str) -> Optional[Quote]:
         """Scrape using Alpha Vantage API (free tier: 5 calls/minute, 500/day)."""
         if not self.alpha_vantage_key:
             self.logger.warning("Alpha Vantage API key not provided")
-            return {}
+            return None
         
         try:
             url = "https://www.alphavantage.co/query"
@@ -76,78 +84,66 @@ class FinanceScraper(BaseScraper):
             
             quote = data.get('Global Quote', {})
             if not quote:
-                return {}
-            
-            return {
-                'symbol': quote.get('01. symbol', ''),
-                'price': float(quote.get('05. price', 0)),
-                'change': quote.get('09. change', ''),
-                'change_percent': quote.get('10. change percent', ''),
-                'volume': int(quote.get('06. volume', 0)),
-                'latest_trading_day': quote.get('07. latest trading day', ''),
-                'scraped_at': datetime.now().isoformat()
-            }
+                return None
+            
+            return Quote(
+                symbol=quote.get('01. symbol', ''),
+                source='alpha_vantage',
+                price=float(quote.get('05. price', 0)),
+                change=quote.get('09. change', ''),
+                change_percent=quote.get('10. change percent', ''),
+                volume=int(quote.get('06. volume', 0)),
+                latest_trading_day=quote.get('07. latest trading day', ''),
+                scraped_at=batch_timestamp()
+            )
             
         except Exception as e:
-            self.logger.error(f"Error scraping Alpha Vantage for {symbol}: {e}")
-            return {}
+            self.log_error("Error scraping Alpha Vantage for %s: %s", symbol, e)
+            return None
     
-    def scrape_market_news(self) -> List[Dict]:
-        """Scrape financial news from free sources."""
+    def scrape_market_news(self, feed_name: Optional[str] = None) -> List[Article]:
+        """Scrape financial news from free sources (one registry feed, or all of them)."""
         news_articles = []
         
-        # Yahoo Finance RSS feed
+        # Registry feeds for finance (Yahoo Finance headlines)
         try:
-            import feedparser
-            feed = feedparser.parse('https://feeds.finance.yahoo.com/rss/2.0/headline')
-            
-            for entry in feed.entries[:10]:
-                article = {
-                    'title': entry.get('title', ''),
-                    'link': entry.get('link', ''),
-                    'summary': entry.get('summary', ''),
-                    'published': entry.get('published', ''),
-                    'source': 'Yahoo Finance',
-                    'scraped_at': datetime.now().isoformat()
-                }
-                news_articles.append(article)
+            for feed, entries in self.iter_feed_entries([feed_name] if feed_name else None):
+                scraped_at = batch_timestamp()
+                
+                for entry in entries:
+                    news_articles.append(Article(
+                        title=entry.get('title', ''),
+                        link=entry.get('link', ''),
+                        description=entry.get('summary', ''),
+                        published=entry.get('published', ''),
+                        source=feed.source,
+                        scraped_at=scraped_at
+                    ))
                 
         except Exception as e:
-            self.logger.error(f"Error scraping financial news: {e}")
+            self.log_error("Error scraping financial news: %s", e)
         
         return news_articles
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        all_data = []
-        
-        # Scrape stock data for each symbol
+    def plan(self) -> List[WorkUnit]:
+        """One unit per symbol and quote source, then one per news feed."""
+        units = []
         for symbol in self.symbols:
             # Yahoo Finance data (free, no API key needed)
-            yahoo_data = self.scrape_yahoo_finance(symbol)
-            if yahoo_data:
-                all_data.append(yahoo_data)
+            units.append(WorkUnit(self.category, 'scrape_yahoo_finance', (symbol,)))
             
             # Alpha Vantage data (if API key available)
-            alpha_data = self.scrape_alpha_vantage(symbol)
-            if alpha_data:
-                all_data.append({**alpha_data, 'source': 'alpha_vantage'})
-        
-        # Scrape market news
-        news_data = self.scrape_market_news()
-        all_data.extend(news_data)
-        
-        # Save data
-        if all_data:
-            self.save_data(all_data, f"market_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            if self.alpha_vantage_key:
+                units.append(WorkUnit(self.category, 'scrape_alpha_vantage', (symbol,)))
         
-        return all_data
+        # Market news
+        return units + self.feed_units('scrape_market_news')
     
     def scrape_iex_cloud(self, symbol: str) -> Dict:
         """Scrape using IEX Cloud API (500K requests/month free)."""
         # Placeholder for IEX Cloud implementation
         try:
-            self.logger.info(f"Scraping IEX Cloud for: {symbol}")
+            self.logger.info("Scraping IEX Cloud for: %s", symbol)
             return {
                 'symbol': symbol,
                 'source': 'IEX Cloud',
@@ -155,14 +151,14 @@ class FinanceScraper(BaseScraper):
                 'scraped_at': datetime.now().isoformat()
             }
         except Exception as e:
-            self.logger.error(f"Error scraping IEX Cloud: {e}")
+            self.log_error("Error scraping IEX Cloud: %s", e)
             return {}
     
     def scrape_polygon_io(self, symbol: str) -> Dict:
         """Scrape using Polygon.io API (5 requests/minute free)."""
         # Placeholder for Polygon.io implementation
         try:
-            self.logger.info(f"Scraping Polygon.io for: {symbol}")
+            self.logger.info("Scraping Polygon.io for: %s", symbol)
             return {
                 'symbol': symbol,
                 'source': 'Polygon.io',
@@ -170,7 +166,7 @@ class FinanceScraper(BaseScraper):
                 'scraped_at': datetime.now().isoformat()
             }
         except Exception as e:
-            self.logger.error(f"Error scraping Polygon.io: {e}")
+            self.log_error("Error scraping Polygon.io: %s", e)
             return {}
 
     def get_available_tools(self) -> Dict[str, str]:
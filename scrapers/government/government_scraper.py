@@ -2,50 +2,70 @@
 Government & Legal scraper using free government APIs.
 """
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any
-from datetime import datetime
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.records import Dataset, batch_timestamp
+from utils.ckan import CkanHarvester
+from utils.deadline import submit_in_context
+from config.config import CATEGORIES, CKAN_BASE_URL, CKAN_NOTES_CHARS, CKAN_QUERIES, CKAN_WORKERS
 
 class GovernmentScraper(BaseScraper):
     """Scraper for government and legal information."""
     
     def __init__(self):
         super().__init__('government')
+        settings = CATEGORIES['government']
+        self.queries = {name: CKAN_QUERIES.get(name, {'q': name.replace('_', ' ')})
+                        for name in settings['agencies'] + settings['data_types']}
     
-    def scrape_data_gov(self) -> List[Dict]:
-        """Scrape from Data.gov catalog."""
+    def scrape_data_gov(self) -> List[Dataset]:
+        """Harvest Data.gov datasets changed since the last run, one concurrent query per agency or type."""
+        # Data.gov CKAN API is free
+        harvester = CkanHarvester(self.make_request, CKAN_BASE_URL)
         try:
-            # Data.gov CKAN API is free
-            url = "https://catalog.data.gov/api/3/action/package_search"
-            params = {'q': 'finance', 'rows': 5}
-            
-            response = self.make_request(url, params)
-            data = response.json()
+            results: Dict[str, Dict[str, Any]] = {}
+            with ThreadPoolExecutor(max_workers=CKAN_WORKERS) as pool:
+                futures = {submit_in_context(pool, harvester.harvest, name, query): name
+                           for name, query in self.queries.items()}
+                for future in as_completed(futures):
+                    try:
+                        for dataset in future.result():
+                            results[dataset.get('name', '')] = dataset
+                    except Exception as e:
+                        self.log_error("Error scraping Data.gov %s: %s", futures[future], e)
+            scraped_at = batch_timestamp()
             
             datasets = []
-            for dataset in data.get('result', {}).get('results', []):
-                datasets.append({
-                    'title': dataset.get('title', ''),
-                    'name': dataset.get('name', ''),
-                    'notes': dataset.get('notes', ''),
-                    'organization': dataset.get('organization', {}).get('title', ''),
-                    'url': f"https://catalog.data.gov/dataset/{dataset.get('name', '')}",
-                    'source': 'Data.gov',
-                    'scraped_at': datetime.now().isoformat()
-                })
+            for name, dataset in results.items():
+                organization = dataset.get('organization') or ''
+                datasets.append(Dataset(
+                    title=dataset.get('title', ''),
+                    name=name,
+                    notes=(dataset.get('notes') or '')[:CKAN_NOTES_CHARS],
+                    # fl returns the organization's name; a full result returns the object
+                    organization=organization.get('title', '') if isinstance(organization, dict) else organization,
+                    url=f"{CKAN_BASE_URL}/dataset/{name}",
+                    modified=dataset.get('metadata_modified') or '',
+                    source='Data.gov',
+                    scraped_at=scraped_at
+                ))
             
+            self.logger.info("Harvested %s changed Data.gov datasets", len(datasets))
             return datasets
         except Exception as e:
-            self.logger.error(f"Error scraping Data.gov: {e}")
+            self.log_error("Error scraping Data.gov: %s", e)
             return []
+        finally:
+            harvester.close()
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        return self.scrape_data_gov()
+    def plan(self) -> List[WorkUnit]:
+        """A single unit: the Data.gov harvest (its queries run concurrently)."""
+        return [WorkUnit(self.category, 'scrape_data_gov')]
     
     def get_available_tools(self) -> Dict[str, str]:
         """Return available tools for government scraping."""
@@ -2,46 +2,95 @@
 Health & Medical scraper using free medical APIs.
 """
 import requests
-from typing import Dict, List, Any
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.records import Article, Paper, batch_timestamp
+from utils.deadline import submit_in_context
+from utils.pubmed import PubMedClient, to_paper
+from config.config import CATEGORIES, PUBMED_TOPIC_RESULTS, PUBMED_WORKERS
 
 class HealthScraper(BaseScraper):
     """Scraper for health and medical information."""
     
     def __init__(self):
         super().__init__('health')
+        self.topics = CATEGORIES['health']['topics']
+        self.source_types = CATEGORIES['health']['source_types']
     
-    def scrape_health_news(self) -> List[Dict]:
-        """Scrape health news from free sources."""
+    def topics_in(self, *texts: str) -> List[str]:
+        """Configured topics mentioned in any of the texts ('covid-19' also matches 'COVID 19')."""
+        text = ' '.join(texts).lower().replace('-', ' ')
+        return [topic for topic in self.topics if topic.lower().replace('-', ' ') in text]
+    
+    def scrape_health_news(self, feed_name: Optional[str] = None) -> List[Article]:
+        """Scrape health news from free sources, tagged with the configured topics they mention."""
         try:
             health_articles = []
-            # CDC RSS feeds are free
-            import feedparser
-            feed = feedparser.parse('https://tools.cdc.gov/api/v2/resources/media/316422.rss')
-            
-            for entry in feed.entries[:10]:
-                health_articles.append({
-                    'title': entry.get('title', ''),
-                    'link': entry.get('link', ''),
-                    'description': entry.get('description', ''),
-                    'published': entry.get('published', ''),
-                    'source': 'CDC RSS',
-                    'scraped_at': datetime.now().isoformat()
-                })
+            # CDC and WHO RSS feeds are free (registered in config.FEEDS)
+            for feed, entries in self.iter_feed_entries([feed_name] if feed_name else self.source_types):
+                scraped_at = batch_timestamp()
+                
+                for entry in entries:
+                    health_articles.append(Article(
+                        title=entry.get('title', ''),
+                        link=entry.get('link', ''),
+                        description=entry.get('description', ''),
+                        published=entry.get('published', ''),
+                        tags=self.topics_in(entry.get('title', ''), entry.get('description', '')),
+                        source=feed.source,
+                        scraped_at=scraped_at
+                    ))
             
             return health_articles
         except Exception as e:
-            self.logger.error(f"Error scraping health news: {e}")
+            self.log_error("Error scraping health news: %s", e)
+            return []
+    
+    def scrape_pubmed_topics(self) -> List[Paper]:
+        """Search PubMed for every topic concurrently, then fetch each article once, tagged with all its topics."""
+        client = PubMedClient(self.make_request)
+        try:
+            self.logger.info("Scraping PubMed for topics: %s", ', '.join(self.topics))
+            topics_by_pmid: Dict[str, List[str]] = {}
+            
+            with ThreadPoolExecutor(max_workers=PUBMED_WORKERS) as pool:
+                futures = {submit_in_context(pool, client.search, topic, PUBMED_TOPIC_RESULTS): topic
+                           for topic in self.topics}
+                for future in as_completed(futures):
+                    try:
+                        for pmid in future.result():
+                            topics_by_pmid.setdefault(pmid, []).append(futures[future])
+                    except Exception as e:
+                        self.log_error("Error searching PubMed for %s: %s", futures[future], e)
+            
+            # One batched, cached efetch for the union of every topic's PMIDs
+            articles = client.fetch(topics_by_pmid)
+            scraped_at = batch_timestamp()
+            
+            papers = [
+                to_paper(articles[pmid], scraped_at, tags=sorted(topics, key=self.topics.index))
+                for pmid, topics in topics_by_pmid.items() if pmid in articles
+            ]
+            
+            self.logger.info("Scraped %s PubMed articles for %s topics", len(papers), len(self.topics))
+            return papers
+        except Exception as e:
+            self.log_error("Error scraping PubMed topics: %s", e)
             return []
+        finally:
+            client.close()
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        return self.scrape_health_news()
+    def plan(self) -> List[WorkUnit]:
+        """One unit per enabled registry feed, plus one for the PubMed topic searches."""
+        units = [unit for unit in self.feed_units('scrape_health_news') if unit.args[0] in self.source_types]
+        if 'pubmed' in self.source_types:
+            units.append(WorkUnit(self.category, 'scrape_pubmed_topics'))
+        return units
     
     def get_available_tools(self) -> Dict[str, str]:
         """Return available tools for health scraping."""
@@ -1,56 +1,56 @@
 """
 News & Media scraper using free APIs and RSS feeds.
 """
-import feedparser
 import requests
-from typing import Dict, List, Any
+from typing import Dict, List, Optional
 from datetime import datetime
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.feed_registry import get_feed_registry
+from utils.records import Article, batch_timestamp
 from config.config import NEWS_API_KEY, CATEGORIES
 
 class NewsScraper(BaseScraper):
     """Scraper for news and media content."""
     
+    output_name = 'articles'
+    
     def __init__(self):
         super().__init__('news')
         self.api_key = NEWS_API_KEY
-        self.rss_feeds = {
-            'reuters': 'https://feeds.reuters.com/reuters/topNews',
-            'bbc': 'https://feeds.bbci.co.uk/news/rss.xml',
-            'techcrunch': 'https://techcrunch.com/feed/',
-            'reuters_tech': 'https://feeds.reuters.com/reuters/technologyNews'
-        }
+        # Subscribed feeds live in the feed registry (config.FEEDS)
+        self.rss_feeds = {feed.name: feed.url for feed in get_feed_registry().feeds_for('news')}
     
-    def scrape_rss(self, feed_name: str, feed_url: str) -> List[Dict]:
-        """Scrape articles from RSS feed."""
-        try:
-            self.logger.info(f"Scraping RSS feed: {feed_name}")
-            feed = feedparser.parse(feed_url)
-            articles = []
-            
-            for entry in feed.entries[:10]:  # Limit to 10 articles per feed
-                article = {
-                    'title': entry.get('title', ''),
-                    'link': entry.get('link', ''),
-                    'description': entry.get('description', ''),
-                    'published': entry.get('published', ''),
-                    'source': feed_name,
-                    'scraped_at': datetime.now().isoformat()
-                }
-                articles.append(article)
-            
-            self.logger.info(f"Scraped {len(articles)} articles from {feed_name}")
-            return articles
-            
-        except Exception as e:
-            self.logger.error(f"Error scraping {feed_name}: {e}")
-            return []
+    def scrape_rss(self, feed_name: str) -> List[Article]:
+        """Scrape articles from one registry RSS feed."""
+        self.logger.info("Scraping RSS feed: %s", feed_name)
+        articles = []
+        for feed, entries in self.iter_feed_entries([feed_name]):
+            articles.extend(self.parse_rss_entries(feed.source, entries, limit=None))
+        return articles
+    
+    def parse_rss_entries(self, feed_name: str, entries: List[Dict], limit: Optional[int] = 10) -> List[Article]:
+        """Turn parsed feed entries into articles."""
+        scraped_at = batch_timestamp()
+        articles = []
+        
+        for entry in entries[:limit]:
+            articles.append(Article(
+                title=entry.get('title', ''),
+                link=entry.get('link', ''),
+                description=entry.get('description', ''),
+                published=entry.get('published', ''),
+                source=feed_name,
+                scraped_at=scraped_at
+            ))
+        
+        self.logger.info("Scraped %s articles from %s", len(articles), feed_name)
+        return articles
     
-    def scrape_newsapi(self) -> List[Dict]:
+    def scrape_newsapi(self) -> List[Article]:
         """Scrape using NewsAPI (requires API key)."""
         if not self.api_key:
             self.logger.warning("NewsAPI key not provided, skipping NewsAPI scraping")
@@ -66,49 +66,38 @@ class NewsScraper(BaseScraper):
             
             response = self.make_request(url, params)
             data = response.json()
+            scraped_at = batch_timestamp()
             
             articles = []
             for article in data.get('articles', []):
-                articles.append({
-                    'title': article.get('title', ''),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'source': article.get('source', {}).get('name', ''),
-                    'published_at': article.get('publishedAt', ''),
-                    'scraped_at': datetime.now().isoformat()
-                })
+                articles.append(Article(
+                    title=article.get('title') or '',
+                    description=article.get('description') or '',
+                    link=article.get('url', ''),
+                    source=article.get('source', {}).get('name', ''),
+                    published=article.get('publishedAt', ''),
+                    scraped_at=scraped_at
+                ))
             
-            self.logger.info(f"Scraped {len(articles)} articles from NewsAPI")
+            self.logger.info("Scraped %s articles from NewsAPI", len(articles))
             return articles
             
         except Exception as e:
-            self.logger.error(f"Error scraping NewsAPI: {e}")
+            self.log_error("Error scraping NewsAPI: %s", e)
             return []
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        all_articles = []
-        
-        # Scrape RSS feeds
-        for feed_name, feed_url in self.rss_feeds.items():
-            articles = self.scrape_rss(feed_name, feed_url)
-            all_articles.extend(articles)
-        
-        # Scrape NewsAPI if key is available
-        newsapi_articles = self.scrape_newsapi()
-        all_articles.extend(newsapi_articles)
-        
-        # Save data
-        if all_articles:
-            self.save_data(all_articles, f"articles_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-        
-        return all_articles
+    def plan(self) -> List[WorkUnit]:
+        """One unit per registry feed, plus NewsAPI when a key is available."""
+        units = self.feed_units('scrape_rss')
+        if self.api_key:
+            units.append(WorkUnit(self.category, 'scrape_newsapi'))
+        return units
     
     def scrape_gnews(self, query: str = "technology", max_results: int = 10) -> List[Dict]:
         """Scrape Google News using GNews API (alternative free option)."""
         try:
             # This would use python-gnews library in practice
-            self.logger.info(f"Scraping Google News for: {query}")
+            self.logger.info("Scraping Google News for: %s", query)
             # Placeholder for GNews implementation
             return [{
                 'title': f'Sample Google News article about {query}',
@@ -117,7 +106,7 @@ class NewsScraper(BaseScraper):
                 'note': 'Requires python-gnews library'
             }]
         except Exception as e:
-            self.logger.error(f"Error scraping GNews: {e}")
+            self.log_error("Error scraping GNews: %s", e)
             return []
     
     def scrape_guardian_api(self) -> List[Dict]:
@@ -133,7 +122,7 @@ class NewsScraper(BaseScraper):
                 'note': 'Requires Guardian API key - 5000 requests/day free'
             }]
         except Exception as e:
-            self.logger.error(f"Error scraping Guardian API: {e}")
+            self.log_error("Error scraping Guardian API: %s", e)
             return []
 
     def get_available_tools(self) -> Dict[str, str]:
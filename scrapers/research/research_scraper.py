@@ -3,27 +3,31 @@ Research & Academia scraper using arXiv and other academic sources.
 """
 import arxiv
 import requests
-from typing import Dict, List, Any
+from typing import Dict, List
 from datetime import datetime, timedelta
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.records import Paper, batch_timestamp
+from utils.pubmed import PubMedClient, to_paper
 from config.config import CATEGORIES
 
 class ResearchScraper(BaseScraper):
     """Scraper for research and academic content."""
     
+    output_name = 'research_papers'
+    
     def __init__(self):
         super().__init__('research')
         self.subjects = CATEGORIES['research']['subjects']
         self.max_papers = CATEGORIES['research']['max_papers']
     
-    def scrape_arxiv(self, subject: str) -> List[Dict]:
+    def scrape_arxiv(self, subject: str) -> List[Paper]:
         """Scrape recent papers from arXiv for a specific subject."""
         try:
-            self.logger.info(f"Scraping arXiv for subject: {subject}")
+            self.logger.info("Scraping arXiv for subject: %s", subject)
             
             # Search for recent papers in the subject
             search = arxiv.Search(
@@ -32,81 +36,54 @@ class ResearchScraper(BaseScraper):
                 sort_by=arxiv.SortCriterion.SubmittedDate
             )
             
+            scraped_at = batch_timestamp()
             papers = []
             for paper in search.results():
-                paper_data = {
-                    'title': paper.title,
-                    'authors': [author.name for author in paper.authors],
-                    'summary': paper.summary,
-                    'published': paper.published.isoformat(),
-                    'updated': paper.updated.isoformat() if paper.updated else None,
-                    'categories': paper.categories,
-                    'pdf_url': paper.pdf_url,
-                    'entry_id': paper.entry_id,
-                    'subject': subject,
-                    'scraped_at': datetime.now().isoformat()
-                }
-                papers.append(paper_data)
-            
-            self.logger.info(f"Scraped {len(papers)} papers from arXiv for {subject}")
+                papers.append(Paper(
+                    title=paper.title,
+                    authors=[author.name for author in paper.authors],
+                    abstract=paper.summary,
+                    published=paper.published.isoformat(),
+                    updated=paper.updated.isoformat() if paper.updated else None,
+                    categories=paper.categories,
+                    pdf_url=paper.pdf_url,
+                    url=paper.entry_id,
+                    doi=paper.doi or '',
+                    subject=subject,
+                    source='arXiv',
+                    scraped_at=scraped_at
+                ))
+            
+            self.logger.info("Scraped %s papers from arXiv for %s", len(papers), subject)
             return papers
             
         except Exception as e:
-            self.logger.error(f"Error scraping arXiv for {subject}: {e}")
+            self.log_error("Error scraping arXiv for %s: %s", subject, e)
             return []
     
-    def scrape_pubmed(self, query: str = "machine learning", max_results: int = 10) -> List[Dict]:
+    def scrape_pubmed(self, query: str = "machine learning", max_results: int = 10) -> List[Paper]:
         """Scrape medical research from PubMed (free API)."""
+        client = PubMedClient(self.make_request)
         try:
-            self.logger.info(f"Scraping PubMed for query: {query}")
-            
-            # Search PubMed
-            search_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-            search_params = {
-                'db': 'pubmed',
-                'term': query,
-                'retmax': max_results,
-                'retmode': 'json',
-                'sort': 'pub_date'
-            }
-            
-            search_response = self.make_request(search_url, search_params)
-            search_data = search_response.json()
+            self.logger.info("Scraping PubMed for query: %s", query)
             
-            paper_ids = search_data.get('esearchresult', {}).get('idlist', [])
+            # Search PubMed, then fetch the articles in one batched (and cached) efetch
+            paper_ids = client.search(query, max_results)
+            articles = client.fetch(paper_ids)
+            scraped_at = batch_timestamp()
             
-            if not paper_ids:
-                return []
-            
-            # Fetch paper details
-            fetch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-            fetch_params = {
-                'db': 'pubmed',
-                'id': ','.join(paper_ids),
-                'retmode': 'xml'
-            }
-            
-            fetch_response = self.make_request(fetch_url, fetch_params)
-            
-            # Parse XML response (simplified)
-            papers = []
-            # Note: In a real implementation, you'd parse the XML properly
-            papers.append({
-                'query': query,
-                'paper_ids': paper_ids,
-                'count': len(paper_ids),
-                'scraped_at': datetime.now().isoformat(),
-                'note': 'XML parsing needed for full paper details'
-            })
+            papers = [to_paper(articles[pmid], scraped_at, subject=query) for pmid in paper_ids if pmid in articles]
             
-            self.logger.info(f"Found {len(paper_ids)} papers on PubMed for {query}")
+            self.logger.info("Scraped %s papers from PubMed for %s", len(papers), query)
             return papers
             
         except Exception as e:
-            self.logger.error(f"Error scraping PubMed: {e}")
+            self.log_error("Error scraping PubMed: %s", e)
             return []
+        finally:
+            client.close()
     
-    def scrape_biorxiv(self) -> List[Dict]:
+    def scrape_biorxiv(self) -> List[Paper]:
         """Scrape preprints from bioRxiv."""
         try:
             self.logger.info("Scraping bioRxiv preprints")
@@ -121,63 +98,51 @@ class ResearchScraper(BaseScraper):
             full_url = f"{url}/{start_date}/{end_date}"
             response = self.make_request(full_url)
             data = response.json()
+            scraped_at = batch_timestamp()
             
             papers = []
             for paper in data.get('collection', [])[:10]:  # Limit to 10 papers
-                paper_data = {
-                    'title': paper.get('title', ''),
-                    'authors': paper.get('authors', ''),
-                    'abstract': paper.get('abstract', ''),
-                    'doi': paper.get('doi', ''),
-                    'date': paper.get('date', ''),
-                    'category': paper.get('category', ''),
-                    'server': 'bioRxiv',
-                    'scraped_at': datetime.now().isoformat()
-                }
-                papers.append(paper_data)
-            
-            self.logger.info(f"Scraped {len(papers)} papers from bioRxiv")
+                papers.append(Paper(
+                    title=paper.get('title', ''),
+                    authors=[name.strip() for name in paper.get('authors', '').split(';') if name.strip()],
+                    abstract=paper.get('abstract', ''),
+                    doi=paper.get('doi', ''),
+                    published=paper.get('date', ''),
+                    categories=[paper['category']] if paper.get('category') else [],
+                    source='bioRxiv',
+                    scraped_at=scraped_at
+                ))
+            
+            self.logger.info("Scraped %s papers from bioRxiv", len(papers))
             return papers
             
         except Exception as e:
-            self.logger.error(f"Error scraping bioRxiv: {e}")
+            self.log_error("Error scraping bioRxiv: %s", e)
             return []
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        all_papers = []
+    def plan(self) -> List[WorkUnit]:
+        """One unit per arXiv subject, then one per other source."""
+        # arXiv, one subject at a time
+        units = [WorkUnit(self.category, 'scrape_arxiv', (subject,)) for subject in self.subjects]
         
-        # Scrape arXiv for each subject
-        for subject in self.subjects:
-            arxiv_papers = self.scrape_arxiv(subject)
-            all_papers.extend(arxiv_papers)
-        
-        # Scrape PubMed for medical research
-        pubmed_papers = self.scrape_pubmed("artificial intelligence")
-        all_papers.extend(pubmed_papers)
-        
-        # Scrape bioRxiv for biological preprints
-        biorxiv_papers = self.scrape_biorxiv()
-        all_papers.extend(biorxiv_papers)
-        
-        # Scrape Semantic Scholar for AI research
-        semantic_papers = self.scrape_semantic_scholar("machine learning")
-        all_papers.extend(semantic_papers)
-        
-        # Scrape CrossRef for general research
-        crossref_papers = self.scrape_crossref("computer science")
-        all_papers.extend(crossref_papers)
-        
-        # Save data
-        if all_papers:
-            self.save_data(all_papers, f"research_papers_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-        
-        return all_papers
+        return units + [
+            # PubMed for medical research
+            WorkUnit(self.category, 'scrape_pubmed', ('artificial intelligence',)),
+            
+            # bioRxiv for biological preprints
+            WorkUnit(self.category, 'scrape_biorxiv'),
+            
+            # Semantic Scholar for AI research
+            WorkUnit(self.category, 'scrape_semantic_scholar', ('machine learning',)),
+            
+            # CrossRef for general research
+            WorkUnit(self.category, 'scrape_crossref', ('computer science',))
+        ]
     
-    def scrape_semantic_scholar(self, query: str = "machine learning") -> List[Dict]:
+    def scrape_semantic_scholar(self, query: str = "machine learning") -> List[Paper]:
         """Scrape research papers using Semantic Scholar API."""
         try:
-            self.logger.info(f"Scraping Semantic Scholar for: {query}")
+            self.logger.info("Scraping Semantic Scholar for: %s", query)
             
             # Semantic Scholar API endpoint
             url = "https://api.semanticscholar.org/graph/v1/paper/search"
@@ -189,32 +154,32 @@ class ResearchScraper(BaseScraper):
             
             response = self.make_request(url, params)
             data = response.json()
+            scraped_at = batch_timestamp()
             
             papers = []
             for paper in data.get('data', []):
-                paper_data = {
-                    'title': paper.get('title', ''),
-                    'authors': [author.get('name', '') for author in paper.get('authors', [])],
-                    'abstract': paper.get('abstract', ''),
-                    'year': paper.get('year', 0),
-                    'citation_count': paper.get('citationCount', 0),
-                    'url': paper.get('url', ''),
-                    'source': 'Semantic Scholar',
-                    'scraped_at': datetime.now().isoformat()
-                }
-                papers.append(paper_data)
-            
-            self.logger.info(f"Scraped {len(papers)} papers from Semantic Scholar")
+                papers.append(Paper(
+                    title=paper.get('title', ''),
+                    authors=[author.get('name', '') for author in paper.get('authors', [])],
+                    abstract=paper.get('abstract') or '',
+                    published=str(paper['year']) if paper.get('year') else '',
+                    citation_count=paper.get('citationCount', 0),
+                    url=paper.get('url', ''),
+                    source='Semantic Scholar',
+                    scraped_at=scraped_at
+                ))
+            
+            self.logger.info("Scraped %s papers from Semantic Scholar", len(papers))
             return papers
             
         except Exception as e:
-            self.logger.error(f"Error scraping Semantic Scholar: {e}")
+            self.log_error("Error scraping Semantic Scholar: %s", e)
             return []
     
-    def scrape_crossref(self, query: str = "artificial intelligence") -> List[Dict]:
+    def scrape_crossref(self, query: str = "artificial intelligence") -> List[Paper]:
         """Scrape academic papers using CrossRef API (completely free)."""
         try:
-            self.logger.info(f"Scraping CrossRef for: {query}")
+            self.logger.info("Scraping CrossRef for: %s", query)
             
             # CrossRef API endpoint
             url = "https://api.crossref.org/works"
@@ -227,27 +192,29 @@ class ResearchScraper(BaseScraper):
             
             response = self.make_request(url, params)
             data = response.json()
+            scraped_at = batch_timestamp()
             
             papers = []
             for item in data.get('message', {}).get('items', []):
-                paper_data = {
-                    'title': ' '.join(item.get('title', [''])),
-                    'authors': [f"{author.get('given', '')} {author.get('family', '')}" 
-                              for author in item.get('author', [])],
-                    'doi': item.get('DOI', ''),
-                    'published_date': item.get('published-print', {}).get('date-parts', [[]])[0],
-                    'publisher': item.get('publisher', ''),
-                    'citation_count': item.get('is-referenced-by-count', 0),
-                    'source': 'CrossRef',
-                    'scraped_at': datetime.now().isoformat()
-                }
-                papers.append(paper_data)
-            
-            self.logger.info(f"Scraped {len(papers)} papers from CrossRef")
+                date_parts = item.get('published-print', {}).get('date-parts', [[]])[0]
+                papers.append(Paper(
+                    title=' '.join(item.get('title', [''])),
+                    authors=[f"{author.get('given', '')} {author.get('family', '')}" 
+                             for author in item.get('author', [])],
+                    doi=item.get('DOI', ''),
+                    url=item.get('URL', ''),
+                    published='-'.join(f"{part:02d}" for part in date_parts),
+                    publisher=item.get('publisher', ''),
+                    citation_count=item.get('is-referenced-by-count', 0),
+                    source='CrossRef',
+                    scraped_at=scraped_at
+                ))
+            
+            self.logger.info("Scraped %s papers from CrossRef", len(papers))
             return papers
             
         except Exception as e:
-            self.logger.error(f"Error scraping CrossRef: {e}")
+            self.log_error("Error scraping CrossRef: %s", e)
             return []
 
     def get_available_tools(self) -> Dict[str, str]:
@@ -2,13 +2,13 @@
 Sports & Entertainment scraper using free sports APIs.
 """
 import requests
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, List, Optional
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.records import Article, batch_timestamp
 
 class SportsScraper(BaseScraper):
     """Scraper for sports and entertainment content."""
@@ -16,31 +16,31 @@ class SportsScraper(BaseScraper):
     def __init__(self):
         super().__init__('sports')
     
-    def scrape_sports_data(self) -> List[Dict]:
+    def scrape_sports_data(self, feed_name: Optional[str] = None) -> List[Article]:
         """Scrape sports data from free APIs."""
         try:
             sports_data = []
-            # ESPN RSS feeds are free
-            import feedparser
-            feed = feedparser.parse('https://www.espn.com/espn/rss/news')
-            
-            for entry in feed.entries[:10]:
-                sports_data.append({
-                    'title': entry.get('title', ''),
-                    'link': entry.get('link', ''),
-                    'published': entry.get('published', ''),
-                    'source': 'ESPN RSS',
-                    'scraped_at': datetime.now().isoformat()
-                })
+            # ESPN RSS feeds are free (registered in config.FEEDS)
+            for feed, entries in self.iter_feed_entries([feed_name] if feed_name else None):
+                scraped_at = batch_timestamp()
+                
+                for entry in entries:
+                    sports_data.append(Article(
+                        title=entry.get('title', ''),
+                        link=entry.get('link', ''),
+                        published=entry.get('published', ''),
+                        source=feed.source,
+                        scraped_at=scraped_at
+                    ))
             
             return sports_data
         except Exception as e:
-            self.logger.error(f"Error scraping sports data: {e}")
+            self.log_error("Error scraping sports data: %s", e)
             return []
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        return self.scrape_sports_data()
+    def plan(self) -> List[WorkUnit]:
+        """One unit per registry feed."""
+        return self.feed_units('scrape_sports_data')
     
     def get_available_tools(self) -> Dict[str, str]:
         """Return available tools for sports scraping."""
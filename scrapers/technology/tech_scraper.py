@@ -1,214 +1,253 @@
 """
 Technology & Software scraper using GitHub API and tech news sources.
 """
-import requests
-from typing import Dict, List, Any
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
-from config.config import GITHUB_TOKEN, CATEGORIES
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.records import Article, Post, Repo, batch_timestamp
+from utils.retry import policy_for
+from utils.deadline import submit_in_context
+from utils.github import GitHubClient
+from utils.hacker_news import HackerNewsSync
+from utils.stackexchange import StackExchangeHarvester, tag_groups
+from config.config import (CATEGORIES, GITHUB_LANGUAGE_WORKERS, GITHUB_TOKEN, GITHUB_TRENDING_DAYS, HN_MODE,
+                           STACKEXCHANGE_TAGS)
 
 class TechnologyScraper(BaseScraper):
     """Scraper for technology and software development content."""
     
+    output_name = 'tech_data'
+    
     def __init__(self):
         super().__init__('technology')
         self.github_token = GITHUB_TOKEN
         self.languages = CATEGORIES['technology']['languages']
+        self._stackexchange: Optional[StackExchangeHarvester] = None
     
-    def scrape_github_trending(self) -> List[Dict]:
-        """Scrape trending repositories from GitHub."""
+    def scrape_github_trending(self, language: Optional[str] = None) -> List[Repo]:
+        """Scrape the most-starred recent repositories per configured language (or one language)."""
+        languages = [language] if language else self.languages
+        since = (datetime.now() - timedelta(days=GITHUB_TRENDING_DAYS)).strftime('%Y-%m-%d')
+        limit = CATEGORIES['technology']['trending_repos']
+        client = GitHubClient(self.make_request, self.session, self.github_token)
+        
         try:
-            self.logger.info("Scraping GitHub trending repositories")
-            
-            # GitHub trending repositories (using search API)
-            url = "https://api.github.com/search/repositories"
-            params = {
-                'q': 'created:>2023-01-01',
-                'sort': 'stars',
-                'order': 'desc',
-                'per_page': 10
-            }
+            self.logger.info("Scraping GitHub trending repositories for %s", ', '.join(languages))
+            items: Dict[str, Dict[str, Any]] = {}
             
-            headers = {}
-            if self.github_token:
-                headers['Authorization'] = f'token {self.github_token}'
+            # One search per language, run concurrently; each pages up to the per-language limit
+            with ThreadPoolExecutor(max_workers=GITHUB_LANGUAGE_WORKERS) as pool:
+                futures = {
+                    submit_in_context(pool, client.search_repositories, f'created:>{since} language:"{name}"', limit): name
+                    for name in languages
+                }
+                for future in as_completed(futures):
+                    try:
+                        for repo in future.result():
+                            items[repo['full_name']] = repo
+                    except Exception as e:
+                        self.log_error("Error scraping GitHub trending %s: %s", futures[future], e)
             
-            response = requests.get(url, params=params, headers=headers)
-            response.raise_for_status()
+            try:
+                details = client.repository_details(list(items))
+            except Exception as e:
+                # Enrichment is best effort: the search results are still worth keeping
+                self.logger.warning("Error enriching GitHub repositories: %s", e)
+                details = {}
             
-            data = response.json()
+            scraped_at = batch_timestamp()
             repositories = []
+            for full_name, repo in items.items():
+                repositories.append(Repo(
+                    name=repo.get('name', ''),
+                    full_name=full_name,
+                    description=repo.get('description') or '',
+                    language=repo.get('language') or '',
+                    stars=repo.get('stargazers_count', 0),
+                    forks=repo.get('forks_count', 0),
+                    url=repo.get('html_url', ''),
+                    created_at=repo.get('created_at', ''),
+                    updated_at=repo.get('updated_at', ''),
+                    pushed_at=repo.get('pushed_at') or '',
+                    topics=repo.get('topics') or [],
+                    license=(repo.get('license') or {}).get('spdx_id') or '',
+                    open_issues=repo.get('open_issues_count', 0),
+                    scraped_at=scraped_at,
+                    **details.get(full_name, {})
+                ))
             
-            for repo in data.get('items', []):
-                repository = {
-                    'name': repo.get('name', ''),
-                    'full_name': repo.get('full_name', ''),
-                    'description': repo.get('description', ''),
-                    'language': repo.get('language', ''),
-                    'stars': repo.get('stargazers_count', 0),
-                    'forks': repo.get('forks_count', 0),
-                    'url': repo.get('html_url', ''),
-                    'created_at': repo.get('created_at', ''),
-                    'updated_at': repo.get('updated_at', ''),
-                    'scraped_at': datetime.now().isoformat()
-                }
-                repositories.append(repository)
-            
-            self.logger.info(f"Scraped {len(repositories)} trending repositories")
+            self.logger.info("Scraped %s trending repositories (%s search pages unchanged)",
+                             len(repositories), client.not_modified)
             return repositories
             
         except Exception as e:
-            self.logger.error(f"Error scraping GitHub trending: {e}")
+            self.log_error("Error scraping GitHub trending: %s", e)
             return []
+        finally:
+            client.close()
     
-    def scrape_hacker_news(self) -> List[Dict]:
+    def scrape_hacker_news(self) -> List[Post]:
         """Scrape top stories from Hacker News API."""
         try:
             self.logger.info("Scraping Hacker News top stories")
             
             # Get top story IDs
-            response = requests.get("https://hacker-news.firebaseio.com/v0/topstories.json")
-            response.raise_for_status()
+            response = self.make_request("https://hacker-news.firebaseio.com/v0/topstories.json")
             story_ids = response.json()[:20]  # Top 20 stories
+            scraped_at = batch_timestamp()
             
             stories = []
             for story_id in story_ids:
                 try:
-                    story_response = requests.get(f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json")
+                    # Straight through the pooled session: no per-item politeness delay
+                    story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
+                    story_response = self.session.get(story_url, timeout=policy_for(story_url).timeout())
                     story_response.raise_for_status()
                     story_data = story_response.json()
                     
                     if story_data and story_data.get('type') == 'story':
-                        story = {
-                            'id': story_data.get('id'),
-                            'title': story_data.get('title', ''),
-                            'url': story_data.get('url', ''),
-                            'score': story_data.get('score', 0),
-                            'by': story_data.get('by', ''),
-                            'time': story_data.get('time', 0),
-                            'descendants': story_data.get('descendants', 0),
-                            'scraped_at': datetime.now().isoformat()
-                        }
-                        stories.append(story)
+                        stories.append(Post(
+                            id=story_data.get('id'),
+                            title=story_data.get('title', ''),
+                            url=story_data.get('url', ''),
+                            score=story_data.get('score', 0),
+                            author=story_data.get('by', ''),
+                            created=story_data.get('time', 0),
+                            num_comments=story_data.get('descendants', 0),
+                            source='hackernews',
+                            scraped_at=scraped_at
+                        ))
                 except Exception as e:
-                    self.logger.warning(f"Error fetching story {story_id}: {e}")
+                    self.logger.warning("Error fetching story %s: %s", story_id, e)
                     continue
             
-            self.logger.info(f"Scraped {len(stories)} Hacker News stories")
+            self.logger.info("Scraped %s Hacker News stories", len(stories))
             return stories
             
         except Exception as e:
-            self.logger.error(f"Error scraping Hacker News: {e}")
+            self.log_error("Error scraping Hacker News: %s", e)
             return []
     
-    def scrape_tech_rss(self) -> List[Dict]:
-        """Scrape technology news from RSS feeds."""
-        import feedparser
-        
-        rss_feeds = {
-            'techcrunch': 'https://techcrunch.com/feed/',
-            'the_verge': 'https://www.theverge.com/rss/index.xml',
-            'ars_technica': 'https://feeds.arstechnica.com/arstechnica/index',
-            'wired': 'https://www.wired.com/feed/rss'
-        }
-        
+    def scrape_hacker_news_sync(self) -> List[Post]:
+        """Mirror new and changed Hacker News items locally and return the stories among them."""
+        try:
+            self.logger.info("Syncing Hacker News items")
+            
+            sync = HackerNewsSync(self.session)
+            try:
+                items = sync.sync()
+            finally:
+                sync.store.close()
+            scraped_at = batch_timestamp()
+            
+            stories = [
+                Post(
+                    id=item.get('id'),
+                    title=item.get('title', ''),
+                    url=item.get('url', ''),
+                    score=item.get('score', 0),
+                    author=item.get('by', ''),
+                    created=item.get('time', 0),
+                    num_comments=item.get('descendants', 0),
+                    source='hackernews',
+                    scraped_at=scraped_at
+                )
+                for item in items if not item.get('deleted') and not item.get('dead')
+            ]
+            
+            self.logger.info("Synced %s new or changed Hacker News stories", len(stories))
+            return stories
+            
+        except Exception as e:
+            self.log_error("Error syncing Hacker News: %s", e)
+            return []
+    
+    def scrape_tech_rss(self, feed_name: Optional[str] = None) -> List[Article]:
+        """Scrape technology news from RSS feeds (one registry feed, or all of them)."""
         all_articles = []
         
-        for source, feed_url in rss_feeds.items():
-            try:
-                self.logger.info(f"Scraping RSS feed: {source}")
-                feed = feedparser.parse(feed_url)
-                
-                for entry in feed.entries[:5]:  # Limit to 5 per source
-                    article = {
-                        'title': entry.get('title', ''),
-                        'link': entry.get('link', ''),
-                        'description': entry.get('description', ''),
-                        'published': entry.get('published', ''),
-                        'source': source,
-                        'scraped_at': datetime.now().isoformat()
-                    }
-                    all_articles.append(article)
-                    
-            except Exception as e:
-                self.logger.error(f"Error scraping {source}: {e}")
+        self.logger.info("Scraping tech RSS feeds")
+        # Feeds and per-feed limits come from the feed registry (config.FEEDS)
+        for feed, entries in self.iter_feed_entries([feed_name] if feed_name else None):
+            scraped_at = batch_timestamp()
+            
+            for entry in entries:
+                all_articles.append(Article(
+                    title=entry.get('title', ''),
+                    link=entry.get('link', ''),
+                    description=entry.get('description', ''),
+                    published=entry.get('published', ''),
+                    source=feed.source,
+                    scraped_at=scraped_at
+                ))
         
         return all_articles
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        all_data = []
-        
-        # GitHub trending repositories
-        github_data = self.scrape_github_trending()
-        all_data.extend(github_data)
-        
-        # Hacker News stories
-        hn_data = self.scrape_hacker_news()
-        all_data.extend(hn_data)
-        
-        # Tech news RSS feeds
-        rss_data = self.scrape_tech_rss()
-        all_data.extend(rss_data)
-        
-        # Stack Overflow questions
-        so_data = self.scrape_stackoverflow("python")
-        all_data.extend(so_data)
-        
-        # Product Hunt (placeholder)
-        ph_data = self.scrape_product_hunt()
-        all_data.extend(ph_data)
-        
-        # Save data
-        if all_data:
-            self.save_data(all_data, f"tech_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-        
-        return all_data
+    def plan(self) -> List[WorkUnit]:
+        """One unit per technology source, with one per tech news feed."""
+        return [
+            # GitHub trending repositories
+            WorkUnit(self.category, 'scrape_github_trending'),
+            
+            # Hacker News: incremental mirror, or the top stories
+            WorkUnit(self.category, 'scrape_hacker_news_sync' if HN_MODE == 'sync' else 'scrape_hacker_news'),
+            
+            # Tech news RSS feeds
+            *self.feed_units('scrape_tech_rss'),
+            
+            # Stack Overflow questions, one unit per tag group
+            *[WorkUnit(self.category, 'scrape_stackoverflow', (tags,)) for tags in tag_groups(STACKEXCHANGE_TAGS)],
+            
+            # Product Hunt (placeholder)
+            WorkUnit(self.category, 'scrape_product_hunt')
+        ]
     
-    def scrape_stackoverflow(self, tag: str = "python") -> List[Dict]:
-        """Scrape Stack Overflow questions using their API."""
+    def scrape_stackoverflow(self, tags: str = "python") -> List[Post]:
+        """Scrape Stack Overflow questions with activity on any of the ';'-separated tags since their last sync."""
         try:
-            self.logger.info(f"Scraping Stack Overflow for tag: {tag}")
-            # Stack Overflow API endpoint
-            url = "https://api.stackexchange.com/2.3/questions"
-            params = {
-                'order': 'desc',
-                'sort': 'activity',
-                'tagged': tag,
-                'site': 'stackoverflow',
-                'pagesize': 10
-            }
+            self.logger.info("Scraping Stack Overflow for tags: %s", tags)
+            if self._stackexchange is None:
+                # One harvester per scraper, so tag group units share the backoff clock, quota and filter
+                self._stackexchange = StackExchangeHarvester(self.make_request)
             
-            response = self.make_request(url, params)
-            data = response.json()
+            items = self._stackexchange.questions(tags)
+            scraped_at = batch_timestamp()
             
             questions = []
-            for item in data.get('items', []):
-                question = {
-                    'title': item.get('title', ''),
-                    'question_id': item.get('question_id', ''),
-                    'score': item.get('score', 0),
-                    'view_count': item.get('view_count', 0),
-                    'answer_count': item.get('answer_count', 0),
-                    'tags': item.get('tags', []),
-                    'creation_date': item.get('creation_date', 0),
-                    'link': item.get('link', ''),
-                    'source': 'Stack Overflow',
-                    'scraped_at': datetime.now().isoformat()
-                }
-                questions.append(question)
+            for item in items:
+                questions.append(Post(
+                    id=item.get('question_id', ''),
+                    title=item.get('title', ''),
+                    score=item.get('score', 0),
+                    view_count=item.get('view_count', 0),
+                    num_comments=item.get('answer_count', 0),
+                    tags=item.get('tags', []),
+                    created=item.get('creation_date', 0),
+                    url=item.get('link', ''),
+                    author=item.get('owner', {}).get('display_name', ''),
+                    source='stackoverflow',
+                    scraped_at=scraped_at
+                ))
             
-            self.logger.info(f"Scraped {len(questions)} Stack Overflow questions")
+            self.logger.info("Scraped %s Stack Overflow questions for %s (quota left: %s)",
+                             len(questions), tags, self._stackexchange.quota_remaining)
             return questions
             
         except Exception as e:
-            self.logger.error(f"Error scraping Stack Overflow: {e}")
+            self.log_error("Error scraping Stack Overflow %s: %s", tags, e)
             return []
     
+    def close(self):
+        """Close the Stack Exchange harvester's state database."""
+        if self._stackexchange is not None:
+            self._stackexchange.close()
+            self._stackexchange = None
+    
     def scrape_product_hunt(self) -> List[Dict]:
         """Scrape Product Hunt for tech product launches."""
         try:
@@ -223,7 +262,7 @@ class TechnologyScraper(BaseScraper):
                 'note': 'Requires Product Hunt API token'
             }]
         except Exception as e:
-            self.logger.error(f"Error scraping Product Hunt: {e}")
+            self.log_error("Error scraping Product Hunt: %s", e)
             return []
 
     def get_available_tools(self) -> Dict[str, str]:
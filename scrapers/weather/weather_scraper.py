@@ -2,28 +2,30 @@
 Weather & Environment scraper using free weather APIs.
 """
 import requests
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Dict, List, Optional
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from utils.scraper_base import BaseScraper
+from utils.scraper_base import BaseScraper, WorkUnit
+from utils.records import WeatherObs, batch_timestamp
 from config.config import OPENWEATHER_API_KEY, CATEGORIES
 
 class WeatherScraper(BaseScraper):
     """Scraper for weather and environmental data."""
     
+    output_name = 'weather'
+    
     def __init__(self):
         super().__init__('weather')
         self.api_key = OPENWEATHER_API_KEY
         self.cities = CATEGORIES['weather']['cities']
     
-    def scrape_openweather(self, city: str) -> Dict:
+    def scrape_openweather(self, city: str) -> Optional[WeatherObs]:
         """Scrape weather data using OpenWeatherMap API."""
         if not self.api_key:
             self.logger.warning("OpenWeatherMap API key not provided")
-            return {}
+            return None
         
         try:
             url = "https://api.openweathermap.org/data/2.5/weather"
@@ -36,36 +38,28 @@ class WeatherScraper(BaseScraper):
             response = self.make_request(url, params)
             data = response.json()
             
-            return {
-                'city': city,
-                'temperature': data['main']['temp'],
-                'feels_like': data['main']['feels_like'],
-                'humidity': data['main']['humidity'],
-                'pressure': data['main']['pressure'],
-                'weather': data['weather'][0]['main'],
-                'description': data['weather'][0]['description'],
-                'wind_speed': data['wind']['speed'],
-                'visibility': data.get('visibility', 0),
-                'scraped_at': datetime.now().isoformat()
-            }
+            return WeatherObs(
+                city=city,
+                temperature=data['main']['temp'],
+                feels_like=data['main']['feels_like'],
+                humidity=data['main']['humidity'],
+                pressure=data['main']['pressure'],
+                weather=data['weather'][0]['main'],
+                description=data['weather'][0]['description'],
+                wind_speed=data['wind']['speed'],
+                visibility=data.get('visibility', 0),
+                scraped_at=batch_timestamp()
+            )
             
         except Exception as e:
-            self.logger.error(f"Error scraping weather for {city}: {e}")
-            return {}
+            self.log_error("Error scraping weather for %s: %s", city, e)
+            return None
     
-    def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method."""
-        weather_data = []
-        
-        for city in self.cities:
-            data = self.scrape_openweather(city)
-            if data:
-                weather_data.append(data)
-        
-        if weather_data:
-            self.save_data(weather_data, f"weather_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-        
-        return weather_data
+    def plan(self) -> List[WorkUnit]:
+        """One unit per city (none without an OpenWeatherMap key)."""
+        if not self.api_key:
+            return []
+        return [WorkUnit(self.category, 'scrape_openweather', (city,)) for city in self.cities]
     
     def get_available_tools(self) -> Dict[str, str]:
         """Return available tools for weather scraping."""
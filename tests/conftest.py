@@ -0,0 +1,7 @@
+"""
+Shared test setup: make the project root importable, as main.py does.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
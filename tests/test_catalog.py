@@ -0,0 +1,117 @@
+"""
+CatalogCrawler and PriceHistory against a stubbed Fake Store API.
+"""
+import threading
+from urllib.parse import unquote
+import pytest
+
+import utils.catalog
+from utils.catalog import CatalogCrawler, PriceHistory
+
+BASE_URL = 'https://store.test'
+PAGE_SIZE = 10
+DAY = 86400
+
+# 45 + 30 + 25 listings in the crawled categories; jewelery doesn't match the wanted terms
+CATEGORY_SIZES = {'electronics': 45, "men's clothing": 30, "women's clothing": 25, 'jewelery': 5}
+
+class StubResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+class StubStore:
+    """Serves categories, limit/offset category pages and product details, recording each URL."""
+
+    def __init__(self):
+        self.products = {}
+        for category, size in CATEGORY_SIZES.items():
+            for _ in range(size):
+                product_id = len(self.products) + 1
+                self.products[product_id] = {
+                    'id': product_id,
+                    'title': f"Product {product_id}",
+                    'price': 10 + product_id + 0.99,
+                    'category': category,
+                    'rating': {'rate': 4.2, 'count': product_id}
+                }
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def request(self, url, params=None):
+        path = url[len(BASE_URL):]
+        with self._lock:
+            self.calls.append((path, dict(params or {})))
+        if path == '/products/categories':
+            return StubResponse(list(CATEGORY_SIZES))
+        if path.startswith('/products/category/'):
+            category = unquote(path[len('/products/category/'):])
+            listed = [product for product in self.products.values() if product['category'] == category]
+            offset = params['offset']
+            return StubResponse(listed[offset:offset + params['limit']])
+        product_id = int(path.rsplit('/', 1)[1])
+        return StubResponse({**self.products[product_id], 'description': f"About product {product_id}"})
+
+    def detail_ids(self):
+        return sorted(int(path.rsplit('/', 1)[1]) for path, _ in self.calls
+                      if path.startswith('/products/') and path.rsplit('/', 1)[1].isdigit())
+
+    def page_offsets(self, category):
+        return {params['offset'] for path, params in self.calls if unquote(path) == f"/products/category/{category}"}
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setattr(utils.catalog, 'ECOMMERCE_PAGE_SIZE', PAGE_SIZE)
+    return StubStore()
+
+@pytest.fixture
+def history(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # logs too
+    history = PriceHistory('prices.db')
+    yield history
+    history.close()
+
+def test_crawl_walks_matching_categories_and_pages(store, history):
+    crawler = CatalogCrawler(store.request, history, base_url=BASE_URL, workers=4)
+    details = crawler.crawl(['electronics', 'clothing'], now=1000 * DAY)
+
+    assert len(details) == 100
+    assert all(product['description'] for product in details)
+    assert {product['category'] for product in details} == {'electronics', "men's clothing", "women's clothing"}
+    for category, size in CATEGORY_SIZES.items():
+        if category == 'jewelery':
+            assert not store.page_offsets(category)
+        else:
+            assert set(range(0, size, PAGE_SIZE)) <= store.page_offsets(category)
+    assert store.detail_ids() == sorted(product['id'] for product in details)
+
+def test_second_crawl_fetches_detail_only_for_changed_listings(store, history):
+    crawler = CatalogCrawler(store.request, history, base_url=BASE_URL, workers=4)
+    crawler.crawl(['electronics', 'clothing'], now=1000 * DAY)
+
+    store.products[7]['price'] = 5.49
+    store.products[60]['rating'] = {'rate': 3.9, 'count': 61}
+    store.calls.clear()
+    details = crawler.crawl(['electronics', 'clothing'], now=1001 * DAY)
+
+    assert sorted(product['id'] for product in details) == [7, 60]
+    assert store.detail_ids() == [7, 60]
+
+def test_price_history_reports_recent_price_changes(store, history):
+    crawler = CatalogCrawler(store.request, history, base_url=BASE_URL, workers=4)
+    crawler.crawl(['electronics'], now=1000 * DAY)
+    old_price = store.products[7]['price']
+    store.products[7]['price'] = 5.49
+    crawler.crawl(['electronics'], now=1003 * DAY)
+    crawler.crawl(['electronics'], now=1004 * DAY)  # unchanged: no new history rows
+
+    assert history.price_changes(7, now=1005 * DAY) == [{
+        'key': 'Fake Store API:7',
+        'observed_at': 1003 * DAY,
+        'price': 5.49,
+        'previous_price': old_price
+    }]
+    assert history.price_changes(1, now=1005 * DAY) == []
+    assert [entry['price'] for entry in history.history('Fake Store API:7')] == [old_price, 5.49]
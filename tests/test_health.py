@@ -0,0 +1,120 @@
+"""
+Circuit breaker state machine and adaptive timeouts of the health registry.
+"""
+import pytest
+
+import utils.health
+from utils.health import CLOSED, HALF_OPEN, OPEN, CircuitOpenError, HealthRegistry
+from config.config import (HEALTH_FAILURE_THRESHOLD, HEALTH_MIN_SAMPLES, HEALTH_MIN_TIMEOUT, HEALTH_OPEN_SECONDS,
+                           HEALTH_TIMEOUT_MULTIPLIER)
+
+HOST = 'api.example.com'
+
+class Clock:
+    """Stands in for the time module inside utils.health."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(utils.health, 'time', clock)
+    return clock
+
+@pytest.fixture
+def registry(clock):
+    return HealthRegistry(path=None)
+
+def fail(registry, times=1):
+    for _ in range(times):
+        registry.before_request(HOST)
+        registry.record(HOST, False, 0.0)
+
+def test_circuit_opens_at_threshold(registry):
+    fail(registry, HEALTH_FAILURE_THRESHOLD - 1)
+    registry.before_request(HOST)  # still closed
+    registry.record(HOST, False, 0.0)
+
+    assert registry.sources[HOST].state == OPEN
+    with pytest.raises(CircuitOpenError):
+        registry.before_request(HOST)
+
+def test_success_resets_failure_count(registry):
+    fail(registry, HEALTH_FAILURE_THRESHOLD - 1)
+    registry.record(HOST, True, 0.1)
+    fail(registry, HEALTH_FAILURE_THRESHOLD - 1)
+
+    assert registry.sources[HOST].state == CLOSED
+
+def test_single_half_open_probe_closes_circuit(registry, clock):
+    fail(registry, HEALTH_FAILURE_THRESHOLD)
+    clock.now += HEALTH_OPEN_SECONDS - 1
+    with pytest.raises(CircuitOpenError):
+        registry.before_request(HOST)
+
+    clock.now += 1
+    registry.before_request(HOST)  # the probe
+    assert registry.sources[HOST].state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        registry.before_request(HOST)  # only one probe at a time
+
+    registry.record(HOST, True, 0.1)
+    assert registry.sources[HOST].state == CLOSED
+    registry.before_request(HOST)
+    registry.before_request(HOST)
+
+def test_failed_probe_reopens_circuit(registry, clock):
+    fail(registry, HEALTH_FAILURE_THRESHOLD)
+    clock.now += HEALTH_OPEN_SECONDS
+    fail(registry)  # the probe fails
+
+    health = registry.sources[HOST]
+    assert health.state == OPEN
+    assert health.opened_at == clock.now
+    clock.now += HEALTH_OPEN_SECONDS - 1
+    with pytest.raises(CircuitOpenError):
+        registry.before_request(HOST)
+    clock.now += 1
+    registry.before_request(HOST)
+
+def test_half_open_state_reloads_as_open(clock, tmp_path):
+    path = str(tmp_path / 'health.db')
+    registry = HealthRegistry(path)
+    fail(registry, HEALTH_FAILURE_THRESHOLD)
+    opened_at = clock.now
+    clock.now += HEALTH_OPEN_SECONDS
+    registry.before_request(HOST)  # probe in flight when the process stops
+    registry.save()
+
+    reloaded = HealthRegistry(path).sources[HOST]
+    assert reloaded.state == OPEN
+    assert reloaded.opened_at == opened_at
+    assert not reloaded.probing
+    assert reloaded.consecutive_failures == HEALTH_FAILURE_THRESHOLD
+
+def test_timeout_unchanged_until_enough_samples(registry):
+    for _ in range(HEALTH_MIN_SAMPLES - 1):
+        registry.record(HOST, True, 0.05)
+
+    assert registry.timeout(HOST, (5.0, 30.0)) == (5.0, 30.0)
+    assert registry.latency(HOST, 95) is None
+
+def test_timeout_follows_p99_with_floor_and_ceiling(registry):
+    for _ in range(HEALTH_MIN_SAMPLES):
+        registry.record(HOST, True, 0.05)
+    # p99 x multiplier is far below the floor
+    assert registry.timeout(HOST, (5.0, 30.0)) == (HEALTH_MIN_TIMEOUT, HEALTH_MIN_TIMEOUT)
+
+    for _ in range(HEALTH_MIN_SAMPLES):
+        registry.record(HOST, True, 2.0)
+    read = 2.0 * HEALTH_TIMEOUT_MULTIPLIER
+    assert registry.timeout(HOST, (5.0, 30.0)) == (min(5.0, read), read)
+
+    for _ in range(HEALTH_MIN_SAMPLES):
+        registry.record(HOST, True, 60.0)
+    # Never looser than the configured timeout
+    assert registry.timeout(HOST, (5.0, 30.0)) == (5.0, 30.0)
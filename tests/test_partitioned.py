@@ -0,0 +1,76 @@
+"""
+Partitioned output: later writers append to the partition's newest part
+until it is due for rotation by size or age.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import utils.partitioned
+from utils.partitioned import PartitionedWriter, iter_partition, read_manifest
+
+DAY = datetime(2024, 5, 1, 12, 0, 0)
+
+class Clock(datetime):
+    """Stands in for datetime inside the module under test."""
+    current = DAY
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+@pytest.fixture
+def clock(monkeypatch):
+    Clock.current = DAY
+    monkeypatch.setattr(utils.partitioned, 'datetime', Clock)
+    return Clock
+
+def run(tmp_path, *batches, **settings):
+    """One batch run: a fresh writer that writes the batches and closes."""
+    writer = PartitionedWriter('news', str(tmp_path), codec='gzip', **settings)
+    for batch in batches:
+        writer.write(batch)
+    writer.close()
+
+def parts(tmp_path):
+    return [block['part'] for block in read_manifest('news', DAY, str(tmp_path))]
+
+def test_next_run_appends_to_newest_part(clock, tmp_path):
+    run(tmp_path, [{'id': 1}], [{'id': 2}])
+    clock.current = DAY + timedelta(minutes=5)
+    run(tmp_path, [{'id': 3}])
+    assert len(set(parts(tmp_path))) == 1
+    assert [record['id'] for record in iter_partition('news', DAY, str(tmp_path))] == [1, 2, 3]
+
+def test_full_part_is_not_reopened(clock, tmp_path):
+    run(tmp_path, [{'id': 1}], rotate_bytes=1)
+    run(tmp_path, [{'id': 2}], rotate_bytes=1)
+    assert len(set(parts(tmp_path))) == 2
+
+def test_part_age_counts_from_its_first_block(clock, tmp_path):
+    run(tmp_path, [{'id': 1}], rotate_seconds=600)
+    clock.current = DAY + timedelta(minutes=9)
+    run(tmp_path, [{'id': 2}], rotate_seconds=600)
+    clock.current = DAY + timedelta(minutes=11)
+    run(tmp_path, [{'id': 3}], rotate_seconds=600)
+    first, second, third = parts(tmp_path)
+    assert first == second != third
+
+def test_part_held_by_live_writer_is_not_shared(clock, tmp_path):
+    live = PartitionedWriter('news', str(tmp_path), codec='gzip')
+    live.write([{'id': 1}])
+    run(tmp_path, [{'id': 2}])
+    live.write([{'id': 3}])
+    live.close()
+    first, second, third = parts(tmp_path)
+    assert first == third != second
+    assert sorted(record['id'] for record in iter_partition('news', DAY, str(tmp_path))) == [1, 2, 3]
+
+def test_other_codec_starts_new_part(clock, tmp_path):
+    run(tmp_path, [{'id': 1}])
+    if utils.partitioned.zstandard is None:
+        pytest.skip('zstandard not installed')
+    writer = PartitionedWriter('news', str(tmp_path), codec='zstd')
+    writer.write([{'id': 2}])
+    writer.close()
+    assert len(set(parts(tmp_path))) == 2
@@ -0,0 +1,62 @@
+"""
+Retry decisions and Retry-After parsing.
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+import requests
+
+from utils.retry import RetryPolicy, parse_retry_after
+
+POLICY = RetryPolicy(max_attempts=3, backoff_base=1.0, backoff_max=30.0)
+
+def http_error(status: int, retry_after: str = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return requests.HTTPError(f"{status} error", response=response)
+
+@pytest.mark.parametrize('value, expected', [
+    ('120', 120.0),
+    (' 7 ', 7.0),
+    ('0', 0.0),
+    (None, None),
+    ('', None),
+    ('soon', None),
+    ('-5', None)
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+def test_parse_retry_after_http_date():
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=90), usegmt=True)
+    assert 80 <= parse_retry_after(future) <= 90
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+    assert parse_retry_after(past) == 0.0
+
+@pytest.mark.parametrize('error', [
+    requests.ConnectionError('reset'),
+    requests.Timeout('slow'),
+    http_error(503),
+    http_error(429)
+])
+def test_transient_failures_are_retried_with_jittered_backoff(error):
+    for attempt in (1, 2):
+        delay = POLICY.retry_delay(error, attempt, remaining=60.0)
+        assert delay is not None
+        assert 0 <= delay <= POLICY.backoff_base * 2 ** (attempt - 1)
+
+@pytest.mark.parametrize('error', [http_error(400), http_error(404), requests.RequestException('bad URL')])
+def test_permanent_failures_are_not_retried(error):
+    assert POLICY.retry_delay(error, 1, remaining=60.0) is None
+
+def test_gives_up_after_max_attempts():
+    assert POLICY.retry_delay(requests.ConnectionError('reset'), POLICY.max_attempts, remaining=60.0) is None
+
+def test_retry_after_overrides_backoff():
+    assert POLICY.retry_delay(http_error(429, '5'), 1, remaining=60.0) == 5.0
+
+def test_wait_past_deadline_gives_up():
+    assert POLICY.retry_delay(http_error(503, '120'), 1, remaining=60.0) is None
+    assert POLICY.retry_delay(requests.ConnectionError('reset'), 1, remaining=0.0) is None
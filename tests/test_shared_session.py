@@ -0,0 +1,130 @@
+"""
+Every scraper request must go through the shared session from utils.http.
+
+Bare ``requests.get``/``requests.post`` calls and private ``requests.Session``
+objects are patched to record and raise, and the shared session is replaced
+by a stub that answers everything with an empty 200. Each scraper then runs
+every unit of its plan.
+
+Two units are deliberately exempt (LIBRARY_UNITS): Yahoo Finance quotes go
+through yfinance and arXiv searches through the arxiv client. Both libraries
+manage their own HTTP sessions, so their traffic is not pooled.
+"""
+import threading
+import pytest
+import requests
+
+import utils.health
+import utils.http
+import utils.scraper_base
+from utils.scraper_base import WorkUnitError
+from scrapers.news.news_scraper import NewsScraper
+from scrapers.finance.finance_scraper import FinanceScraper
+from scrapers.technology.tech_scraper import TechnologyScraper
+from scrapers.research.research_scraper import ResearchScraper
+from scrapers.weather.weather_scraper import WeatherScraper
+from scrapers.social.social_scraper import SocialScraper
+from scrapers.government.government_scraper import GovernmentScraper
+from scrapers.sports.sports_scraper import SportsScraper
+from scrapers.ecommerce.ecommerce_scraper import EcommerceScraper
+from scrapers.health.health_scraper import HealthScraper
+
+SCRAPERS = [NewsScraper, FinanceScraper, TechnologyScraper, ResearchScraper, WeatherScraper,
+            SocialScraper, GovernmentScraper, SportsScraper, EcommerceScraper, HealthScraper]
+
+# Units backed by third-party clients (arxiv, yfinance) that bring their own HTTP stack; see above
+LIBRARY_UNITS = {'scrape_arxiv', 'scrape_yahoo_finance'}
+
+# Set so that sources planned only when a key is configured are covered too
+KEY_ATTRIBUTES = ('api_key', 'alpha_vantage_key', 'github_token')
+
+class StubResponse:
+    """An empty 200 response."""
+    status_code = 200
+    content = b''
+    text = ''
+    
+    def __init__(self, url: str):
+        self.url = url
+        self.headers = {}
+    
+    def json(self):
+        return {}
+    
+    def raise_for_status(self):
+        pass
+    
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        return iter(())
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+class StubSession:
+    """Stands in for the shared session, recording every request made through it."""
+    
+    def __init__(self):
+        self.headers = {}
+        self.calls = []
+        self._lock = threading.Lock()
+    
+    def request(self, method: str, url: str, **kwargs) -> StubResponse:
+        with self._lock:
+            self.calls.append((method, url))
+        return StubResponse(url)
+    
+    def get(self, url: str, **kwargs) -> StubResponse:
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> StubResponse:
+        return self.request('POST', url, **kwargs)
+
+@pytest.fixture
+def session(monkeypatch, tmp_path):
+    """Stub shared session; state databases and logs go to a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utils.health, '_registry', utils.health.HealthRegistry(path=None))
+    stub = StubSession()
+    monkeypatch.setattr(utils.http, 'get_session', lambda: stub)
+    monkeypatch.setattr(utils.scraper_base, 'get_session', lambda: stub)
+    monkeypatch.setattr(utils.scraper_base, 'DEFAULT_DELAY', 0)
+    return stub
+
+@pytest.fixture
+def bypasses(monkeypatch):
+    """URLs requested around the shared session; any such request also raises."""
+    urls = []
+    
+    def forbidden(url):
+        urls.append(url)
+        raise AssertionError(f"{url} was requested without the shared session")
+    
+    monkeypatch.setattr(requests, 'get', lambda url, *args, **kwargs: forbidden(url))
+    monkeypatch.setattr(requests, 'post', lambda url, *args, **kwargs: forbidden(url))
+    monkeypatch.setattr(requests.Session, 'request', lambda self, method, url, *args, **kwargs: forbidden(url))
+    return urls
+
+@pytest.mark.parametrize('scraper_class', SCRAPERS, ids=lambda cls: cls.__name__)
+def test_scraper_requests_use_shared_session(scraper_class, session, bypasses):
+    scraper = scraper_class()
+    assert scraper.session is session
+    for attribute in KEY_ATTRIBUTES:
+        if hasattr(scraper, attribute):
+            setattr(scraper, attribute, 'test-key')
+    
+    units = [unit for unit in scraper.plan() if unit.method not in LIBRARY_UNITS]
+    assert units
+    for unit in units:
+        try:
+            scraper.execute(unit)
+        except WorkUnitError:
+            pass  # an empty response is bad data for most sources; only the transport matters here
+    
+    assert bypasses == []
+    assert session.calls
@@ -0,0 +1,54 @@
+"""
+StackExchangeHarvester against a stubbed API: ORed tag-group queries with
+one watermark per group.
+"""
+from utils.stackexchange import API, StackExchangeHarvester, tag_groups
+
+class StubResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+class StubAPI:
+    """Answers filters/create and /search/advanced, recording each call."""
+
+    def __init__(self, pages):
+        self.pages = pages  # tag group -> list of item lists, one per page
+        self.calls = []
+
+    def __call__(self, url, params):
+        path = url[len(API) + 1:]
+        self.calls.append((path, params))
+        if path == 'filters/create':
+            return StubResponse({'items': [{'filter': 'stub-filter'}], 'quota_remaining': 9000})
+        pages = self.pages.get(params['tagged'], [])
+        index = params['page'] - 1
+        items = pages[index] if index < len(pages) else []
+        return StubResponse({'items': items, 'has_more': index + 1 < len(pages), 'quota_remaining': 8999})
+
+def question(question_id, last_activity):
+    return {'question_id': question_id, 'last_activity_date': last_activity}
+
+def test_tag_groups():
+    assert tag_groups(['a', 'b', 'c', 'd', 'e'], 2) == ['a;b', 'c;d', 'e']
+
+def test_group_is_one_ored_query_with_its_own_watermark(tmp_path):
+    api = StubAPI({'python;go': [[question(1, 100), question(2, 150)], [question(3, 200)]]})
+    harvester = StackExchangeHarvester(api, state_path=str(tmp_path / 'se.db'))
+    try:
+        harvester._set_watermark('python;go', 50)
+        assert [item['question_id'] for item in harvester.questions('python;go')] == [1, 2, 3]
+        searches = [params for path, params in api.calls if path == 'search/advanced']
+        assert [params['page'] for params in searches] == [1, 2]
+        assert all(params['tagged'] == 'python;go' and params['min'] == 50 and params['sort'] == 'activity'
+                   for params in searches)
+        assert harvester.watermark('python;go') == 200
+        assert harvester.watermark('rust;c') not in (50, 200)  # other groups keep their own state
+
+        api.calls.clear()
+        harvester.questions('python;go')
+        assert api.calls[0][1]['min'] == 200
+    finally:
+        harvester.close()
@@ -0,0 +1,148 @@
+"""
+SQLite work queue: leases, extension, expiry, acks and dead-lettering, plus
+how units that hit an open circuit are reported to it.
+"""
+import pytest
+
+import utils.health
+import utils.scraper_base
+import utils.work_queue
+from utils.health import HealthRegistry
+from utils.scraper_base import BaseScraper, WorkUnit, WorkUnitError
+from utils.work_queue import DEAD, DONE, LEASED, READY, SQLiteQueue, open_queue
+
+class Clock:
+    """Stands in for the time module inside the module under test."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(utils.work_queue, 'time', clock)
+    return clock
+
+@pytest.fixture
+def queue(clock, tmp_path):
+    return SQLiteQueue(str(tmp_path / 'queue.db'))
+
+def test_open_queue_parses_sqlite_url(tmp_path):
+    assert isinstance(open_queue(f"sqlite:///{tmp_path}/queue.db"), SQLiteQueue)
+    with pytest.raises(ValueError):
+        open_queue('redis://localhost')
+
+def test_lease_and_ack(queue):
+    queue.enqueue([{'n': 1}, {'n': 2}])
+
+    first = queue.lease('w1', 60)
+    second = queue.lease('w2', 60)
+    assert (first.payload, first.attempts) == ({'n': 1}, 1)
+    assert second.payload == {'n': 2}
+    assert queue.lease('w3', 60) is None  # both leased
+    assert queue.counts() == {LEASED: 2}
+
+    assert queue.ack(first)
+    assert queue.counts() == {DONE: 1, LEASED: 1}
+    assert queue.pending() == 1
+
+def test_expired_lease_is_released_to_another_worker(queue, clock):
+    queue.enqueue([{'n': 1}])
+    item = queue.lease('w1', 60)
+
+    clock.now += 61
+    retaken = queue.lease('w2', 60)
+    assert retaken.id == item.id and retaken.attempts == 2
+    assert not queue.ack(item)  # the first lease is gone
+    assert queue.ack(retaken)
+
+def test_extend_keeps_lease(queue, clock):
+    queue.enqueue([{'n': 1}])
+    item = queue.lease('w1', 60)
+
+    clock.now += 50
+    assert queue.extend(item, 60)
+    clock.now += 50
+    assert queue.lease('w2', 60) is None
+    assert queue.ack(item)
+
+def test_extend_fails_once_lease_is_lost(queue, clock):
+    queue.enqueue([{'n': 1}])
+    item = queue.lease('w1', 60)
+    clock.now += 61
+    queue.lease('w2', 60)
+
+    assert not queue.extend(item, 60)
+
+def test_nack_retries_after_delay_then_dead_letters(queue, clock):
+    queue.enqueue([{'n': 1}], max_attempts=2)
+
+    item = queue.lease('w1', 60)
+    queue.nack(item, 'boom', delay=30)
+    assert queue.counts() == {READY: 1}
+    assert queue.lease('w1', 60) is None  # not visible yet
+    clock.now += 30
+
+    item = queue.lease('w1', 60)
+    assert item.attempts == 2
+    queue.nack(item, 'boom again', delay=30)
+    assert queue.counts() == {DEAD: 1}
+    assert [(dead['attempts'], dead['last_error']) for dead in queue.dead_letters()] == [(2, 'boom again')]
+
+    assert queue.requeue_dead() == 1
+    assert queue.lease('w1', 60).attempts == 1
+
+def test_expired_lease_on_last_attempt_is_dead_lettered(queue, clock):
+    queue.enqueue([{'n': 1}], max_attempts=1)
+    queue.lease('w1', 60)
+
+    clock.now += 61
+    assert queue.lease('w2', 60) is None
+    assert queue.dead_letters()[0]['last_error'] == 'visibility timeout expired'
+
+def test_nack_without_counting_attempt_never_dead_letters(queue, clock):
+    queue.enqueue([{'n': 1}], max_attempts=1)
+
+    for _ in range(3):
+        item = queue.lease('w1', 60)
+        assert item.attempts == 1
+        queue.nack(item, 'circuit open', delay=600, count_attempt=False)
+        assert queue.counts() == {READY: 1}
+        clock.now += 600
+
+class CircuitScraper(BaseScraper):
+    def __init__(self):
+        super().__init__('circuit')
+
+    def scrape_down(self):
+        try:
+            self.make_request('https://down.example.com/items')
+        except Exception as e:
+            self.log_error("Error scraping down.example.com: %s", e)
+        return []
+
+    def plan(self):
+        return [WorkUnit(self.category, 'scrape_down')]
+
+    def get_available_tools(self):
+        return {}
+
+def test_unit_reports_open_circuit_with_probe_delay(monkeypatch, clock, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utils.health, 'time', clock)
+    registry = HealthRegistry(path=None)
+    for _ in range(utils.health.HEALTH_FAILURE_THRESHOLD):
+        registry.record('down.example.com', False, 0.0)
+    monkeypatch.setattr(utils.health, '_registry', registry)
+    clock.now += 100
+
+    scraper = CircuitScraper()
+    with pytest.raises(WorkUnitError) as failure:
+        scraper.execute(scraper.plan()[0])
+
+    circuits = failure.value.open_circuits
+    assert [circuit.host for circuit in circuits] == ['down.example.com']
+    assert circuits[0].retry_after == utils.health.HEALTH_OPEN_SECONDS - 100
@@ -0,0 +1,224 @@
+"""
+Incremental product catalog crawling with a price-history store.
+
+``CatalogCrawler`` walks a Fake Store-style API (``/products/categories``,
+``/products/category/<name>``, ``/products/<id>``). Each category is paged
+with ``limit``/``offset`` in growing waves of concurrent page requests, and
+categories are crawled side by side. A product's detail page is fetched
+only when its listing (price, rating, title) differs from what
+``PriceHistory`` last stored.
+
+``PriceHistory`` keeps the latest state per product, plus one history row
+per product only when its price or rating changed. Prices are stored as
+integer cents and ratings as hundredths. A steady catalog costs no new rows,
+and "what changed in the last N days" is a range scan on ``observed_at``.
+"""
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote
+import requests
+from config.config import (ECOMMERCE_BASE_URL, ECOMMERCE_DB_PATH, ECOMMERCE_MAX_PAGES, ECOMMERCE_PAGE_SIZE,
+                           ECOMMERCE_WORKERS)
+from utils.deadline import expired, submit_in_context
+from utils.logger import setup_logger
+from utils.sqlite_store import open_db
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    key TEXT PRIMARY KEY,
+    listing_hash TEXT NOT NULL,
+    price_cents INTEGER,
+    rating_x100 INTEGER,
+    rating_count INTEGER,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS price_history (
+    key TEXT NOT NULL,
+    observed_at INTEGER NOT NULL,
+    price_cents INTEGER,
+    rating_x100 INTEGER,
+    rating_count INTEGER,
+    PRIMARY KEY (key, observed_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_price_history_observed_at ON price_history (observed_at);
+"""
+
+def to_cents(price: Any) -> Optional[int]:
+    """Price as integer cents (None if missing or unparseable)."""
+    try:
+        return round(float(price) * 100)
+    except (TypeError, ValueError):
+        return None
+
+def listing_hash(product: Dict[str, Any]) -> str:
+    """Hash of the listing fields whose change warrants a fresh detail fetch."""
+    rating = product.get('rating') or {}
+    summary = [product.get('title'), product.get('price'), product.get('category'),
+               rating.get('rate'), rating.get('count')]
+    return hashlib.blake2b(json.dumps(summary, default=str).encode('utf-8'), digest_size=8).hexdigest()
+
+class PriceHistory:
+    """Latest listing state per product and change-only price/rating history."""
+
+    def __init__(self, path: str = ECOMMERCE_DB_PATH):
+        self.conn = open_db(path, _SCHEMA)
+        self._lock = threading.Lock()
+
+    def changed(self, listings: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Keys whose listing is new or differs from the stored one."""
+        with self._lock:
+            stored = {}
+            keys = list(listings)
+            for start in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+                chunk = keys[start:start + 500]
+                stored.update(self.conn.execute(
+                    f"SELECT key, listing_hash FROM products WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+        return [key for key, product in listings.items() if stored.get(key) != listing_hash(product)]
+
+    def observe(self, listings: Dict[str, Dict[str, Any]], now: Optional[int] = None) -> int:
+        """Record the listings; adds a history row where price or rating moved. Returns rows added."""
+        now = int(time.time()) if now is None else now
+        added = 0
+        with self._lock, self.conn:
+            for key, product in listings.items():
+                rating = product.get('rating') or {}
+                state = (to_cents(product.get('price')), to_cents(rating.get('rate')), rating.get('count'))
+                previous = self.conn.execute(
+                    'SELECT price_cents, rating_x100, rating_count FROM products WHERE key = ?', (key,)
+                ).fetchone()
+                self.conn.execute(
+                    'INSERT INTO products (key, listing_hash, price_cents, rating_x100, rating_count, first_seen, '
+                    'last_seen) VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET '
+                    'listing_hash = excluded.listing_hash, price_cents = excluded.price_cents, '
+                    'rating_x100 = excluded.rating_x100, rating_count = excluded.rating_count, '
+                    'last_seen = excluded.last_seen',
+                    (key, listing_hash(product), *state, now, now)
+                )
+                if previous is None or tuple(previous) != state:
+                    self.conn.execute(
+                        'INSERT OR REPLACE INTO price_history (key, observed_at, price_cents, rating_x100, '
+                        'rating_count) VALUES (?, ?, ?, ?, ?)', (key, now, *state)
+                    )
+                    added += 1
+        return added
+
+    def price_changes(self, days: float, now: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Price changes in the last ``days`` days, newest first, each with the price before it."""
+        now = int(time.time()) if now is None else now
+        rows = self.conn.execute(
+            'SELECT key, observed_at, price_cents, previous_cents FROM ('
+            '  SELECT key, observed_at, price_cents,'
+            '         LAG(price_cents) OVER (PARTITION BY key ORDER BY observed_at) AS previous_cents'
+            '  FROM price_history WHERE key IN (SELECT key FROM price_history WHERE observed_at >= ?)'
+            ') WHERE observed_at >= ? AND previous_cents IS NOT NULL AND previous_cents != price_cents '
+            'ORDER BY observed_at DESC',
+            (now - days * 86400, now - days * 86400)
+        )
+        return [{'key': key, 'observed_at': observed_at, 'price': cents / 100, 'previous_price': previous / 100}
+                for key, observed_at, cents, previous in rows]
+
+    def history(self, key: str) -> List[Dict[str, Any]]:
+        """Every recorded price/rating change of one product, oldest first."""
+        rows = self.conn.execute(
+            'SELECT observed_at, price_cents, rating_x100, rating_count FROM price_history WHERE key = ? '
+            'ORDER BY observed_at', (key,)
+        )
+        return [{'observed_at': observed_at,
+                 'price': cents / 100 if cents is not None else None,
+                 'rating': rating / 100 if rating is not None else None,
+                 'rating_count': count}
+                for observed_at, cents, rating, count in rows]
+
+    def close(self):
+        """Close the store."""
+        self.conn.close()
+
+class CatalogCrawler:
+    """Concurrent category/page walk that fetches details only for changed products."""
+
+    def __init__(self, request: Callable[..., requests.Response], history: PriceHistory,
+                 base_url: str = ECOMMERCE_BASE_URL, source: str = 'Fake Store API',
+                 workers: int = ECOMMERCE_WORKERS):
+        self.logger = setup_logger('catalog')
+        self.request = request
+        self.history = history
+        self.base_url = base_url.rstrip('/')
+        self.source = source
+        self.workers = workers
+        self._categories: Optional[List[str]] = None
+
+    def key(self, product: Dict[str, Any]) -> str:
+        """Same natural key as the Product record."""
+        return f"{self.source}:{product.get('id')}"
+
+    def categories(self, wanted: Iterable[str]) -> List[str]:
+        """Catalog categories matching any wanted term ('clothing' matches "men's clothing")."""
+        if self._categories is None:
+            self._categories = self.request(f"{self.base_url}/products/categories").json()
+        wanted = [term.lower() for term in wanted]
+        return [name for name in self._categories if any(term in name.lower() for term in wanted)]
+
+    def _page(self, category: str, offset: int) -> List[Dict[str, Any]]:
+        url = f"{self.base_url}/products/category/{quote(category, safe='')}"
+        return self.request(url, {'limit': ECOMMERCE_PAGE_SIZE, 'offset': offset}).json() or []
+
+    def listings(self, category: str, pool: ThreadPoolExecutor) -> Dict[str, Dict[str, Any]]:
+        """Every listing in a category, in waves of pages (1, 2, 4... up to ``workers``) until a short page."""
+        products: Dict[str, Dict[str, Any]] = {}
+        page, wave = 0, 1
+        while page < ECOMMERCE_MAX_PAGES and not expired():
+            pages = range(page, min(page + wave, ECOMMERCE_MAX_PAGES))
+            futures = [submit_in_context(pool, self._page, category, number * ECOMMERCE_PAGE_SIZE) for number in pages]
+            done = False
+            for future in futures:
+                items = future.result()
+                before = len(products)
+                products.update((self.key(product), product) for product in items)
+                # A short page ends the category; so does one with nothing new (the API ignored offset)
+                if len(items) < ECOMMERCE_PAGE_SIZE or len(products) == before:
+                    done = True
+            if done:
+                break
+            page += wave
+            wave = min(wave * 2, self.workers)
+        return products
+
+    def crawl(self, wanted: Iterable[str], now: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Products in the matching categories that are new or changed, with their detail fetched.
+
+        ``now`` (epoch seconds) timestamps the observations; defaults to the current time.
+        """
+        categories = self.categories(wanted)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool, \
+                ThreadPoolExecutor(max_workers=max(1, len(categories))) as category_pool:
+            # Categories walk side by side; their page requests share the one pool
+            listings: Dict[str, Dict[str, Any]] = {}
+            for future in [submit_in_context(category_pool, self.listings, name, pool) for name in categories]:
+                listings.update(future.result())
+
+            changed = self.history.changed(listings)
+            futures = {
+                submit_in_context(pool, self.request, f"{self.base_url}/products/{listings[key]['id']}"): key
+                for key in changed
+            }
+            details = []
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    details.append({**listings[key], **(future.result().json() or {})})
+                except Exception as e:
+                    # The listing still has the essentials; the detail fetch is retried next crawl
+                    self.logger.warning("Error fetching product %s: %s", key, e)
+                    details.append(listings[key])
+                    listings.pop(key)
+
+        added = self.history.observe(listings, now)
+        self.logger.info("Crawled %s products: %s changed, %s price/rating changes recorded",
+                         len(listings), len(changed), added)
+        return details
@@ -0,0 +1,122 @@
+"""
+Change-data-capture output (--changes-only).
+
+Quotes, story scores, comment counts and star counts are snapshots that a
+sweep re-emits in full even when almost nothing moved. ``ChangeFeedSink``
+wraps the file sink and writes a change feed instead: each record is
+compared, by natural key, with per-field hashes of the version last
+emitted, and becomes an ``insert`` event (the full record), an ``update``
+event (only the fields that changed) or nothing at all. The hashes live in
+a small SQLite file, so the feed carries on across runs and workers.
+Storage and the search index keep receiving full records; storage already
+tracks changes itself through ``updated_at``.
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config.config import CDC_IGNORE_FIELDS, CDC_STATE_PATH
+from utils.logger import setup_logger
+from utils.pipeline import Sink
+from utils.records import AnyRecord, as_dict, natural_key
+from utils.sqlite_store import open_db
+
+OP_INSERT = 'insert'
+OP_UPDATE = 'update'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS emitted (
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    PRIMARY KEY (category, key)
+) WITHOUT ROWID;
+"""
+
+def field_hashes(record: Dict[str, Any]) -> Dict[str, str]:
+    """Short hash of each field's value, skipping fields that change on every sweep."""
+    return {
+        name: hashlib.blake2b(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'),
+                              digest_size=6).hexdigest()
+        for name, value in record.items() if name not in CDC_IGNORE_FIELDS
+    }
+
+class ChangeStore:
+    """Field hashes of the last emitted version of each record."""
+
+    def __init__(self, path: str = CDC_STATE_PATH):
+        self.conn = open_db(path, _SCHEMA)
+        self._lock = threading.Lock()
+
+    def diff(self, category: str, records: Iterable[AnyRecord]) -> List[Dict[str, Any]]:
+        """Change events for the records, remembering what was emitted; unchanged records yield nothing."""
+        latest: Dict[str, Tuple[Dict[str, Any], Dict[str, str]]] = {}
+        for record in records:
+            data = as_dict(record)
+            latest[natural_key(record)] = (data, field_hashes(data))  # last version of a key in the batch wins
+
+        events = []
+        with self._lock, self.conn:
+            stored = self._load(category, list(latest))
+            for key, (data, hashes) in latest.items():
+                previous = stored.get(key)
+                if previous is None:
+                    events.append({'op': OP_INSERT, 'key': key, 'category': category,
+                                   'scraped_at': data.get('scraped_at'), 'record': data})
+                elif previous != hashes:
+                    changed = {name: data.get(name) for name in hashes.keys() | previous.keys()
+                               if hashes.get(name) != previous.get(name)}
+                    events.append({'op': OP_UPDATE, 'key': key, 'category': category,
+                                   'scraped_at': data.get('scraped_at'), 'changed': changed})
+                else:
+                    continue
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO emitted (category, key, fields) VALUES (?, ?, ?)',
+                    (category, key, json.dumps(hashes, separators=(',', ':'), sort_keys=True))
+                )
+        return events
+
+    def _load(self, category: str, keys: List[str]) -> Dict[str, Dict[str, str]]:
+        stored = {}
+        for start in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+            chunk = keys[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key, fields FROM emitted WHERE category = ? AND key IN ({','.join('?' * len(chunk))})",
+                [category, *chunk]
+            )
+            stored.update((key, json.loads(fields)) for key, fields in rows)
+        return stored
+
+    def close(self):
+        """Close the state database."""
+        self.conn.close()
+
+class ChangeFeedSink(Sink):
+    """Wraps a sink so it receives change events instead of full snapshots."""
+
+    def __init__(self, sink: Sink, category: str, store: Optional[ChangeStore] = None):
+        self.logger = setup_logger('cdc')
+        self.sink = sink
+        self.category = category
+        self.store = store or ChangeStore()
+        self.seen = 0
+        self.inserts = 0
+        self.updates = 0
+
+    def write(self, batch: List[AnyRecord]):
+        events = self.store.diff(self.category, batch)
+        self.seen += len(batch)
+        self.inserts += sum(1 for event in events if event['op'] == OP_INSERT)
+        self.updates += sum(1 for event in events if event['op'] == OP_UPDATE)
+        if events:
+            self.sink.write(events)
+
+    def close(self):
+        if self.seen:
+            self.logger.info("%s change feed: %s inserts, %s updates, %s unchanged of %s records",
+                             self.category, self.inserts, self.updates,
+                             self.seen - self.inserts - self.updates, self.seen)
+        try:
+            self.sink.close()
+        finally:
+            self.store.close()
@@ -0,0 +1,52 @@
+"""
+Run deadlines (--deadline) propagated through a context variable.
+
+``time_limit(seconds)`` sets a deadline for everything run inside it:
+``make_request`` caps its timeouts, retry waits and politeness delays to
+the time left, work units that start after expiry are skipped, and work
+in flight fails at its next request. Context variables don't follow work
+onto executor threads by themselves, so pools submit through
+``submit_in_context``.
+"""
+import contextvars
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('deadline', default=None)
+
+class DeadlineExceeded(Exception):
+    """Raised when work is attempted after the run's deadline."""
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """Run the block with a deadline ``seconds`` from now (an enclosing, earlier deadline wins)."""
+    if seconds is None:
+        yield
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def time_left() -> Optional[float]:
+    """Seconds until the deadline (never negative), or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+def expired() -> bool:
+    """True once the current deadline has passed."""
+    return time_left() == 0.0
+
+def check_deadline(what: str = 'work'):
+    """Raise DeadlineExceeded if the deadline has passed."""
+    if expired():
+        raise DeadlineExceeded(f"Deadline reached before {what}")
+
+def submit_in_context(pool: Executor, fn: Callable, *args, **kwargs) -> Future:
+    """Submit to a pool so the task runs with the caller's deadline (and other context)."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
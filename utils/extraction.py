@@ -0,0 +1,210 @@
+"""
+Article full-text extraction stage.
+
+Pages are downloaded on a thread pool; the CPU-heavy HTML-to-text
+extraction (trafilatura, with newspaper3k as fallback) runs in a process
+pool so it scales across cores instead of serializing on the GIL.
+Extracted bodies are cached by canonical URL, so an article is fetched and
+parsed at most once.
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from config.config import (EXTRACTION_CACHE_PATH, EXTRACTION_FETCH_WORKERS, EXTRACTION_MAX_BYTES,
+                           EXTRACTION_PROCESS_WORKERS)
+from utils.deadline import expired, submit_in_context, time_left
+from utils.http import get_session
+from utils.logger import setup_logger
+from utils.pipeline import Stage
+from utils.records import AnyRecord, Article
+from utils.retry import policy_for
+from utils.sqlite_store import open_db
+
+# Query parameters that only track the click and never change the page
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|cmpid|ocid)$', re.IGNORECASE)
+_CANONICAL_LINK = re.compile(
+    r'<link[^>]+rel=["\']canonical["\'][^>]*href=["\']([^"\']+)["\']'
+    r'|<link[^>]+href=["\']([^"\']+)["\'][^>]*rel=["\']canonical["\']',
+    re.IGNORECASE
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extracted (url TEXT PRIMARY KEY, text TEXT, extracted_at TEXT NOT NULL);
+"""
+
+# Returned by _download for pages that will never yield text (non-HTML, 404...)
+_UNEXTRACTABLE = object()
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so trivially different links to one article compare equal."""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if parts.port and not ((parts.scheme == 'http' and parts.port == 80) or
+                           (parts.scheme == 'https' and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(key)
+    ))
+    return urlunsplit((parts.scheme.lower(), host, path, query, ''))
+
+def extract_text(html: str, url: str) -> Dict[str, Optional[str]]:
+    """Extract the main text and canonical URL of a page (runs in a worker process)."""
+    text = None
+    try:
+        import trafilatura
+        text = trafilatura.extract(html, url=url, include_comments=False, include_tables=False)
+    except ImportError:
+        pass
+    if not text:
+        try:
+            from newspaper import Article as NewspaperArticle
+            parsed = NewspaperArticle(url)
+            parsed.set_html(html)
+            parsed.parse()
+            text = parsed.text or None
+        except ImportError:
+            pass
+
+    match = _CANONICAL_LINK.search(html)
+    page_canonical = (match.group(1) or match.group(2)) if match else None
+    return {'text': text, 'canonical_url': page_canonical}
+
+class ExtractionCache:
+    """SQLite cache of extracted article bodies keyed by canonical URL."""
+
+    def __init__(self, path: str = EXTRACTION_CACHE_PATH):
+        self.conn = open_db(path, _SCHEMA)
+        self._lock = threading.Lock()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Return cached bodies for the URLs that have one (text may be None if extraction failed)."""
+        urls = list(urls)
+        found = {}
+        with self._lock:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f'SELECT url, text FROM extracted WHERE url IN ({placeholders})', chunk
+                )
+                found.update(rows.fetchall())
+        return found
+
+    def put_many(self, entries: Dict[str, Optional[str]]):
+        """Store extracted bodies (None records a page with no extractable text)."""
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO extracted (url, text, extracted_at) VALUES (?, ?, ?)',
+                [(url, text, now) for url, text in entries.items()]
+            )
+
+    def close(self):
+        """Close the cache connection."""
+        self.conn.close()
+
+class ArticleExtractionStage(Stage):
+    """Pipeline stage that fills ``Article.content`` with the page's full text."""
+
+    def __init__(self, session: Optional[requests.Session] = None, cache: Optional[ExtractionCache] = None,
+                 fetch_workers: int = EXTRACTION_FETCH_WORKERS,
+                 process_workers: Optional[int] = EXTRACTION_PROCESS_WORKERS):
+        self.logger = setup_logger('extraction')
+        self.session = session or get_session()
+        self.cache = cache or ExtractionCache()
+        self.fetch_workers = fetch_workers
+        self.process_workers = process_workers
+        self._fetch_pool = None
+        self._process_pool = None
+
+    def process(self, batch: List[AnyRecord]) -> List[AnyRecord]:
+        articles = [record for record in batch
+                    if isinstance(record, Article) and record.link and not record.content]
+        if not articles:
+            return batch
+
+        by_url: Dict[str, List[Article]] = {}
+        for article in articles:
+            by_url.setdefault(canonical_url(article.link), []).append(article)
+
+        bodies = self.cache.get_many(by_url)
+        missing = [url for url in by_url if url not in bodies]
+        if missing:
+            extracted = self._extract(missing)
+            self.cache.put_many(extracted)
+            bodies.update(extracted)
+
+        for url, group in by_url.items():
+            for article in group:
+                article.content = bodies.get(url) or ''
+        return batch
+
+    def _extract(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """Download pages concurrently and hand each to the process pool as it arrives."""
+        if self._fetch_pool is None:
+            self._fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers)
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+
+        results: Dict[str, Optional[str]] = {}
+        downloads = {submit_in_context(self._fetch_pool, self._download, url): url for url in urls}
+        parses = {}
+        for future in as_completed(downloads):
+            url = downloads[future]
+            html = future.result()
+            if html is _UNEXTRACTABLE:
+                # Cached like a failed extraction, so the link isn't downloaded again
+                results[url] = None
+            elif html is not None:  # network failures (None) stay uncached so the next sweep retries them
+                parses[self._process_pool.submit(extract_text, html, url)] = url
+
+        for future in as_completed(parses):
+            url = parses[future]
+            try:
+                extracted = future.result()
+            except Exception as e:
+                self.logger.warning("Extraction failed for %s: %s", url, e)
+                results[url] = None
+                continue
+            results[url] = extracted['text']
+            if extracted['canonical_url']:
+                page_url = canonical_url(extracted['canonical_url'])
+                if page_url != url:
+                    results[page_url] = extracted['text']
+
+        self.logger.info("Extracted %s of %s articles", sum(1 for url in urls if results.get(url)), len(urls))
+        return results
+
+    def _download(self, url: str):
+        """Page HTML; _UNEXTRACTABLE for a permanent miss, None for a failure worth retrying."""
+        if expired():
+            return None
+        policy = policy_for(url)
+        try:
+            with self.session.get(url, timeout=policy.timeout(time_left()), stream=True) as response:
+                response.raise_for_status()
+                if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                    return _UNEXTRACTABLE
+                content = response.raw.read(EXTRACTION_MAX_BYTES, decode_content=True)
+                return content.decode(response.encoding or 'utf-8', errors='replace')
+        except requests.HTTPError as e:
+            self.logger.warning("Failed to download %s: %s", url, e)
+            return None if policy.is_retryable(e) else _UNEXTRACTABLE
+        except Exception as e:
+            self.logger.warning("Failed to download %s: %s", url, e)
+            return None
+
+    def close(self):
+        """Shut down the worker pools and the cache."""
+        if self._fetch_pool is not None:
+            self._fetch_pool.shutdown(wait=True)
+            self._process_pool.shutdown(wait=True)
+            self._fetch_pool = self._process_pool = None
+        self.cache.close()
@@ -0,0 +1,137 @@
+"""
+Central feed registry and per-sweep fetch coalescing.
+
+Feeds are declared once in ``config.FEEDS`` (optionally extended by a JSON
+file at ``FEEDS_FILE``) with the categories that subscribe to them, a
+per-category entry limit and a poll interval. A ``FeedSweep`` makes sure
+each unique feed URL is fetched at most once per sweep, however many
+categories subscribe to it.
+"""
+import json
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from config.config import FEEDS, FEEDS_FILE, FEED_FETCH_WORKERS, FEED_POLL_INTERVAL
+from utils.deadline import submit_in_context
+from utils.feeds import FeedFetcher
+
+@dataclass(frozen=True)
+class FeedSpec:
+    """One registered feed."""
+    name: str
+    url: str
+    categories: Dict[str, int]  # category -> max entries taken per sweep
+    poll_interval: int = FEED_POLL_INTERVAL
+    source: str = ''
+
+    def limit_for(self, category: str) -> int:
+        return self.categories[category]
+
+class FeedRegistry:
+    """Feeds by name, with lookups by subscribing category."""
+
+    def __init__(self, feeds: Dict[str, Dict]):
+        self.feeds: Dict[str, FeedSpec] = {}
+        for name, spec in feeds.items():
+            self.feeds[name] = FeedSpec(
+                name=name,
+                url=spec['url'],
+                categories=dict(spec['categories']),
+                poll_interval=spec.get('poll_interval', FEED_POLL_INTERVAL),
+                source=spec.get('source', name)
+            )
+
+    @classmethod
+    def load(cls, path: Optional[str] = FEEDS_FILE) -> 'FeedRegistry':
+        """Build the registry from config.FEEDS plus the optional JSON feeds file."""
+        feeds = dict(FEEDS)
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                feeds.update(json.load(f))
+        return cls(feeds)
+
+    def feeds_for(self, category: str) -> List[FeedSpec]:
+        """Feeds the category subscribes to."""
+        return [spec for spec in self.feeds.values() if category in spec.categories]
+
+_registry = None
+
+def get_feed_registry() -> FeedRegistry:
+    """Process-wide registry, loaded on first use."""
+    global _registry
+    if _registry is None:
+        _registry = FeedRegistry.load()
+    return _registry
+
+class FeedSweep:
+    """Coalesces feed fetches so each URL is downloaded once per sweep.
+
+    The first request for a URL starts the fetch; concurrent and later requests
+    for the same URL (from any category) wait on and reuse that result.
+    """
+
+    def __init__(self, max_workers: int = FEED_FETCH_WORKERS):
+        self.max_workers = max_workers
+        self._results: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.requested = 0
+
+    @property
+    def fetched(self) -> int:
+        """Number of distinct URLs actually downloaded in this sweep."""
+        return len(self._results)
+
+    def _get(self, url: str, fetcher: FeedFetcher, keep_failure: bool = False) -> List[Dict[str, str]]:
+        with self._lock:
+            if not keep_failure:
+                self.requested += 1
+            future = self._results.get(url)
+            owner = future is None
+            if owner:
+                future = self._results[url] = Future()
+        if owner:
+            try:
+                future.set_result(fetcher.fetch(url))
+            except Exception as e:
+                future.set_exception(e)
+        if future.exception() is not None and not keep_failure:
+            # A failure is reported once; the next request for the URL (e.g. a unit retry) fetches it afresh
+            with self._lock:
+                if self._results.get(url) is future:
+                    del self._results[url]
+        return future.result()
+
+    def prefetch(self, urls: Iterable[str], fetcher: FeedFetcher):
+        """Start fetching the URLs concurrently and return without waiting.
+
+        Later requests for them wait on these fetches; a failure is kept until
+        the first such request reports it.
+        """
+        urls = [url for url in dict.fromkeys(urls) if url not in self._results]
+        if not urls:
+            return
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls)))
+        for url in urls:
+            submit_in_context(pool, self._get, url, fetcher, keep_failure=True)
+        pool.shutdown(wait=False)  # queued fetches still run
+
+    def fetch(self, feeds: List[FeedSpec], fetcher: FeedFetcher,
+              on_error: Optional[Callable[[FeedSpec, Exception], None]] = None
+              ) -> Iterator[Tuple[FeedSpec, List[Dict[str, str]]]]:
+        """Yield (feed, entries) as each feed is ready, fetching uncached ones concurrently.
+
+        Feeds that fail are reported to ``on_error`` (when given) and skipped.
+        """
+        if not feeds:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(feeds))) as pool:
+            futures = {submit_in_context(pool, self._get, spec.url, fetcher): spec for spec in feeds}
+            for future in as_completed(futures):
+                spec = futures[future]
+                try:
+                    yield spec, future.result()
+                except Exception as e:
+                    if on_error is not None:
+                        on_error(spec, e)
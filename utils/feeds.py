@@ -0,0 +1,112 @@
+"""
+Feed fetching and parsing, kept separate from each other.
+
+Feeds are downloaded through the scraper's own ``make_request`` (pooled
+session, timeouts, retries, compression) instead of feedparser's built-in
+urllib fetcher. Parsing runs on a shared process pool. Well-formed RSS 2.0,
+RSS 1.0 and Atom documents take an lxml fast path; anything else falls back
+to feedparser.
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+from config.config import FEED_PARSE_WORKERS
+
+try:
+    from lxml import etree
+except ImportError:  # fall back to feedparser for everything
+    etree = None
+
+FEED_ACCEPT = 'application/rss+xml, application/atom+xml, application/rdf+xml;q=0.9, application/xml;q=0.8, */*;q=0.5'
+
+# Fields every parsed entry carries, whichever parser produced it
+ENTRY_FIELDS = ('id', 'title', 'link', 'description', 'summary', 'published', 'updated')
+
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_RSS1 = '{http://purl.org/rss/1.0/}'
+_DC_DATE = '{http://purl.org/dc/elements/1.1/}date'
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def _text(element, path: str) -> str:
+    value = element.findtext(path)
+    return value.strip() if value else ''
+
+def _rss_entry(item, ns: str = '') -> Dict[str, str]:
+    description = _text(item, f'{ns}description')
+    return {
+        'id': _text(item, 'guid') or _text(item, f'{ns}link'),
+        'title': _text(item, f'{ns}title'),
+        'link': _text(item, f'{ns}link'),
+        'description': description,
+        'summary': description,
+        'published': _text(item, 'pubDate') or _text(item, _DC_DATE),
+        'updated': _text(item, _DC_DATE)
+    }
+
+def _atom_entry(entry) -> Dict[str, str]:
+    link = ''
+    for candidate in entry.iterfind(f'{_ATOM}link'):
+        if candidate.get('rel', 'alternate') == 'alternate':
+            link = candidate.get('href', '')
+            break
+    summary = _text(entry, f'{_ATOM}summary') or _text(entry, f'{_ATOM}content')
+    return {
+        'id': _text(entry, f'{_ATOM}id'),
+        'title': _text(entry, f'{_ATOM}title'),
+        'link': link,
+        'description': summary,
+        'summary': summary,
+        'published': _text(entry, f'{_ATOM}published') or _text(entry, f'{_ATOM}updated'),
+        'updated': _text(entry, f'{_ATOM}updated')
+    }
+
+def _parse_with_lxml(content: bytes) -> Optional[List[Dict[str, str]]]:
+    """Parse well-formed RSS/Atom; None means 'let feedparser handle it'."""
+    parser = etree.XMLParser(resolve_entities=False, no_network=True)
+    try:
+        root = etree.fromstring(content, parser)
+    except etree.XMLSyntaxError:
+        return None
+
+    if root.tag == 'rss':
+        return [_rss_entry(item) for item in root.iterfind('channel/item')]
+    if root.tag == f'{_ATOM}feed':
+        return [_atom_entry(entry) for entry in root.iterfind(f'{_ATOM}entry')]
+    if etree.QName(root).localname == 'RDF':
+        return [_rss_entry(item, _RSS1) for item in root.iterfind(f'{_RSS1}item')]
+    return None
+
+def _parse_with_feedparser(content: bytes) -> List[Dict[str, str]]:
+    import feedparser
+    feed = feedparser.parse(content)
+    if feed.bozo and not feed.entries:
+        raise ValueError(f"Unparseable feed: {feed.get('bozo_exception')}")
+    return [{field: entry.get(field, '') for field in ENTRY_FIELDS} for entry in feed.entries]
+
+def parse_feed(content: bytes) -> List[Dict[str, str]]:
+    """Parse raw feed bytes into plain entry dicts (runs in a worker process)."""
+    entries = _parse_with_lxml(content) if etree is not None else None
+    if entries is None:
+        entries = _parse_with_feedparser(content)
+    return entries
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=FEED_PARSE_WORKERS)
+        return _parse_pool
+
+class FeedFetcher:
+    """Fetches feeds through a request function and parses them on the shared pool."""
+
+    def __init__(self, request: Callable, logger):
+        self.request = request
+        self.logger = logger
+
+    def fetch(self, url: str) -> List[Dict[str, str]]:
+        """Download and parse one feed; raises on network or parse failure."""
+        response = self.request(url, headers={'Accept': FEED_ACCEPT})
+        return _get_parse_pool().submit(parse_feed, response.content).result()
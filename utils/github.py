@@ -0,0 +1,188 @@
+"""
+Quota-aware GitHub client.
+
+REST calls go through the scraper's ``make_request`` (pooled session,
+timeouts, retries, source health) with an ``If-None-Match`` header for any
+URL fetched before. A 304 reuses the cached body and doesn't count against
+the rate limit. The ``X-RateLimit-*`` headers of every response are tracked
+per resource (core, search, graphql). A call that would exhaust its resource
+waits for the reset if the run has time for it, and raises
+``GitHubRateLimited`` otherwise. Search results are paged through the
+``Link`` header. Repository details that search doesn't return are fetched
+for many repositories per GraphQL query instead of one REST call each.
+"""
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import requests
+from config.config import (GITHUB_CACHE_PATH, GITHUB_GRAPHQL_BATCH, GITHUB_MAX_RATE_WAIT, GITHUB_RATE_RESERVE,
+                           GITHUB_TOKEN)
+from utils.deadline import time_left
+from utils.logger import setup_logger
+from utils.retry import policy_for
+from utils.sqlite_store import open_db
+
+API = 'https://api.github.com'
+GRAPHQL_URL = f'{API}/graphql'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    body TEXT NOT NULL,
+    next_url TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Details search results lack; fetched per repository alias in one GraphQL query
+_REPO_FRAGMENT = """
+fragment details on Repository {
+  watchers { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+  latestRelease { tagName }
+}
+"""
+
+class GitHubRateLimited(requests.RequestException):
+    """The rate limit for a resource is used up until ``reset`` (epoch seconds)."""
+
+    def __init__(self, resource: str, reset: float):
+        super().__init__(f"GitHub {resource} rate limit exhausted until {time.strftime('%H:%M:%S', time.localtime(reset))}")
+        self.resource = resource
+        self.reset = reset
+
+class GitHubClient:
+    """REST search with conditional requests and paging, plus batched GraphQL enrichment."""
+
+    def __init__(self, request: Callable[..., requests.Response], session: requests.Session,
+                 token: str = GITHUB_TOKEN, cache_path: str = GITHUB_CACHE_PATH):
+        self.logger = setup_logger('github')
+        self.request = request
+        self.session = session
+        self.token = token
+        self.cache = open_db(cache_path, _SCHEMA)
+        self._lock = threading.Lock()
+        # resource -> [remaining, reset epoch]
+        self._limits: Dict[str, List[float]] = {}
+        self.not_modified = 0
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {'Accept': 'application/vnd.github+json'}
+        if self.token:
+            headers['Authorization'] = f'token {self.token}'
+        return headers
+
+    def _acquire(self, resource: str):
+        """Reserve one call against the resource's quota, waiting for the reset if there's time."""
+        while True:
+            with self._lock:
+                limit = self._limits.get(resource)
+                now = time.time()
+                if limit is None or limit[0] > GITHUB_RATE_RESERVE or limit[1] <= now:
+                    if limit is not None:
+                        limit[0] -= 1  # optimistic; the response headers correct it
+                    return
+                wait = limit[1] - now + 1
+            left = time_left()
+            if wait > GITHUB_MAX_RATE_WAIT or (left is not None and wait > left):
+                raise GitHubRateLimited(resource, limit[1])
+            self.logger.info("GitHub %s quota used up; waiting %.0fs for the reset", resource, wait)
+            time.sleep(wait)
+
+    def _track(self, response: requests.Response, resource: str):
+        """Update the quota for the resource named in the response headers."""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            self._limits[response.headers.get('X-RateLimit-Resource', resource)] = [int(remaining), float(reset)]
+
+    def get(self, url: str, params: Optional[Dict] = None, resource: str = 'core') -> Tuple[Any, Optional[str]]:
+        """GET a REST URL conditionally; returns (JSON body, next page URL)."""
+        key = f"{url}?{urlencode(sorted((params or {}).items()))}" if params else url
+        with self._lock:
+            cached = self.cache.execute('SELECT etag, body, next_url FROM responses WHERE url = ?', (key,)).fetchone()
+        headers = self._headers()
+        if cached:
+            headers['If-None-Match'] = cached[0]
+
+        self._acquire(resource)
+        try:
+            response = self.request(url, params, headers=headers)
+        except requests.HTTPError as e:
+            if e.response is not None:
+                self._track(e.response, resource)
+                if e.response.status_code in (403, 429) and e.response.headers.get('X-RateLimit-Remaining') == '0':
+                    raise GitHubRateLimited(resource, float(e.response.headers.get('X-RateLimit-Reset', time.time())))
+            raise
+        self._track(response, resource)
+
+        if response.status_code == 304 and cached:
+            self.not_modified += 1
+            return json.loads(cached[1]), cached[2]
+        body = response.json()
+        next_url = response.links.get('next', {}).get('url')
+        etag = response.headers.get('ETag')
+        if etag:
+            with self._lock, self.cache:
+                self.cache.execute(
+                    'INSERT OR REPLACE INTO responses (url, etag, body, next_url, fetched_at) VALUES (?, ?, ?, ?, ?)',
+                    (key, etag, response.text, next_url, time.time())
+                )
+        return body, next_url
+
+    def search_repositories(self, query: str, limit: int, sort: str = 'stars') -> List[Dict[str, Any]]:
+        """Up to ``limit`` repositories matching a search query, paging 100 at a time."""
+        params = {'q': query, 'sort': sort, 'order': 'desc', 'per_page': min(100, limit)}
+        body, next_url = self.get(f"{API}/search/repositories", params, resource='search')
+        items = body.get('items', [])
+        while next_url and len(items) < limit:
+            # The next link carries every query parameter itself
+            body, next_url = self.get(next_url, resource='search')
+            items.extend(body.get('items', []))
+        return items[:limit]
+
+    def repository_details(self, full_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Watchers, open pull requests and latest release per repository, via batched GraphQL.
+
+        GraphQL needs a token; without one this returns nothing.
+        """
+        if not self.token:
+            return {}
+        details = {}
+        for start in range(0, len(full_names), GITHUB_GRAPHQL_BATCH):
+            batch = full_names[start:start + GITHUB_GRAPHQL_BATCH]
+            aliases = []
+            for position, full_name in enumerate(batch):
+                owner, _, name = full_name.partition('/')
+                aliases.append(f"r{position}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) "
+                               "{ ...details }")
+            query = "query {\n" + "\n".join(aliases) + "\n}\n" + _REPO_FRAGMENT
+
+            self._acquire('graphql')
+            response = self.session.post(GRAPHQL_URL, json={'query': query}, headers=self._headers(),
+                                         timeout=policy_for(GRAPHQL_URL).timeout(time_left()))
+            self._track(response, 'graphql')
+            response.raise_for_status()
+            payload = response.json()
+            if payload.get('errors'):
+                # Missing or renamed repositories come back as errors next to the other results
+                self.logger.debug("GraphQL errors: %s", payload['errors'])
+            data = payload.get('data') or {}
+            for position, full_name in enumerate(batch):
+                repo = data.get(f"r{position}")
+                if repo:
+                    details[full_name] = {
+                        'watchers': repo['watchers']['totalCount'],
+                        'open_pull_requests': repo['pullRequests']['totalCount'],
+                        'latest_release': (repo.get('latestRelease') or {}).get('tagName') or ''
+                    }
+        return details
+
+    def close(self):
+        """Close the response cache."""
+        self.cache.close()
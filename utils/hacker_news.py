@@ -0,0 +1,220 @@
+"""
+Incremental Hacker News mirror.
+
+Instead of re-fetching the top stories every run, ``HackerNewsSync`` keeps a
+local SQLite store of items and follows the API's own change signals:
+``/v0/maxitem.json`` says which item IDs are new since the last sync (they
+are fetched in concurrent batches, and the watermark advances after each
+batch), and ``/v0/updates.json`` lists the items and profiles that changed
+recently, which are the only ones re-fetched. Every time a story's score or
+comment count moves, a row goes into ``score_history``, so trends can be read
+back with ``HackerNewsStore.history``.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional
+import requests
+from config.config import HN_DB_PATH, HN_SYNC_BACKFILL, HN_SYNC_BATCH, HN_SYNC_MAX_ITEMS, HN_SYNC_WORKERS
+from utils.deadline import expired, submit_in_context, time_left
+from utils.logger import setup_logger
+from utils.retry import policy_for
+from utils.sqlite_store import open_db
+
+API = 'https://hacker-news.firebaseio.com/v0'
+STORY_TYPES = ('story', 'job', 'poll')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    type TEXT,
+    by TEXT,
+    time INTEGER,
+    title TEXT,
+    url TEXT,
+    text TEXT,
+    parent INTEGER,
+    score INTEGER,
+    descendants INTEGER,
+    dead INTEGER NOT NULL DEFAULT 0,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS score_history (
+    id INTEGER NOT NULL,
+    observed_at REAL NOT NULL,
+    score INTEGER,
+    descendants INTEGER,
+    PRIMARY KEY (id, observed_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    karma INTEGER,
+    created INTEGER,
+    about TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS retry_items (
+    id INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+class HackerNewsStore:
+    """Local mirror of HN items and profiles, with score and comment-count history."""
+
+    def __init__(self, path: str = HN_DB_PATH):
+        self.conn = open_db(path, _SCHEMA)
+        self._lock = threading.Lock()
+
+    @property
+    def max_item(self) -> Optional[int]:
+        """Highest item ID fetched so far (the new-item watermark)."""
+        row = self.conn.execute("SELECT value FROM sync_state WHERE name = 'max_item'").fetchone()
+        return row[0] if row else None
+
+    def set_max_item(self, value: int):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO sync_state (name, value) VALUES ('max_item', ?)", (value,))
+
+    def save_items(self, items: Iterable[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """Upsert items; a score/descendants change on a story adds a history row. Returns rows written."""
+        now = time.time() if now is None else now
+        count = 0
+        with self._lock, self.conn:
+            for item in items:
+                previous = self.conn.execute(
+                    'SELECT score, descendants FROM items WHERE id = ?', (item['id'],)
+                ).fetchone()
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO items (id, type, by, time, title, url, text, parent, score, '
+                    'descendants, dead, deleted, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (item['id'], item.get('type'), item.get('by'), item.get('time'), item.get('title'),
+                     item.get('url'), item.get('text'), item.get('parent'), item.get('score'),
+                     item.get('descendants'), int(bool(item.get('dead'))), int(bool(item.get('deleted'))), now)
+                )
+                observed = (item.get('score'), item.get('descendants'))
+                if item.get('type') in STORY_TYPES and observed != tuple(previous or (None, None)):
+                    self.conn.execute(
+                        'INSERT OR REPLACE INTO score_history (id, observed_at, score, descendants) VALUES (?, ?, ?, ?)',
+                        (item['id'], now, *observed)
+                    )
+                self.conn.execute('DELETE FROM retry_items WHERE id = ?', (item['id'],))
+                count += 1
+        return count
+
+    def save_users(self, users: Iterable[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """Upsert user profiles; returns rows written."""
+        now = time.time() if now is None else now
+        rows = [(user['id'], user.get('karma'), user.get('created'), user.get('about'), now) for user in users]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO users (id, karma, created, about, fetched_at) VALUES (?, ?, ?, ?, ?)', rows
+            )
+        return len(rows)
+
+    def add_retries(self, item_ids: Iterable[int]):
+        """Remember item IDs whose fetch failed so the next sync tries them again."""
+        with self._lock, self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO retry_items (id) VALUES (?)', [(i,) for i in item_ids])
+
+    def retries(self) -> List[int]:
+        return [row[0] for row in self.conn.execute('SELECT id FROM retry_items ORDER BY id')]
+
+    def history(self, item_id: int) -> List[Dict[str, Any]]:
+        """Score and comment-count observations for a story, oldest first."""
+        rows = self.conn.execute(
+            'SELECT observed_at, score, descendants FROM score_history WHERE id = ? ORDER BY observed_at', (item_id,)
+        )
+        return [{'observed_at': observed_at, 'score': score, 'descendants': descendants}
+                for observed_at, score, descendants in rows]
+
+    def close(self):
+        """Close the store."""
+        self.conn.close()
+
+class HackerNewsSync:
+    """Pulls new and changed HN items into a ``HackerNewsStore``."""
+
+    def __init__(self, session: requests.Session, store: Optional[HackerNewsStore] = None,
+                 workers: int = HN_SYNC_WORKERS):
+        self.logger = setup_logger('hacker_news')
+        self.session = session
+        self.store = store or HackerNewsStore()
+        self.workers = workers
+
+    def _get(self, path: str) -> Any:
+        url = f"{API}/{path}.json"
+        response = self.session.get(url, timeout=policy_for(url).timeout(time_left()))
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_items(self, item_ids: List[int]) -> List[Dict[str, Any]]:
+        """Fetch items concurrently; IDs that fail go on the retry list, missing ones are dropped."""
+        items, failed = [], []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {submit_in_context(pool, self._get, f"item/{item_id}"): item_id for item_id in item_ids}
+            for future in as_completed(futures):
+                try:
+                    item = future.result()
+                except Exception as e:
+                    self.logger.debug("Error fetching HN item %s: %s", futures[future], e)
+                    failed.append(futures[future])
+                    continue
+                if item:  # the API returns null for IDs it doesn't serve yet
+                    items.append(item)
+        if failed:
+            self.store.add_retries(failed)
+            self.logger.warning("Could not fetch %s of %s HN items; they will be retried", len(failed), len(item_ids))
+        return items
+
+    def fetch_users(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch profiles concurrently, skipping any that fail."""
+        users = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [submit_in_context(pool, self._get, f"user/{user_id}") for user_id in user_ids]
+            for future in as_completed(futures):
+                try:
+                    user = future.result()
+                except Exception as e:
+                    self.logger.debug("Error fetching HN profile: %s", e)
+                    continue
+                if user:
+                    users.append(user)
+        return users
+
+    def sync(self) -> List[Dict[str, Any]]:
+        """Fetch items created since the watermark plus recently changed ones; returns the stories among them."""
+        newest = self._get('maxitem')
+        start = self.store.max_item
+        if start is None:
+            start = max(0, newest - HN_SYNC_BACKFILL)
+        stop = min(newest, start + HN_SYNC_MAX_ITEMS)  # the rest is picked up next sync
+
+        stories: Dict[int, Dict[str, Any]] = {}
+        new_items = 0
+        for batch_start in range(start + 1, stop + 1, HN_SYNC_BATCH):
+            if expired():
+                break
+            batch_stop = min(stop, batch_start + HN_SYNC_BATCH - 1)
+            items = self.fetch_items(list(range(batch_start, batch_stop + 1)))
+            new_items += self.store.save_items(items)
+            stories.update((item['id'], item) for item in items if item.get('type') in STORY_TYPES)
+            self.store.set_max_item(batch_stop)
+
+        changed = self._get('updates')
+        item_ids = sorted(set(changed.get('items', [])) | set(self.store.retries()))
+        items = self.fetch_items(item_ids) if item_ids and not expired() else []
+        self.store.save_items(items)
+        stories.update((item['id'], item) for item in items if item.get('type') in STORY_TYPES)
+        profiles = changed.get('profiles', [])
+        users = self.fetch_users(profiles) if profiles and not expired() else []
+        self.store.save_users(users)
+
+        self.logger.info("HN sync: %s new items up to %s (%s behind), %s changed items, %s profiles",
+                         new_items, self.store.max_item, newest - (self.store.max_item or newest),
+                         len(items), len(users))
+        return list(stories.values())
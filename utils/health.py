@@ -0,0 +1,203 @@
+"""
+Per-source health registry with circuit breaking and adaptive timeouts.
+
+Every request made through ``BaseScraper.make_request`` reports its outcome
+and latency for its host. After ``HEALTH_FAILURE_THRESHOLD`` consecutive
+transient failures the host's circuit opens and requests to it fail
+immediately; after ``HEALTH_OPEN_SECONDS`` a single half-open probe is let
+through, and its result closes or re-opens the circuit. Once enough
+successful samples exist, the read timeout follows the observed p99
+latency instead of the fixed configured timeout. State is persisted in
+SQLite so a dead source stays skipped across runs.
+"""
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import requests
+from config.config import (HEALTH_DB_PATH, HEALTH_FAILURE_THRESHOLD, HEALTH_MIN_SAMPLES, HEALTH_MIN_TIMEOUT,
+                           HEALTH_OPEN_SECONDS, HEALTH_TIMEOUT_MULTIPLIER, HEALTH_WINDOW)
+from utils.sqlite_store import open_db
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_health (
+    host TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    opened_at REAL NOT NULL,
+    consecutive_failures INTEGER NOT NULL,
+    samples TEXT NOT NULL
+);
+"""
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+    def __init__(self, host: str, failures: int, retry_after: float):
+        super().__init__(f"Circuit open for {host} after {failures} failures")
+        self.host = host
+        self.retry_after = retry_after  # seconds until a half-open probe may go out (0: one is in flight)
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of the values (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+class SourceHealth:
+    """Recent outcomes and circuit state for one host."""
+
+    def __init__(self, host: str, window: int = HEALTH_WINDOW):
+        self.host = host
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.latencies: Deque[float] = deque(maxlen=window)  # successful requests only
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0  # wall-clock time, so it survives restarts
+        self.probing = False
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else None
+
+    def latency(self, pct: float) -> Optional[float]:
+        return percentile(list(self.latencies), pct)
+
+    def to_row(self) -> Tuple:
+        samples = {'outcomes': [int(ok) for ok in self.outcomes], 'latencies': list(self.latencies)}
+        return (self.host, self.state, self.opened_at, self.consecutive_failures, json.dumps(samples))
+
+    @classmethod
+    def from_row(cls, row: Tuple, window: int = HEALTH_WINDOW) -> 'SourceHealth':
+        host, state, opened_at, consecutive_failures, samples = row
+        health = cls(host, window)
+        # A probe in flight when the process stopped never reported back
+        health.state = OPEN if state == HALF_OPEN else state
+        health.opened_at = opened_at
+        health.consecutive_failures = consecutive_failures
+        samples = json.loads(samples)
+        health.outcomes.extend(bool(ok) for ok in samples['outcomes'])
+        health.latencies.extend(samples['latencies'])
+        return health
+
+class HealthRegistry:
+    """Thread-safe registry of ``SourceHealth`` by host, persisted to SQLite."""
+
+    def __init__(self, path: Optional[str] = HEALTH_DB_PATH):
+        self.path = path
+        self.sources: Dict[str, SourceHealth] = {}
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        return open_db(self.path, _SCHEMA)
+
+    def _load(self):
+        conn = self._connect()
+        try:
+            for row in conn.execute('SELECT host, state, opened_at, consecutive_failures, samples FROM source_health'):
+                self.sources[row[0]] = SourceHealth.from_row(row)
+        finally:
+            conn.close()
+
+    def save(self):
+        """Persist every host's state and recent samples."""
+        if not self.path:
+            return
+        with self._lock:
+            rows = [health.to_row() for health in self.sources.values()]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO source_health VALUES (?, ?, ?, ?, ?)', rows)
+        finally:
+            conn.close()
+
+    def _source(self, host: str) -> SourceHealth:
+        health = self.sources.get(host)
+        if health is None:
+            health = self.sources[host] = SourceHealth(host)
+        return health
+
+    def before_request(self, host: str):
+        """Raise CircuitOpenError unless a request to the host may go out now."""
+        with self._lock:
+            health = self._source(host)
+            if health.state == CLOSED:
+                return
+            if health.state == OPEN and time.time() - health.opened_at >= HEALTH_OPEN_SECONDS:
+                health.state = HALF_OPEN
+            if health.state == HALF_OPEN and not health.probing:
+                health.probing = True
+                return
+            retry_after = max(0.0, health.opened_at + HEALTH_OPEN_SECONDS - time.time())
+            raise CircuitOpenError(host, health.consecutive_failures, retry_after)
+
+    def record(self, host: str, ok: bool, latency: float):
+        """Report a request outcome; opens or closes the host's circuit as needed."""
+        with self._lock:
+            health = self._source(host)
+            health.outcomes.append(ok)
+            health.probing = False
+            if ok:
+                health.latencies.append(latency)
+                health.consecutive_failures = 0
+                health.state = CLOSED
+                return
+            health.consecutive_failures += 1
+            if health.state == HALF_OPEN or health.consecutive_failures >= HEALTH_FAILURE_THRESHOLD:
+                health.state = OPEN
+                health.opened_at = time.time()
+
+    def timeout(self, host: str, timeout: Tuple[float, float]) -> Tuple[float, float]:
+        """Tighten a (connect, read) timeout to the host's observed p99 latency."""
+        connect, read = timeout
+        with self._lock:
+            health = self.sources.get(host)
+            if health is None or len(health.latencies) < HEALTH_MIN_SAMPLES:
+                return timeout
+            p99 = health.latency(99)
+        read = min(read, max(HEALTH_MIN_TIMEOUT, p99 * HEALTH_TIMEOUT_MULTIPLIER))
+        return (min(connect, read), read)
+
+    def latency(self, host: str, pct: float) -> Optional[float]:
+        """Observed latency percentile for the host, or None until it has enough samples."""
+        with self._lock:
+            health = self.sources.get(host)
+            if health is None or len(health.latencies) < HEALTH_MIN_SAMPLES:
+                return None
+            return health.latency(pct)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-host summary: state, success rate and latency percentiles."""
+        with self._lock:
+            return [{
+                'host': health.host,
+                'state': health.state,
+                'requests': len(health.outcomes),
+                'success_rate': health.success_rate,
+                'p50': health.latency(50),
+                'p95': health.latency(95),
+                'p99': health.latency(99)
+            } for health in sorted(self.sources.values(), key=lambda h: h.host)]
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_health_registry() -> HealthRegistry:
+    """Process-wide registry, loaded on first use and saved at exit."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = HealthRegistry()
+            atexit.register(_registry.save)
+        return _registry
@@ -0,0 +1,103 @@
+"""
+Hedged GET requests for latency-sensitive sources.
+
+If a request to a host whose policy has ``hedge`` set hasn't finished by
+the host's observed p95 latency, an identical second request is sent and
+whichever succeeds first is used. Hedges are capped globally at
+``HEDGE_BUDGET_RATIO`` of hedge-eligible requests, so hedging only adds a
+few percent of traffic, and win counts are kept to show whether it pays.
+"""
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+import requests
+from config.config import HEDGE_BUDGET_RATIO, HEDGE_BURST, HEDGE_WORKERS
+
+class HedgeBudget:
+    """Global hedge allowance plus hedge outcome counters."""
+
+    def __init__(self, ratio: float = HEDGE_BUDGET_RATIO, burst: int = HEDGE_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self.requests = 0  # hedge-eligible requests
+        self.hedges = 0  # second requests actually sent
+        self.hedge_wins = 0  # hedges that answered before the original
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def try_acquire(self) -> bool:
+        """Claim one hedge if it keeps hedges within ratio x requests (+ burst)."""
+        with self._lock:
+            if self.hedges >= self.requests * self.ratio + self.burst:
+                return False
+            self.hedges += 1
+            return True
+
+    def count_win(self):
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'hedge_rate': self.hedges / self.requests if self.requests else 0.0,
+                'win_rate': self.hedge_wins / self.hedges if self.hedges else 0.0
+            }
+
+budget = HedgeBudget()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='hedge')
+        return _pool
+
+def _close_loser(future: Future):
+    """Release the connection held by a response nobody will read."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def hedged_get(session: requests.Session, url: str, hedge_after: Optional[float],
+               **kwargs) -> requests.Response:
+    """GET ``url``, sending a second identical request if the first exceeds ``hedge_after`` seconds.
+
+    With no ``hedge_after`` (too few latency samples yet) this is a plain
+    ``session.get``. The first successful response wins; an error is only
+    raised once every request sent has failed.
+    """
+    if hedge_after is None:
+        return session.get(url, **kwargs)
+    budget.count_request()
+    pool = _get_pool()
+    primary = pool.submit(session.get, url, **kwargs)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done or not budget.try_acquire():
+        return primary.result()
+
+    hedge = pool.submit(session.get, url, **kwargs)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None:
+                error = future.exception()
+                continue
+            if future is hedge:
+                budget.count_win()
+            for loser in pending:
+                loser.add_done_callback(_close_loser)
+            for extra in done - {future}:
+                _close_loser(extra)
+            return future.result()
+    raise error
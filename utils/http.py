@@ -0,0 +1,64 @@
+"""
+Process-wide HTTP session factory.
+
+Every scraper, the feed fetcher and the extraction stage share one
+``requests.Session``, so keep-alive connections (and their TLS sessions)
+to a host are reused across categories in a run instead of being set up
+again by each scraper. Hosts listed in ``HTTP_HOST_POOL_SIZES`` get their
+own adapter with a larger connection pool.
+"""
+import atexit
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config.config import HTTP_HOST_POOL_SIZES, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, USER_AGENT
+
+try:  # urllib3 only decodes br responses when a brotli package is installed
+    import brotli  # noqa: F401
+    _BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _BROTLI = True
+    except ImportError:
+        _BROTLI = False
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if _BROTLI else 'gzip, deflate'
+
+_session = None
+_session_lock = threading.Lock()
+
+def create_session() -> requests.Session:
+    """Build a session with tuned per-host pools and explicit compression headers."""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': ACCEPT_ENCODING
+    })
+    default = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount('https://', default)
+    session.mount('http://', default)
+    # requests picks the longest matching prefix, so these win for their host
+    for host, size in HTTP_HOST_POOL_SIZES.items():
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        session.mount(f'https://{host}/', adapter)
+        session.mount(f'http://{host}/', adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+def close_session():
+    """Close the shared session's pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+atexit.register(close_session)
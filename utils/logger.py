@@ -1,61 +1,139 @@
 """
 Logging utilities for the Botsy framework.
+
+Loggers returned by ``setup_logger`` only enqueue records; a single
+process-wide ``QueueListener`` thread does the formatting and the console and
+file I/O, so logging never blocks a scraper on disk or terminal writes.
 """
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
 from colorama import Fore, Style, init
+from config.config import LOG_DIR, LOG_LEVEL, LOG_FILE_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT
 
 # Initialize colorama
 init()
 
+# Per-request messages (one per HTTP call) sit below DEBUG so they can be
+# switched on independently with LOG_LEVEL=REQUEST.
+REQUEST = 5
+logging.addLevelName(REQUEST, 'REQUEST')
+
+LOG_LINE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes present on every LogRecord; anything else was passed via ``extra``.
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {'message', 'asctime', 'taskName'}
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter with colors for different log levels."""
-    
+
     COLORS = {
+        'REQUEST': Fore.BLUE,
         'DEBUG': Fore.CYAN,
         'INFO': Fore.GREEN,
         'WARNING': Fore.YELLOW,
         'ERROR': Fore.RED,
         'CRITICAL': Fore.MAGENTA
     }
-    
+
     def format(self, record):
+        # Color a copy so the ANSI codes never reach other handlers' output
+        colored = logging.makeLogRecord(record.__dict__)
         color = self.COLORS.get(record.levelname, '')
-        record.levelname = f"{color}{record.levelname}{Style.RESET_ALL}"
-        return super().format(record)
+        colored.levelname = f"{color}{record.levelname}{Style.RESET_ALL}"
+        return super().format(colored)
+
+class JsonFormatter(logging.Formatter):
+    """Formatter emitting one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+_queue = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
+
+def _build_handlers():
+    """Create the console and rotating file handlers run by the listener."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    # File handler (rotates by size)
+    if LOG_FILE_FORMAT == 'json':
+        file_path = os.path.join(LOG_DIR, 'botsy.jsonl')
+        file_formatter = JsonFormatter()
+    else:
+        file_path = os.path.join(LOG_DIR, 'botsy.log')
+        file_formatter = logging.Formatter(LOG_LINE_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        file_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+    file_handler.setFormatter(file_formatter)
 
-def setup_logger(name, level=logging.INFO):
-    """Set up a logger with both file and console handlers."""
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(ColoredFormatter(LOG_LINE_FORMAT))
+
+    return file_handler, console_handler
+
+def _ensure_listener():
+    """Start the shared queue listener on first use."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(
+                _queue, *_build_handlers(), respect_handler_level=True
+            )
+            _listener.start()
+            atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+def _configured_level() -> int:
+    """LOG_LEVEL as a level number, case-insensitively; INFO if the name is unknown."""
+    level = logging.getLevelName(LOG_LEVEL.strip().upper())
+    return level if isinstance(level, int) else logging.INFO
+
+def setup_logger(name, level=None):
+    """Set up a logger that hands records to the shared background listener."""
+    if level is None:
+        level = _configured_level()
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
+
     # Prevent duplicate handlers
     if logger.handlers:
         return logger
-    
-    # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
-    # File handler
-    file_handler = logging.FileHandler(
-        f'logs/{name}_{datetime.now().strftime("%Y%m%d")}.log'
-    )
-    file_handler.setLevel(level)
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    file_handler.setFormatter(file_formatter)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_formatter = ColoredFormatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_handler.setFormatter(console_formatter)
-    
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
\ No newline at end of file
+
+    _ensure_listener()
+    logger.addHandler(_DeferredQueueHandler(_queue))
+    logger.propagate = False
+
+    return logger
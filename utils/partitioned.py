@@ -0,0 +1,219 @@
+"""
+Partitioned, compressed, rotating record output.
+
+Records are written as newline-delimited JSON under
+``data/<category>/<yyyy>/<mm>/<dd>/`` in compressed part files. Each batch
+is compressed as an independent block (a gzip member or a zstd frame)
+appended to the current part, so a reader can seek straight to any block.
+Parts rotate by size and age. Every partition keeps an append-only
+``manifest.jsonl`` with one line per block: part file, byte offset and
+length, record count and the block's scraped_at range. A new writer (e.g.
+the next batch run) reopens the partition's newest part and keeps
+appending to it until that part is due for rotation.
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from config.config import OUTPUT_CODEC, OUTPUT_DIR, OUTPUT_ROTATE_BYTES, OUTPUT_ROTATE_SECONDS
+from utils.pipeline import Sink
+from utils.records import AnyRecord, as_dict, dumps
+
+try:
+    import zstandard
+except ImportError:  # gzip only
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks (Windows): every writer starts its own part
+    fcntl = None
+
+MANIFEST = 'manifest.jsonl'
+_EXTENSIONS = {'gzip': '.ndjson.gz', 'zstd': '.ndjson.zst'}
+
+def resolve_codec(codec: str = OUTPUT_CODEC) -> str:
+    """'auto' means zstd when the zstandard package is installed, else gzip."""
+    if codec == 'auto':
+        return 'zstd' if zstandard is not None else 'gzip'
+    if codec == 'zstd' and zstandard is None:
+        raise ValueError("OUTPUT_CODEC 'zstd' needs the zstandard package")
+    if codec not in _EXTENSIONS:
+        raise ValueError(f"Unknown output codec: {codec}")
+    return codec
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def _lock_part(part) -> bool:
+    """Take the part's append lock without waiting; False if another writer holds it."""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.flock(part.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+def partition_dir(category: str, day: datetime, output_dir: str = OUTPUT_DIR) -> str:
+    """Directory holding one category's output for one day."""
+    return os.path.join(output_dir, category, f"{day:%Y}", f"{day:%m}", f"{day:%d}")
+
+def _read_manifest_at(directory: str) -> List[Dict[str, Any]]:
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as manifest:
+        return [json.loads(line) for line in manifest if line.strip()]
+
+class PartitionedWriter:
+    """Appends compressed record blocks to rotating part files in daily partitions."""
+
+    def __init__(self, category: str, output_dir: str = OUTPUT_DIR, codec: str = OUTPUT_CODEC,
+                 rotate_bytes: int = OUTPUT_ROTATE_BYTES, rotate_seconds: int = OUTPUT_ROTATE_SECONDS):
+        self.category = category
+        self.output_dir = output_dir
+        self.codec = resolve_codec(codec)
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self._file = None
+        self._partition = None
+        self._part_name = None
+        self._opened_at = None
+        self._sequence = 0
+
+    def _rotate_if_needed(self, now: datetime):
+        partition = partition_dir(self.category, now, self.output_dir)
+        if self._file is not None and (
+                partition != self._partition
+                or self._file.tell() >= self.rotate_bytes
+                or (now - self._opened_at).total_seconds() >= self.rotate_seconds):
+            self._close_part()
+        if self._file is None and not self._reopen_newest(partition, now):
+            os.makedirs(partition, exist_ok=True)
+            # pid keeps parts from concurrent workers apart; the sequence skips names taken earlier
+            self._part_name = None
+            while self._part_name is None or os.path.exists(os.path.join(partition, self._part_name)):
+                self._sequence += 1
+                self._part_name = f"part-{now:%H%M%S}-{os.getpid()}-{self._sequence:04d}{_EXTENSIONS[self.codec]}"
+            self._file = open(os.path.join(partition, self._part_name), 'ab')
+            _lock_part(self._file)
+            self._partition = partition
+            self._opened_at = now
+
+    def _reopen_newest(self, partition: str, now: datetime) -> bool:
+        """Resume appending to the partition's newest part if it isn't due for rotation."""
+        blocks = _read_manifest_at(partition)
+        if fcntl is None or not blocks or blocks[-1]['codec'] != self.codec:
+            return False
+        name = blocks[-1]['part']
+        path = os.path.join(partition, name)
+        # The part's age counts from its first block, not from when this writer reopened it
+        opened_at = min(datetime.fromisoformat(block['written_at']) for block in blocks if block['part'] == name)
+        if ((now - opened_at).total_seconds() >= self.rotate_seconds
+                or not os.path.exists(path) or os.path.getsize(path) >= self.rotate_bytes):
+            return False
+        part = open(path, 'ab')
+        if not _lock_part(part):  # still being appended to by a live writer
+            part.close()
+            return False
+        self._file = part
+        self._part_name = name
+        self._partition = partition
+        self._opened_at = opened_at
+        return True
+
+    def write(self, records: Iterable[AnyRecord]) -> int:
+        """Write the records as one compressed block; returns the count written."""
+        lines = []
+        first = last = None
+        for record in records:
+            lines.append(dumps(record))
+            scraped_at = as_dict(record).get('scraped_at')
+            if scraped_at:
+                first = scraped_at if first is None else min(first, scraped_at)
+                last = scraped_at if last is None else max(last, scraped_at)
+        if not lines:
+            return 0
+
+        now = datetime.now()
+        self._rotate_if_needed(now)
+        block = _compress(self.codec, ('\n'.join(lines) + '\n').encode('utf-8'))
+        offset = self._file.tell()
+        self._file.write(block)
+        self._file.flush()
+
+        entry = {
+            'part': self._part_name,
+            'codec': self.codec,
+            'offset': offset,
+            'length': len(block),
+            'records': len(lines),
+            'first_scraped_at': first,
+            'last_scraped_at': last,
+            'written_at': now.isoformat()
+        }
+        # One short line per append keeps concurrent writers' manifest entries intact
+        with open(os.path.join(self._partition, MANIFEST), 'a', encoding='utf-8') as manifest:
+            manifest.write(json.dumps(entry) + '\n')
+        return len(lines)
+
+    def _close_part(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Close the current part file."""
+        self._close_part()
+
+class PartitionedSink(Sink):
+    """Pipeline sink writing each batch as a block in the partitioned layout."""
+
+    def __init__(self, category: str, output_dir: str = OUTPUT_DIR):
+        self.writer = PartitionedWriter(category, output_dir)
+
+    def write(self, batch: List[AnyRecord]):
+        self.writer.write(batch)
+
+    def close(self):
+        self.writer.close()
+
+def read_manifest(category: str, day: datetime, output_dir: str = OUTPUT_DIR) -> List[Dict[str, Any]]:
+    """Block entries for one partition, in write order."""
+    return _read_manifest_at(partition_dir(category, day, output_dir))
+
+def summarize_partition(category: str, day: datetime, output_dir: str = OUTPUT_DIR) -> Dict[str, Any]:
+    """Record count, scraped_at range, blocks, parts and bytes for one partition."""
+    blocks = read_manifest(category, day, output_dir)
+    firsts = [block['first_scraped_at'] for block in blocks if block['first_scraped_at']]
+    lasts = [block['last_scraped_at'] for block in blocks if block['last_scraped_at']]
+    return {
+        'records': sum(block['records'] for block in blocks),
+        'first_scraped_at': min(firsts) if firsts else None,
+        'last_scraped_at': max(lasts) if lasts else None,
+        'blocks': len(blocks),
+        'parts': len({block['part'] for block in blocks}),
+        'bytes': sum(block['length'] for block in blocks)
+    }
+
+def iter_partition(category: str, day: datetime, output_dir: str = OUTPUT_DIR,
+                   since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one day's records, skipping blocks that ended before ``since`` (ISO timestamp)."""
+    directory = partition_dir(category, day, output_dir)
+    for block in read_manifest(category, day, output_dir):
+        if since and block['last_scraped_at'] and block['last_scraped_at'] < since:
+            continue
+        with open(os.path.join(directory, block['part']), 'rb') as part:
+            part.seek(block['offset'])
+            data = _decompress(block['codec'], part.read(block['length']))
+        for line in data.decode('utf-8').splitlines():
+            yield json.loads(line)
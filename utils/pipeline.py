@@ -0,0 +1,105 @@
+"""
+Streaming pipeline that moves scraped records through stages into sinks.
+"""
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+from config.config import OUTPUT_DIR, PIPELINE_BUFFER_SIZE
+from utils.records import AnyRecord, as_dict
+
+class Stage(ABC):
+    """Enrichment step applied to each buffered batch of records."""
+
+    @abstractmethod
+    def process(self, batch: List[AnyRecord]) -> List[AnyRecord]:
+        """Return the (possibly modified or filtered) batch."""
+
+    def close(self):
+        """Release any resources held by the stage."""
+        pass
+
+class Sink(ABC):
+    """Destination that receives batches of records."""
+
+    @abstractmethod
+    def write(self, batch: List[AnyRecord]):
+        """Persist a batch of records."""
+
+    def close(self):
+        """Flush and release the sink."""
+        pass
+
+class JsonFileSink(Sink):
+    """Streams records into a JSON array file in the same layout as save_data."""
+
+    def __init__(self, category: str, filename: str, output_dir: str = OUTPUT_DIR):
+        self.filepath = os.path.join(output_dir, f"{category}_{filename}.json")
+        self._file = None
+        self._count = 0
+
+    def write(self, batch: List[AnyRecord]):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+            self._file = open(self.filepath, 'w', encoding='utf-8')
+            self._file.write('[')
+        for record in batch:
+            text = json.dumps(as_dict(record), indent=2, ensure_ascii=False)
+            self._file.write(',\n  ' if self._count else '\n  ')
+            self._file.write(text.replace('\n', '\n  '))
+            self._count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.write('\n]')
+            self._file.close()
+            self._file = None
+
+class Pipeline:
+    """Pulls records from an iterator in bounded batches through stages into sinks."""
+
+    def __init__(self, sinks: List[Sink], stages: Optional[List[Stage]] = None,
+                 buffer_size: int = PIPELINE_BUFFER_SIZE):
+        self.sinks = sinks
+        self.stages = stages or []
+        self.buffer_size = buffer_size
+
+    def run(self, records: Iterable[AnyRecord]) -> int:
+        """Consume records, close the pipeline and return how many reached the sinks."""
+        try:
+            return self.write(records)
+        finally:
+            self.close()
+
+    def write(self, records: Iterable[AnyRecord]) -> int:
+        """Push records through to the sinks, leaving the pipeline open for more."""
+        written = 0
+        buffer = []
+        for record in records:
+            buffer.append(record)
+            if len(buffer) >= self.buffer_size:
+                written += self._flush(buffer)
+                buffer = []
+        if buffer:
+            written += self._flush(buffer)
+        return written
+
+    def _flush(self, batch: List[AnyRecord]) -> int:
+        for stage in self.stages:
+            batch = stage.process(batch)
+            if not batch:
+                return 0
+        for sink in self.sinks:
+            sink.write(batch)
+        return len(batch)
+
+    def close(self):
+        """Close every stage and sink, re-raising the first failure afterwards."""
+        error = None
+        for component in [*self.stages, *self.sinks]:
+            try:
+                component.close()
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
@@ -0,0 +1,120 @@
+"""
+Per-category CPU and memory profiling for orchestrator runs (--profile).
+
+``cpu`` runs each category under cProfile and writes a ``.prof`` file
+(open it with ``python -m pstats`` or snakeviz). cProfile only sees the
+calling thread, so work on feed and extraction worker threads shows up as
+time spent waiting on futures. ``memory`` traces allocations with
+tracemalloc and writes the peak plus the top allocation sites per
+category. Either way a summary table is printed at the end of the run.
+"""
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List
+from config.config import PROFILE_DIR, PROFILE_MEMORY_FRAMES, PROFILE_TOP_N
+
+MODES = ('cpu', 'memory')
+
+def _function_label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == '~':  # built-in
+        return name
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+class CategoryProfiler:
+    """Profiles each category run separately and collects one summary row per run."""
+
+    def __init__(self, mode: str, output_dir: str = PROFILE_DIR):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.results: List[Dict[str, Any]] = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _path(self, category: str, suffix: str) -> str:
+        return os.path.join(self.output_dir, f"{category}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}")
+
+    @contextmanager
+    def profile(self, category: str) -> Iterator[None]:
+        """Profile the enclosed block as one run of ``category``."""
+        started = time.perf_counter()
+        if self.mode == 'cpu':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self._record_cpu(category, profiler, time.perf_counter() - started)
+        else:
+            already_tracing = tracemalloc.is_tracing()
+            if not already_tracing:
+                tracemalloc.start(PROFILE_MEMORY_FRAMES)
+            tracemalloc.reset_peak()
+            try:
+                yield
+            finally:
+                self._record_memory(category, time.perf_counter() - started)
+                if not already_tracing:
+                    tracemalloc.stop()
+
+    def _record_cpu(self, category: str, profiler: cProfile.Profile, seconds: float):
+        path = self._path(category, '.prof')
+        profiler.dump_stats(path)
+        stats = pstats.Stats(profiler)
+        # stats.stats maps function -> (primitive calls, total calls, own time, cumulative time, callers)
+        top = max(stats.stats.items(), key=lambda item: item[1][2], default=None)
+        self.results.append({
+            'category': category,
+            'seconds': seconds,
+            'cpu_seconds': stats.total_tt,
+            'calls': stats.total_calls,
+            'top': f"{_function_label(top[0])} {top[1][2]:.2f}s" if top else '',
+            'file': path
+        })
+
+    def _record_memory(self, category: str, seconds: float):
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>')
+        ])
+        top_sites = snapshot.statistics('lineno')[:PROFILE_TOP_N]
+        path = self._path(category, '_memory.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"category: {category}\npeak: {peak / 1e6:.1f} MB\ncurrent: {current / 1e6:.1f} MB\n\n")
+            for stat in top_sites:
+                f.write(f"{stat}\n")
+        top = top_sites[0] if top_sites else None
+        self.results.append({
+            'category': category,
+            'seconds': seconds,
+            'peak_mb': peak / 1e6,
+            'current_mb': current / 1e6,
+            'top': f"{top.traceback[0].filename.split(os.sep)[-1]}:{top.traceback[0].lineno} "
+                   f"{top.size / 1e6:.1f} MB" if top else '',
+            'file': path
+        })
+
+    def print_summary(self):
+        """Print one row per profiled category run."""
+        if not self.results:
+            return
+        print(f"\n⏱️  PROFILE SUMMARY ({self.mode})\n" + "="*50)
+        if self.mode == 'cpu':
+            print(f"{'category':<12} {'wall s':>8} {'cpu s':>8} {'calls':>10}  top function (own time)")
+            for row in self.results:
+                print(f"{row['category']:<12} {row['seconds']:>8.2f} {row['cpu_seconds']:>8.2f} "
+                      f"{row['calls']:>10}  {row['top']}")
+        else:
+            print(f"{'category':<12} {'wall s':>8} {'peak MB':>8} {'kept MB':>8}  top allocation site")
+            for row in self.results:
+                print(f"{row['category']:<12} {row['seconds']:>8.2f} {row['peak_mb']:>8.1f} "
+                      f"{row['current_mb']:>8.1f}  {row['top']}")
+        print(f"\nProfiles written to {self.output_dir}/")
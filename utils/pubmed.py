@@ -0,0 +1,148 @@
+"""
+PubMed E-utilities client with a PMID cache shared across categories.
+
+``esearch`` turns a query into PMIDs. Articles are then fetched with
+``efetch`` in batches of ``PUBMED_BATCH`` IDs and parsed from the PubMed
+XML. Parsed articles are cached by PMID in SQLite, and research and health
+use the same cache file, so an article is fetched and parsed once however
+many queries, topics or categories turn it up.
+"""
+import json
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import requests
+from config.config import NCBI_API_KEY, PUBMED_BATCH, PUBMED_CACHE_PATH
+from utils.logger import setup_logger
+from utils.records import Paper
+from utils.sqlite_store import open_db
+
+EUTILS = 'https://eutils.ncbi.nlm.nih.gov/entrez/eutils'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    pmid TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+_MONTHS = {name: f"{number:02d}" for number, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+def _text(element: Optional[ET.Element]) -> str:
+    # itertext() keeps the text inside inline markup such as <i> and <sup>
+    return ''.join(element.itertext()).strip() if element is not None else ''
+
+def _published(article: ET.Element) -> str:
+    date = article.find('.//Journal/JournalIssue/PubDate')
+    if date is None:
+        return ''
+    year = date.findtext('Year')
+    if not year:
+        return date.findtext('MedlineDate', '')
+    month = date.findtext('Month', '')
+    month = _MONTHS.get(month[:3], month.zfill(2) if month.isdigit() else '')
+    day = date.findtext('Day', '')
+    return '-'.join(part for part in (year, month, day.zfill(2) if month and day else '') if part)
+
+def parse_articles(xml: bytes) -> Dict[str, Dict[str, Any]]:
+    """Parse an efetch PubmedArticleSet into dicts keyed by PMID."""
+    articles = {}
+    for entry in ET.fromstring(xml).iterfind('PubmedArticle'):
+        citation = entry.find('MedlineCitation')
+        article = citation.find('Article')
+        pmid = citation.findtext('PMID', '')
+        authors = []
+        for author in article.iterfind('AuthorList/Author'):
+            name = ' '.join(part for part in (author.findtext('ForeName'), author.findtext('LastName')) if part)
+            authors.append(name or author.findtext('CollectiveName', ''))
+        sections = []
+        for section in article.iterfind('Abstract/AbstractText'):
+            label = section.get('Label')
+            sections.append(f"{label}: {_text(section)}" if label else _text(section))
+        doi = ''
+        for article_id in entry.iterfind('PubmedData/ArticleIdList/ArticleId'):
+            if article_id.get('IdType') == 'doi':
+                doi = (article_id.text or '').strip()
+        articles[pmid] = {
+            'pmid': pmid,
+            'title': _text(article.find('ArticleTitle')),
+            'abstract': '\n'.join(sections),
+            'authors': [name for name in authors if name],
+            'journal': article.findtext('Journal/Title', ''),
+            'published': _published(article),
+            'doi': doi
+        }
+    return articles
+
+def to_paper(article: Dict[str, Any], scraped_at: str, subject: str = '',
+             tags: Optional[List[str]] = None) -> Paper:
+    """Paper record for a parsed PubMed article."""
+    return Paper(
+        title=article['title'],
+        authors=article['authors'],
+        abstract=article['abstract'],
+        published=article['published'],
+        url=f"https://pubmed.ncbi.nlm.nih.gov/{article['pmid']}/",
+        doi=article['doi'],
+        publisher=article['journal'],
+        subject=subject,
+        tags=tags or [],
+        source='PubMed',
+        scraped_at=scraped_at
+    )
+
+class PubMedClient:
+    """esearch plus batched, cached efetch."""
+
+    def __init__(self, request: Callable[..., requests.Response], cache_path: str = PUBMED_CACHE_PATH,
+                 api_key: str = NCBI_API_KEY):
+        self.logger = setup_logger('pubmed')
+        self.request = request
+        self.api_key = api_key
+        self.cache = open_db(cache_path, _SCHEMA)
+        self._lock = threading.Lock()
+
+    def _params(self, **params) -> Dict[str, Any]:
+        if self.api_key:
+            params['api_key'] = self.api_key  # 10 requests/second instead of 3
+        return {'db': 'pubmed', **params}
+
+    def search(self, term: str, max_results: int) -> List[str]:
+        """PMIDs for a query, newest first."""
+        response = self.request(f"{EUTILS}/esearch.fcgi",
+                                self._params(term=term, retmax=max_results, retmode='json', sort='pub_date'))
+        return response.json().get('esearchresult', {}).get('idlist', [])
+
+    def fetch(self, pmids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Parsed articles for the PMIDs: cached ones from SQLite, the rest via batched efetch."""
+        pmids = list(dict.fromkeys(pmids))
+        articles = {}
+        with self._lock:
+            for start in range(0, len(pmids), 500):  # stay under SQLite's bound-parameter limit
+                chunk = pmids[start:start + 500]
+                rows = self.cache.execute(
+                    f"SELECT pmid, data FROM articles WHERE pmid IN ({','.join('?' * len(chunk))})", chunk
+                )
+                articles.update((pmid, json.loads(data)) for pmid, data in rows)
+
+        missing = [pmid for pmid in pmids if pmid not in articles]
+        for start in range(0, len(missing), PUBMED_BATCH):
+            batch = missing[start:start + PUBMED_BATCH]
+            response = self.request(f"{EUTILS}/efetch.fcgi", self._params(id=','.join(batch), retmode='xml'))
+            fetched = parse_articles(response.content)
+            with self._lock, self.cache:
+                self.cache.executemany(
+                    'INSERT OR REPLACE INTO articles (pmid, data, fetched_at) VALUES (?, ?, ?)',
+                    [(pmid, json.dumps(article, ensure_ascii=False), time.time()) for pmid, article in fetched.items()]
+                )
+            articles.update(fetched)
+
+        self.logger.info("PubMed: %s articles, %s from cache", len(articles), len(pmids) - len(missing))
+        return articles
+
+    def close(self):
+        """Close the cache."""
+        self.cache.close()
@@ -0,0 +1,260 @@
+"""
+Typed record classes emitted by the scrapers.
+
+Records are slotted dataclasses, so an item costs one small object instead of
+a dict with a private copy of every key. Scrapers stamp a whole fetch with a
+single ``batch_timestamp()`` instead of calling ``datetime.now()`` per item.
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Union
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+def batch_timestamp() -> str:
+    """Timestamp shared by every record parsed from one fetch."""
+    return datetime.now().isoformat()
+
+@dataclass(slots=True)
+class Record:
+    """Base class for typed records."""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dict (the JSON serialization)."""
+        return {name: getattr(self, name) for name in self._field_names()}
+
+    @classmethod
+    def _field_names(cls):
+        names = cls.__dict__.get('_names')
+        if names is None:
+            names = tuple(f.name for f in fields(cls))
+            setattr(cls, '_names', names)
+        return names
+
+    @property
+    def key(self) -> str:
+        """Natural key identifying the record across sweeps."""
+        return natural_key(self.to_dict())
+
+@dataclass(slots=True)
+class Article(Record):
+    """News, blog or feed article."""
+    title: str
+    link: str
+    source: str
+    scraped_at: str
+    description: str = ''
+    published: str = ''
+    content: str = ''  # full text, filled in by the extraction stage
+    tags: List[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"url:{self.link}"
+
+@dataclass(slots=True)
+class Paper(Record):
+    """Research paper or preprint."""
+    title: str
+    source: str
+    scraped_at: str
+    authors: List[str] = field(default_factory=list)
+    abstract: str = ''
+    published: str = ''
+    updated: Optional[str] = None
+    url: str = ''
+    pdf_url: str = ''
+    doi: str = ''
+    subject: str = ''
+    categories: List[str] = field(default_factory=list)  # the source's own classification (e.g. arXiv's)
+    tags: List[str] = field(default_factory=list)  # configured topics it matched
+    citation_count: int = 0
+    publisher: str = ''
+
+    @property
+    def key(self) -> str:
+        return f"doi:{self.doi.lower()}" if self.doi else f"url:{self.url}"
+
+@dataclass(slots=True)
+class Quote(Record):
+    """Market quote or company snapshot for one symbol."""
+    symbol: str
+    source: str
+    scraped_at: str
+    price: Optional[float] = None
+    company_name: str = ''
+    market_cap: int = 0
+    pe_ratio: float = 0
+    dividend_yield: float = 0
+    sector: str = ''
+    industry: str = ''
+    change: str = ''
+    change_percent: str = ''
+    volume: int = 0
+    latest_trading_day: str = ''
+    historical_data: Optional[Dict[str, list]] = None
+
+    @property
+    def key(self) -> str:
+        return f"symbol:{self.symbol}:{self.latest_trading_day or self.scraped_at[:10]}"
+
+@dataclass(slots=True)
+class Post(Record):
+    """Community post: Reddit submission, Hacker News story or Stack Overflow question."""
+    id: Any
+    title: str
+    source: str
+    scraped_at: str
+    url: str = ''
+    author: str = ''
+    score: int = 0
+    num_comments: int = 0
+    created: float = 0
+    community: str = ''
+    tags: List[str] = field(default_factory=list)
+    view_count: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.id}"
+
+@dataclass(slots=True)
+class Repo(Record):
+    """Source code repository."""
+    full_name: str
+    name: str
+    scraped_at: str
+    description: str = ''
+    language: str = ''
+    stars: int = 0
+    forks: int = 0
+    url: str = ''
+    created_at: str = ''
+    updated_at: str = ''
+    pushed_at: str = ''
+    topics: List[str] = field(default_factory=list)
+    license: str = ''
+    open_issues: int = 0
+    watchers: int = 0
+    open_pull_requests: int = 0
+    latest_release: str = ''
+
+    @property
+    def key(self) -> str:
+        return f"github:{self.full_name}"
+
+@dataclass(slots=True)
+class WeatherObs(Record):
+    """Current weather observation for a city."""
+    city: str
+    scraped_at: str
+    temperature: float = 0
+    feels_like: float = 0
+    humidity: int = 0
+    pressure: int = 0
+    weather: str = ''
+    description: str = ''
+    wind_speed: float = 0
+    visibility: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"city:{self.city}:{self.scraped_at[:13]}"
+
+@dataclass(slots=True)
+class Dataset(Record):
+    """Open-data catalog dataset."""
+    name: str
+    title: str
+    url: str
+    source: str
+    scraped_at: str
+    notes: str = ''
+    organization: str = ''
+    modified: str = ''
+
+    @property
+    def key(self) -> str:
+        return f"url:{self.url}"
+
+@dataclass(slots=True)
+class Product(Record):
+    """E-commerce product listing."""
+    id: Any
+    title: str
+    source: str
+    scraped_at: str
+    price: float = 0
+    description: str = ''
+    category: str = ''
+    rating: float = 0
+    rating_count: int = 0
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.id}"
+
+AnyRecord = Union[Record, Dict[str, Any]]
+
+def as_dict(record: AnyRecord) -> Dict[str, Any]:
+    """Return a plain dict for a typed record or an untyped dict."""
+    return record.to_dict() if isinstance(record, Record) else record
+
+def natural_key(record: AnyRecord) -> str:
+    """Return a record's identity, independent of when it was scraped.
+
+    Typed records answer from their own ``key``; plain dicts (placeholder
+    sources) fall back to the same field conventions.
+    """
+    if isinstance(record, Record):
+        return record.key
+    if record.get('doi'):
+        return f"doi:{record['doi'].lower()}"
+    if record.get('symbol'):
+        day = record.get('latest_trading_day') or record.get('scraped_at', '')[:10]
+        return f"symbol:{record['symbol']}:{day}"
+    if record.get('full_name'):
+        return f"github:{record['full_name']}"
+    if record.get('city'):
+        return f"city:{record['city']}:{record.get('scraped_at', '')[:13]}"
+    if record.get('id') is not None and record.get('source'):
+        return f"{record['source']}:{record['id']}"
+    url = record.get('url') or record.get('link')
+    if url:
+        return f"url:{url}"
+    identity = json.dumps([record.get('source'), record.get('title'), record.get('name')], ensure_ascii=False)
+    return f"hash:{hashlib.blake2b(identity.encode('utf-8'), digest_size=16).hexdigest()}"
+
+def dumps(record: AnyRecord) -> str:
+    """Serialize one record to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(as_dict(record), default=str).decode('utf-8')
+    return json.dumps(as_dict(record), ensure_ascii=False, separators=(',', ':'), default=str)
+
+def write_ndjson(records: Iterable[AnyRecord], fp: TextIO) -> int:
+    """Write records as newline-delimited JSON; returns the count written."""
+    count = 0
+    for record in records:
+        fp.write(dumps(record))
+        fp.write('\n')
+        count += 1
+    return count
+
+def to_columns(records: Iterable[AnyRecord]) -> Dict[str, List[Any]]:
+    """Pivot records into columns (field name -> list of values)."""
+    columns: Dict[str, List[Any]] = {}
+    count = 0
+    for record in records:
+        row = as_dict(record)
+        for name in row:
+            if name not in columns:
+                columns[name] = [None] * count
+        for name, values in columns.items():
+            values.append(row.get(name))
+        count += 1
+    return columns
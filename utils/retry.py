@@ -0,0 +1,87 @@
+"""
+Retry policies for outgoing HTTP requests.
+
+Only failures that can succeed on a second try are retried: connection
+errors and timeouts, 5xx responses and 429. Waits use exponential backoff
+with full jitter, or the server's ``Retry-After`` when it sends one, and
+every call is bounded by a total deadline. Policies are configured per
+host in ``config.RETRY_POLICIES``.
+"""
+import random
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from config.config import RETRY_POLICIES
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often, how long and on what a request is retried."""
+    max_attempts: int = 3
+    backoff_base: float = 1.0  # seconds; the cap doubles each attempt
+    backoff_max: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    deadline: float = 90.0  # total seconds for all attempts and waits
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    hedge: bool = False  # latency-sensitive: send a hedged second GET after the host's p95
+
+    def timeout(self, remaining: Optional[float] = None) -> Tuple[float, float]:
+        """(connect, read) timeouts, with the read timeout cut to the time left."""
+        read = self.read_timeout if remaining is None else max(0.1, min(self.read_timeout, remaining))
+        return (min(self.connect_timeout, read), read)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the wait after ``attempt`` (1-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def is_retryable(self, error: requests.RequestException) -> bool:
+        """True for failures a retry can fix; 4xx other than 429 never are."""
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        response = getattr(error, 'response', None)
+        return response is not None and response.status_code in self.retry_statuses
+
+    def retry_delay(self, error: requests.RequestException, attempt: int,
+                    remaining: float) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        response = getattr(error, 'response', None)
+        delay = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+        if delay is None:
+            delay = self.backoff(attempt)
+        # Waiting past the deadline (e.g. a long Retry-After) can't produce a result in time
+        return delay if delay < remaining else None
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def _build_policies(settings: Dict[str, Dict]) -> Dict[str, RetryPolicy]:
+    default = RetryPolicy(**settings.get('default', {}))
+    policies = {'default': default}
+    for host, overrides in settings.items():
+        if host != 'default':
+            policies[host] = replace(default, **overrides)
+    return policies
+
+_policies = _build_policies(RETRY_POLICIES)
+
+def policy_for(url: str) -> RetryPolicy:
+    """Retry policy for the URL's host, falling back to the default policy."""
+    host = (urlsplit(url).hostname or '').lower()
+    return _policies.get(host, _policies['default'])
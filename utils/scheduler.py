@@ -0,0 +1,168 @@
+"""
+Adaptive polling scheduler (--schedule).
+
+Each work unit is a source with its own poll interval. After every poll the
+records' natural keys are checked against the keys already seen for that
+source: if nothing is new the interval grows by ``SCHEDULE_BACKOFF`` (up to
+the source's maximum); if something is new it shrinks by
+``SCHEDULE_SPEEDUP``, and a burst (at least ``SCHEDULE_BURST_RATIO`` of the
+records new) drops it straight to the minimum. Feed units start from their
+registry ``poll_interval``. Each tick polls at most ``SCHEDULE_BUDGET`` due
+units, most overdue first, so a fixed request budget goes to the sources
+that are actually changing.
+"""
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config.config import (SCHEDULE_BACKOFF, SCHEDULE_BOUNDS, SCHEDULE_BURST_RATIO, SCHEDULE_DB_PATH,
+                           SCHEDULE_DEFAULT_INTERVAL, SCHEDULE_SEEN_RETENTION, SCHEDULE_SPEEDUP)
+from utils.feed_registry import get_feed_registry
+from utils.records import AnyRecord, natural_key
+from utils.sqlite_store import open_db
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    label TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    interval REAL NOT NULL,
+    next_due REAL NOT NULL,
+    last_polled REAL,
+    polls INTEGER NOT NULL DEFAULT 0,
+    new_items INTEGER NOT NULL DEFAULT 0,
+    last_new REAL
+);
+CREATE TABLE IF NOT EXISTS seen (
+    label TEXT NOT NULL,
+    key_hash INTEGER NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (label, key_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_seen_seen_at ON seen (seen_at);
+"""
+
+def _key_hash(record: AnyRecord) -> int:
+    digest = hashlib.blake2b(natural_key(record).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+class PollScheduler:
+    """Per-source poll intervals adapted to how often each source yields new records."""
+
+    def __init__(self, path: str = SCHEDULE_DB_PATH):
+        self.conn = open_db(path, _SCHEMA)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bounds(category: str) -> Tuple[float, float]:
+        """(min, max) poll interval in seconds for a category's sources."""
+        return SCHEDULE_BOUNDS.get(category, SCHEDULE_BOUNDS['default'])
+
+    def initial_interval(self, unit) -> float:
+        """Starting interval: the registry poll_interval for feed units, else the default."""
+        interval = SCHEDULE_DEFAULT_INTERVAL
+        if len(unit.args) == 1:
+            spec = get_feed_registry().feeds.get(unit.args[0])
+            if spec is not None and unit.category in spec.categories:
+                interval = spec.poll_interval
+        low, high = self.bounds(unit.category)
+        return min(high, max(low, interval))
+
+    def _source(self, label: str) -> Optional[Tuple[float, float]]:
+        return self.conn.execute('SELECT interval, next_due FROM sources WHERE label = ?', (label,)).fetchone()
+
+    def due(self, units: Iterable, limit: Optional[int] = None, now: Optional[float] = None) -> List:
+        """Units due for a poll, most overdue (relative to their interval) first."""
+        now = time.time() if now is None else now
+        ranked = []
+        with self._lock:
+            for unit in units:
+                row = self._source(unit.label)
+                if row is None:
+                    ranked.append((float('inf'), unit))  # never polled
+                elif row[1] <= now:
+                    ranked.append(((now - row[1]) / row[0], unit))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+        return [unit for _, unit in ranked[:limit]]
+
+    def next_due(self, units: Iterable) -> Optional[float]:
+        """Earliest next_due among the units (None if any has never been polled)."""
+        times = []
+        with self._lock:
+            for unit in units:
+                row = self._source(unit.label)
+                if row is None:
+                    return None
+                times.append(row[1])
+        return min(times) if times else None
+
+    def record_poll(self, unit, records: List[AnyRecord], now: Optional[float] = None) -> float:
+        """Update the unit's interval from how many of its records are new; returns the new interval."""
+        now = time.time() if now is None else now
+        low, high = self.bounds(unit.category)
+        hashes = {_key_hash(record) for record in records}
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO seen (label, key_hash, seen_at) VALUES (?, ?, ?)',
+                [(unit.label, key_hash, now) for key_hash in hashes]
+            )
+            new = self.conn.total_changes - before
+            # Keys still being returned stay fresh so they aren't pruned and re-counted as new
+            self.conn.executemany(
+                'UPDATE seen SET seen_at = ? WHERE label = ? AND key_hash = ?',
+                [(now, unit.label, key_hash) for key_hash in hashes]
+            )
+
+            row = self._source(unit.label)
+            interval = row[0] if row else self.initial_interval(unit)
+            if row is None:
+                pass  # first poll only establishes the baseline of seen keys
+            elif not new:
+                interval *= SCHEDULE_BACKOFF
+            elif new >= SCHEDULE_BURST_RATIO * len(hashes):
+                interval = low
+            else:
+                interval *= SCHEDULE_SPEEDUP
+            interval = min(high, max(low, interval))
+
+            self.conn.execute(
+                'INSERT INTO sources (label, category, interval, next_due, last_polled, polls, new_items, last_new) '
+                'VALUES (?, ?, ?, ?, ?, 1, 0, NULL) '
+                'ON CONFLICT (label) DO UPDATE SET interval = excluded.interval, next_due = excluded.next_due, '
+                'last_polled = excluded.last_polled, polls = polls + 1, new_items = new_items + ?, '
+                'last_new = CASE WHEN ? > 0 THEN excluded.last_polled ELSE last_new END',
+                (unit.label, unit.category, interval, now + interval, now, new if row else 0, new if row else 0)
+            )
+        return interval
+
+    def record_failure(self, unit, now: Optional[float] = None):
+        """Keep the interval but push the next poll out by it, so a failing source isn't hammered."""
+        now = time.time() if now is None else now
+        with self._lock, self.conn:
+            row = self._source(unit.label)
+            interval = row[0] if row else self.initial_interval(unit)
+            self.conn.execute(
+                'INSERT INTO sources (label, category, interval, next_due, last_polled) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (label) DO UPDATE SET next_due = excluded.next_due, last_polled = excluded.last_polled',
+                (unit.label, unit.category, interval, now + interval, now)
+            )
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Forget seen keys older than SCHEDULE_SEEN_RETENTION; returns the count removed."""
+        now = time.time() if now is None else now
+        with self._lock, self.conn:
+            return self.conn.execute('DELETE FROM seen WHERE seen_at < ?', (now - SCHEDULE_SEEN_RETENTION,)).rowcount
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-source interval, poll count, new items and timing."""
+        with self._lock:
+            cursor = self.conn.execute(
+                'SELECT label, category, interval, next_due, last_polled, polls, new_items, last_new '
+                'FROM sources ORDER BY category, label'
+            )
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def close(self):
+        """Close the schedule database."""
+        self.conn.close()
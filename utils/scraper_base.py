@@ -3,53 +3,279 @@ Base scraper class with common functionality.
 """
 import time
 import requests
+import threading
+from contextvars import ContextVar
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
-from utils.logger import setup_logger
-from config.config import DEFAULT_DELAY, MAX_RETRIES, TIMEOUT
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+from utils.http import get_session
+from utils.logger import setup_logger, REQUEST
+from utils.records import AnyRecord, as_dict
+from utils.feeds import FeedFetcher
+from utils.feed_registry import FeedSpec, FeedSweep, get_feed_registry
+from utils.deadline import DeadlineExceeded, check_deadline, expired, time_left
+from utils.health import CircuitOpenError, get_health_registry
+from utils.hedge import hedged_get
+from utils.retry import RetryPolicy, policy_for
+from utils.partitioned import PartitionedWriter, partition_dir
+from config.config import DEFAULT_DELAY, OUTPUT_LAYOUT, UNIT_RETRIES
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """One independently schedulable piece of a scrape: a scraper method and its arguments."""
+    category: str
+    method: str  # name of a scrape_* method on the category's scraper
+    args: Tuple = ()
+    
+    @property
+    def label(self) -> str:
+        return f"{self.category}.{self.method}({', '.join(map(str, self.args))})"
+    
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-serializable form, e.g. for a work queue."""
+        return {'category': self.category, 'method': self.method, 'args': list(self.args)}
+    
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'WorkUnit':
+        return cls(payload['category'], payload['method'], tuple(payload.get('args', ())))
+
+# Work unit outcomes recorded in BaseScraper.unit_status
+UNIT_OK = 'ok'
+UNIT_FAILED = 'failed'
+UNIT_TIMED_OUT = 'timed_out'
+
+class WorkUnitError(Exception):
+    """Raised by BaseScraper.execute() when a unit's sources failed."""
+    
+    def __init__(self, unit: WorkUnit, errors: List[str], open_circuits: Optional[List[CircuitOpenError]] = None):
+        super().__init__(f"{unit.label} failed: {'; '.join(errors)}")
+        self.unit = unit
+        self.errors = errors
+        # Requests the unit couldn't send because the host's circuit was open
+        self.open_circuits = open_circuits or []
+
+# Circuit-open rejections of the work unit running in this context; a context
+# variable rather than a thread-local so requests made on pools
+# (submit_in_context) are seen too
+_open_circuits: ContextVar[Optional[List[CircuitOpenError]]] = ContextVar('open_circuits', default=None)
 
 class BaseScraper(ABC):
     """Abstract base class for all scrapers."""
     
+    # Filename prefix used by scrape() when saving; None means scrape() doesn't save
+    output_name: Optional[str] = None
+    
     def __init__(self, category: str):
         self.category = category
         self.logger = setup_logger(f"{category}_scraper")
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Botsy Information Scraper 1.0'
-        })
-    
-    def make_request(self, url: str, params: Dict = None, retries: int = MAX_RETRIES) -> requests.Response:
-        """Make HTTP request with retry logic."""
-        for attempt in range(retries):
+        # Shared across scrapers so connections to a host are reused between categories
+        self.session = get_session()
+        self.feeds = FeedFetcher(self.make_request, self.logger)
+        # Set by the orchestrator so categories share one fetch per feed URL
+        self.feed_sweep: Optional[FeedSweep] = None
+        # Errors logged by the work unit running on this thread (see execute())
+        self._unit_state = threading.local()
+        # Outcome of each work unit in the last iter_scrape()
+        self.unit_status: Dict[str, str] = {}
+    
+    def make_request(self, url: str, params: Dict = None, retries: int = None,
+                     headers: Dict = None, policy: RetryPolicy = None) -> requests.Response:
+        """Make HTTP request, retrying transient failures per the host's retry policy.
+        
+        ``retries`` overrides the policy's attempt count; ``policy`` replaces it entirely.
+        """
+        policy = policy or policy_for(url)
+        if retries is not None:
+            policy = replace(policy, max_attempts=retries)
+        host = urlsplit(url).hostname or ''
+        health = get_health_registry()
+        call_deadline = time.monotonic() + policy.deadline
+        
+        def remaining() -> float:
+            # The policy's per-call deadline, cut short by the run's --deadline if sooner
+            left = call_deadline - time.monotonic()
+            run_left = time_left()
+            return left if run_left is None else min(left, run_left)
+        
+        attempt = 0
+        while True:
+            attempt += 1
+            check_deadline(f"requesting {url}")
+            # Fails fast with CircuitOpenError while the host is known to be down
             try:
-                self.logger.info(f"Making request to: {url}")
-                response = self.session.get(url, params=params, timeout=TIMEOUT)
+                health.before_request(host)
+            except CircuitOpenError as e:
+                circuits = _open_circuits.get()
+                if circuits is not None:
+                    circuits.append(e)
+                raise
+            timeout = health.timeout(host, policy.timeout(remaining()))
+            started = time.monotonic()
+            try:
+                self.logger.log(REQUEST, "Making request to: %s", url, extra={'url': url, 'attempt': attempt})
+                if policy.hedge:
+                    response = hedged_get(self.session, url, health.latency(host, 95),
+                                          params=params, headers=headers, timeout=timeout)
+                else:
+                    response = self.session.get(url, params=params, headers=headers, timeout=timeout)
                 response.raise_for_status()
-                time.sleep(DEFAULT_DELAY)
+                health.record(host, True, time.monotonic() - started)
+                time.sleep(min(DEFAULT_DELAY, max(0.0, remaining())))
                 return response
             except requests.RequestException as e:
-                self.logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
-                if attempt == retries - 1:
+                # A permanent error (e.g. 404) still means the host answered; only transient ones count against it
+                health.record(host, not policy.is_retryable(e), time.monotonic() - started)
+                delay = policy.retry_delay(e, attempt, remaining())
+                self.logger.warning("Request failed (attempt %s): %s", attempt, e,
+                                    extra={'url': url, 'attempt': attempt})
+                if delay is None:
                     raise
-                time.sleep(DEFAULT_DELAY * (attempt + 1))
+                time.sleep(delay)
+    
+    def log_error(self, message: str, *args):
+        """Log a failed source; inside execute() this also marks the unit as failed."""
+        self.logger.error(message, *args)
+        errors = getattr(self._unit_state, 'errors', None)
+        if errors is not None:
+            errors.append(message % args)
+    
+    def iter_feed_entries(self, names: Optional[List[str]] = None) -> Iterator[Tuple[FeedSpec, List[Dict]]]:
+        """Yield (feed, entries) for each registry feed this category subscribes to.
+        
+        ``names`` restricts it to those feeds. Entries are already cut to the
+        category's per-feed limit.
+        """
+        feeds = get_feed_registry().feeds_for(self.category)
+        if names is not None:
+            feeds = [spec for spec in feeds if spec.name in names]
+        sweep = self.feed_sweep or FeedSweep()
+        for spec, entries in sweep.fetch(feeds, self.feeds, self._feed_failed):
+            yield spec, entries[:spec.limit_for(self.category)]
+    
+    def _feed_failed(self, spec: FeedSpec, error: Exception):
+        self.log_error("Error fetching feed %s: %s", spec.name, error)
+    
+    def feed_units(self, method: str) -> List[WorkUnit]:
+        """One work unit per registry feed of this category, run by ``method(feed_name)``."""
+        return [WorkUnit(self.category, method, (spec.name,))
+                for spec in get_feed_registry().feeds_for(self.category)]
+    
+    def _prefetch_feeds(self, units: List[WorkUnit]):
+        """Start fetching the feed units' feeds concurrently; the units then run one by one."""
+        urls = {spec.name: spec.url for spec in get_feed_registry().feeds_for(self.category)}
+        wanted = [urls[unit.args[0]] for unit in units if len(unit.args) == 1 and unit.args[0] in urls]
+        if wanted:
+            self.feed_sweep.prefetch(wanted, self.feeds)
     
     def save_data(self, data: List[Dict], filename: str):
-        """Save scraped data to file."""
+        """Save scraped data in the configured output layout (filename only applies to 'json')."""
         import json
         import os
         
+        if OUTPUT_LAYOUT == 'partitioned':
+            writer = PartitionedWriter(self.category)
+            try:
+                writer.write(data)
+            finally:
+                writer.close()
+            self.logger.info("Data saved to: %s", partition_dir(self.category, datetime.now()))
+            return
+        
         os.makedirs('data', exist_ok=True)
         filepath = f"data/{self.category}_{filename}.json"
         
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
         
-        self.logger.info(f"Data saved to: {filepath}")
+        self.logger.info("Data saved to: %s", filepath)
     
     @abstractmethod
+    def plan(self) -> List[WorkUnit]:
+        """Return the independent work units (one feed, symbol, subreddit...) a scrape consists of."""
+        pass
+    
+    def execute(self, unit: WorkUnit) -> List[AnyRecord]:
+        """Run one work unit; raises WorkUnitError if any of its sources failed.
+        
+        Raises DeadlineExceeded instead if the run's deadline passed before or
+        while the unit ran.
+        """
+        if unit.category != self.category or not unit.method.startswith('scrape_'):
+            raise ValueError(f"{self.category} scraper can't execute {unit.label}")
+        check_deadline(unit.label)
+        self._unit_state.errors = []
+        circuits: List[CircuitOpenError] = []
+        token = _open_circuits.set(circuits)
+        try:
+            result = getattr(self, unit.method)(*unit.args)
+            errors = self._unit_state.errors
+        finally:
+            self._unit_state.errors = None
+            _open_circuits.reset(token)
+        if errors:
+            if expired():
+                raise DeadlineExceeded(f"{unit.label} timed out: {'; '.join(errors)}")
+            raise WorkUnitError(unit, errors, circuits)
+        if result is None:
+            return []
+        return list(result) if isinstance(result, (list, tuple)) else [result]
+    
+    def _run_unit(self, unit: WorkUnit) -> List[AnyRecord]:
+        """execute() a unit, recording its outcome in unit_status instead of raising."""
+        try:
+            records = self.execute(unit)
+        except DeadlineExceeded:
+            self.unit_status[unit.label] = UNIT_TIMED_OUT
+            return []
+        except WorkUnitError:
+            self.unit_status[unit.label] = UNIT_FAILED
+            return []
+        self.unit_status[unit.label] = UNIT_OK
+        return records
+    
+    def iter_scrape(self) -> Iterator[AnyRecord]:
+        """Yield records unit by unit, retrying failed units once the rest are done.
+        
+        Each unit's final outcome is left in ``unit_status`` (label -> status).
+        """
+        self.unit_status = {}
+        units = self.plan()
+        own_sweep = self.feed_sweep is None
+        if own_sweep:
+            self.feed_sweep = FeedSweep()
+        try:
+            self._prefetch_feeds(units)
+            for unit in units:
+                yield from self._run_unit(unit)
+            
+            for attempt in range(UNIT_RETRIES):
+                failed = [unit for unit in units if self.unit_status[unit.label] == UNIT_FAILED]
+                if not failed or expired():
+                    break
+                self.logger.info("Retrying %s failed work units", len(failed))
+                for unit in failed:
+                    yield from self._run_unit(unit)
+        finally:
+            if own_sweep:
+                self.feed_sweep = None
+            self.close()
+    
     def scrape(self) -> List[Dict[str, Any]]:
-        """Main scraping method to be implemented by subclasses."""
+        """Collect iter_scrape() into a list of dicts and save it (compatibility wrapper)."""
+        data = [as_dict(record) for record in self.iter_scrape()]
+        
+        if data and self.output_name:
+            self.save_data(data, f"{self.output_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        
+        return data
+    
+    def close(self):
+        """Release what the scraper keeps open across work units (harvester state, stores).
+        
+        The scraper stays usable; the next unit that needs them reopens them.
+        """
         pass
     
     @abstractmethod
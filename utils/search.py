@@ -0,0 +1,137 @@
+"""
+Local full-text search index over scraped records (SQLite FTS5).
+
+Titles go in one column and descriptions, summaries, abstracts, notes and
+extracted article text in another, so BM25 ranking can weight title hits higher. A plain ``documents``
+table carries category and ``scraped_at`` (indexed) for filtering, and links
+to the FTS rows by rowid.
+"""
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from config.config import SEARCH_INDEX_PATH
+from utils.pipeline import Sink
+from utils.records import AnyRecord, as_dict, natural_key
+from utils.sqlite_store import open_db
+
+BODY_FIELDS = ('description', 'summary', 'abstract', 'notes', 'content')
+
+# BM25 column weights: (title, body)
+TITLE_WEIGHT = 4.0
+BODY_WEIGHT = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT,
+    url TEXT,
+    source TEXT,
+    scraped_at TEXT NOT NULL,
+    UNIQUE (category, key)
+);
+CREATE INDEX IF NOT EXISTS ix_documents_scraped_at ON documents (scraped_at);
+CREATE INDEX IF NOT EXISTS ix_documents_category_scraped_at ON documents (category, scraped_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (title, body, tokenize='porter unicode61');
+"""
+
+_SINCE_PATTERN = re.compile(r'^(\d+)([hdw])$')
+_SINCE_UNITS = {'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+def parse_since(value: str) -> str:
+    """Turn '30d', '12h', '2w' or an ISO date into an ISO timestamp."""
+    match = _SINCE_PATTERN.match(value.strip())
+    if match:
+        amount, unit = match.groups()
+        return (datetime.now() - timedelta(**{_SINCE_UNITS[unit]: int(amount)})).isoformat()
+    return datetime.fromisoformat(value.strip()).isoformat()
+
+def _match_expression(query: str) -> str:
+    """Quote each term so user input can't trip FTS5 query syntax."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms)
+
+class SearchIndex:
+    """Incrementally updated FTS5 index of record titles and text bodies."""
+
+    def __init__(self, path: str = SEARCH_INDEX_PATH):
+        self.conn = open_db(path, _SCHEMA)
+
+    def add(self, category: str, records: Iterable[AnyRecord]) -> int:
+        """Index or re-index records in one transaction; returns the count."""
+        count = 0
+        with self.conn:
+            for record in records:
+                self._add_one(category, record)
+                count += 1
+        return count
+
+    def _add_one(self, category: str, record: AnyRecord):
+        key = natural_key(record)
+        data = as_dict(record)
+        title = data.get('title') or data.get('name') or ''
+        body = '\n'.join(str(data[field]) for field in BODY_FIELDS if data.get(field))
+        url = data.get('url') or data.get('link') or ''
+        scraped_at = data.get('scraped_at') or datetime.now().isoformat()
+        source = str(data.get('source') or '')
+
+        row = self.conn.execute(
+            'SELECT id FROM documents WHERE category = ? AND key = ?', (category, key)
+        ).fetchone()
+        if row:
+            doc_id = row[0]
+            self.conn.execute(
+                'UPDATE documents SET title = ?, url = ?, source = ?, scraped_at = ? WHERE id = ?',
+                (title, url, source, scraped_at, doc_id)
+            )
+            self.conn.execute('DELETE FROM documents_fts WHERE rowid = ?', (doc_id,))
+        else:
+            doc_id = self.conn.execute(
+                'INSERT INTO documents (category, key, title, url, source, scraped_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (category, key, title, url, source, scraped_at)
+            ).lastrowid
+        self.conn.execute(
+            'INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)', (doc_id, title, body)
+        )
+
+    def search(self, query: str, category: Optional[str] = None, since: Optional[str] = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """Return the best-ranked documents matching ``query``, best first (none for a blank query)."""
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        sql = [
+            'SELECT d.category, d.key, d.title, d.url, d.source, d.scraped_at,',
+            f'       bm25(documents_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score,',
+            "       snippet(documents_fts, 1, '[', ']', '...', 12) AS snippet",
+            'FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid',
+            'WHERE documents_fts MATCH ?'
+        ]
+        params: List[Any] = [expression]
+        if category:
+            sql.append('AND d.category = ?')
+            params.append(category)
+        if since:
+            sql.append('AND d.scraped_at >= ?')
+            params.append(since)
+        sql.append('ORDER BY score LIMIT ?')
+        params.append(limit)
+
+        cursor = self.conn.execute('\n'.join(sql), params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def close(self):
+        """Close the index connection."""
+        self.conn.close()
+
+class SearchIndexSink(Sink):
+    """Pipeline sink that keeps the search index current as batches are written."""
+
+    def __init__(self, index: SearchIndex, category: str):
+        self.index = index
+        self.category = category
+
+    def write(self, batch: List[AnyRecord]):
+        self.index.add(self.category, batch)
@@ -0,0 +1,25 @@
+"""
+Opening the SQLite files behind the local caches, mirrors and state stores.
+
+Every store opens its database the same way: the parent directory is
+created, the connection may be used from any thread (stores serialize
+access with their own lock), WAL lets readers run while a sweep writes,
+and the store's schema is created if it doesn't exist yet.
+"""
+import os
+import sqlite3
+from typing import Optional
+
+def open_db(path: str, schema: Optional[str] = None, **connect_args) -> sqlite3.Connection:
+    """Connect to the SQLite file at ``path`` in WAL mode and create ``schema`` (a SQL script)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connect_args.setdefault('check_same_thread', False)
+    conn = sqlite3.connect(path, **connect_args)
+    conn.execute('PRAGMA journal_mode=WAL')
+    # Durable across process crashes in WAL mode; only an OS crash can lose the last commits
+    conn.execute('PRAGMA synchronous=NORMAL')
+    if schema:
+        conn.executescript(schema)
+    return conn
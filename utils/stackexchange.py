@@ -0,0 +1,148 @@
+"""
+Incremental Stack Exchange question harvesting.
+
+Tags are harvested in groups: ``/search/advanced`` ORs the tags in
+``tagged`` (a question needs any one of them), so one query covers a whole
+group. Each query only asks for what changed since that group's watermark:
+``sort=activity`` with ``min`` set to the last activity date seen, oldest
+first, 100 per page. Payloads are trimmed by a custom ``filter`` (created
+once, then remembered) to the fields kept in a ``Post``. The wrapper fields
+are honoured: ``backoff`` pauses further calls for that many seconds,
+paging stops when ``has_more`` is false, and harvesting stops early when
+``quota_remaining`` reaches the reserve. Watermarks advance page by page,
+so a group with a backlog continues where it stopped on the next run.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+import requests
+from config.config import (STACKEXCHANGE_BACKFILL, STACKEXCHANGE_KEY, STACKEXCHANGE_MAX_PAGES,
+                           STACKEXCHANGE_QUOTA_RESERVE, STACKEXCHANGE_SITE, STACKEXCHANGE_STATE_PATH,
+                           STACKEXCHANGE_TAG_GROUP_SIZE)
+from utils.deadline import time_left
+from utils.logger import setup_logger
+from utils.sqlite_store import open_db
+
+API = 'https://api.stackexchange.com/2.3'
+
+# Everything a Post is built from; the filter drops the rest of each question
+FILTER_FIELDS = (
+    '.backoff', '.error_id', '.error_message', '.has_more', '.items', '.quota_max', '.quota_remaining',
+    'question.question_id', 'question.title', 'question.link', 'question.score', 'question.view_count',
+    'question.answer_count', 'question.tags', 'question.creation_date', 'question.last_activity_date',
+    'question.owner', 'shallow_user.display_name'
+)
+
+# tag_state.tag holds a whole group, e.g. 'python;pandas;numpy'
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tag_state (
+    site TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    last_activity INTEGER NOT NULL,
+    PRIMARY KEY (site, tag)
+);
+CREATE TABLE IF NOT EXISTS filters (
+    fields TEXT PRIMARY KEY,
+    filter TEXT NOT NULL
+);
+"""
+
+def tag_groups(tags: List[str], size: int = STACKEXCHANGE_TAG_GROUP_SIZE) -> List[str]:
+    """Split tags into ';'-joined groups of ``size``, each harvested with one ORed query."""
+    return [';'.join(tags[start:start + size]) for start in range(0, len(tags), size)]
+
+class QuotaExhausted(requests.RequestException):
+    """The daily request quota is down to the configured reserve."""
+
+class StackExchangeHarvester:
+    """Per-tag-group incremental question sync sharing one backoff clock and quota."""
+
+    def __init__(self, request: Callable[..., requests.Response], site: str = STACKEXCHANGE_SITE,
+                 key: str = STACKEXCHANGE_KEY, state_path: str = STACKEXCHANGE_STATE_PATH):
+        self.logger = setup_logger('stackexchange')
+        self.request = request
+        self.site = site
+        self.key = key
+        self.state = open_db(state_path, _SCHEMA)
+        self._lock = threading.Lock()
+        self._filter: Optional[str] = None
+        self._not_before = 0.0  # monotonic time the last backoff ends
+        self.quota_remaining: Optional[int] = None
+
+    def _call(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """One API call, waiting out any backoff and recording the quota it reports."""
+        if self.quota_remaining is not None and self.quota_remaining <= STACKEXCHANGE_QUOTA_RESERVE:
+            raise QuotaExhausted(f"Stack Exchange quota down to {self.quota_remaining}")
+        wait = self._not_before - time.monotonic()
+        if wait > 0:
+            left = time_left()
+            if left is not None and wait > left:
+                raise requests.RequestException(f"Stack Exchange backoff of {wait:.0f}s outlasts the deadline")
+            time.sleep(wait)
+
+        if self.key:
+            params = {**params, 'key': self.key}
+        data = self.request(f"{API}/{path}", params).json()
+        if data.get('backoff'):
+            # Applies to the next call of any method; we don't track methods separately
+            self._not_before = time.monotonic() + data['backoff']
+            self.logger.info("Stack Exchange asked for a %ss backoff", data['backoff'])
+        if 'quota_remaining' in data:
+            self.quota_remaining = data['quota_remaining']
+        return data
+
+    def question_filter(self) -> str:
+        """Id of the custom filter for FILTER_FIELDS, created on first use and kept in the state DB."""
+        if self._filter is None:
+            fields = ';'.join(FILTER_FIELDS)
+            row = self.state.execute('SELECT filter FROM filters WHERE fields = ?', (fields,)).fetchone()
+            if row:
+                self._filter = row[0]
+            else:
+                data = self._call('filters/create', {'include': fields, 'base': 'none', 'unsafe': 'false'})
+                self._filter = data['items'][0]['filter']
+                with self.state:
+                    self.state.execute('INSERT OR REPLACE INTO filters (fields, filter) VALUES (?, ?)',
+                                       (fields, self._filter))
+        return self._filter
+
+    def watermark(self, tags: str) -> int:
+        """Last activity date (epoch seconds) synced for a tag group; a backfill window back for new groups."""
+        row = self.state.execute('SELECT last_activity FROM tag_state WHERE site = ? AND tag = ?',
+                                 (self.site, tags)).fetchone()
+        return row[0] if row else int(time.time()) - STACKEXCHANGE_BACKFILL
+
+    def _set_watermark(self, tags: str, value: int):
+        with self._lock, self.state:
+            self.state.execute('INSERT OR REPLACE INTO tag_state (site, tag, last_activity) VALUES (?, ?, ?)',
+                               (self.site, tags, value))
+
+    def questions(self, tags: str) -> List[Dict[str, Any]]:
+        """Questions with any of the ';'-separated ``tags`` and activity since the group's watermark."""
+        since = self.watermark(tags)
+        params = {
+            'site': self.site,
+            'tagged': tags,  # ORed by /search/advanced
+            'sort': 'activity',
+            'order': 'asc',
+            'min': since,  # with sort=activity, min/max bound last_activity_date
+            'pagesize': 100,
+            'filter': self.question_filter()
+        }
+        questions = []
+        for page in range(1, STACKEXCHANGE_MAX_PAGES + 1):
+            data = self._call('search/advanced', {**params, 'page': page})
+            items = data.get('items', [])
+            questions.extend(items)
+            if items:
+                self._set_watermark(tags, max(item.get('last_activity_date', since) for item in items))
+            if not data.get('has_more'):
+                break
+        else:
+            self.logger.info("Tags %s have more than %s pages of activity; continuing next run",
+                             tags, STACKEXCHANGE_MAX_PAGES)
+        return questions
+
+    def close(self):
+        """Close the state database."""
+        self.state.close()
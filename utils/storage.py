@@ -0,0 +1,154 @@
+"""
+SQL storage backend with one table per category and idempotent upserts.
+
+Each record is stored under a natural key (URL, symbol+date, DOI, post ID,
+...). Re-writing an unchanged record only refreshes ``scraped_at``;
+``updated_at`` moves only when the content changes, which is what
+``changed_since`` queries.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+from sqlalchemy import Column, Index, MetaData, String, Table, Text, case, create_engine, event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from config.config import DATABASE_URL, STORAGE_BATCH_SIZE
+from utils.pipeline import Sink
+from utils.records import AnyRecord, as_dict, natural_key
+
+_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert
+}
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Hash a record's content, ignoring when it was scraped."""
+    content = {k: v for k, v in record.items() if k != 'scraped_at'}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+class Storage:
+    """Category tables keyed by natural key, written in batched transactions."""
+
+    def __init__(self, url: str = DATABASE_URL):
+        if url.startswith('sqlite:///'):
+            directory = os.path.dirname(url[len('sqlite:///'):])
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.engine = create_engine(url, future=True)
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine, 'connect', _sqlite_pragmas)
+        self._insert = _INSERTS[self.engine.dialect.name]
+        self.metadata = MetaData()
+        self._tables: Dict[str, Table] = {}
+
+    def table(self, category: str) -> Table:
+        """Return (creating on first use) the table for a category."""
+        if category not in self._tables:
+            table = Table(
+                category, self.metadata,
+                Column('key', String, primary_key=True),
+                Column('source', String),
+                Column('content_hash', String(16), nullable=False),
+                Column('data', Text, nullable=False),
+                Column('first_seen', String, nullable=False),
+                Column('scraped_at', String, nullable=False),
+                Column('updated_at', String, nullable=False),
+                Index(f'ix_{category}_scraped_at', 'scraped_at'),
+                Index(f'ix_{category}_updated_at', 'updated_at')
+            )
+            table.create(self.engine, checkfirst=True)
+            self._tables[category] = table
+        return self._tables[category]
+
+    def upsert(self, category: str, records: Iterable[AnyRecord],
+               batch_size: int = STORAGE_BATCH_SIZE) -> int:
+        """Insert or update records in batches; returns the number written."""
+        table = self.table(category)
+        written = 0
+        batch = []
+        for record in records:
+            batch.append(self._row(record))
+            if len(batch) >= batch_size:
+                written += self._write(table, batch)
+                batch = []
+        if batch:
+            written += self._write(table, batch)
+        return written
+
+    def _row(self, record: AnyRecord) -> Dict[str, Any]:
+        key = natural_key(record)
+        record = as_dict(record)
+        scraped_at = record.get('scraped_at') or datetime.now().isoformat()
+        return {
+            'key': key,
+            'source': str(record.get('source') or ''),
+            'content_hash': content_hash(record),
+            'data': json.dumps(record, ensure_ascii=False, default=str),
+            'first_seen': scraped_at,
+            'scraped_at': scraped_at,
+            'updated_at': scraped_at
+        }
+
+    def _write(self, table: Table, rows: List[Dict[str, Any]]) -> int:
+        # A key may only be upserted once per statement; keep its last version
+        rows = list({row['key']: row for row in rows}.values())
+        stmt = self._insert(table)
+        unchanged = table.c.content_hash == stmt.excluded.content_hash
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                'source': stmt.excluded.source,
+                'content_hash': stmt.excluded.content_hash,
+                'data': stmt.excluded.data,
+                'scraped_at': stmt.excluded.scraped_at,
+                'updated_at': case((unchanged, table.c.updated_at), else_=stmt.excluded.updated_at)
+            }
+        )
+        with self.engine.begin() as conn:
+            conn.execute(stmt, rows)
+        return len(rows)
+
+    def get(self, category: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored record for a natural key, if any."""
+        table = self.table(category)
+        with self.engine.connect() as conn:
+            data = conn.execute(select(table.c.data).where(table.c.key == key)).scalar()
+        return json.loads(data) if data is not None else None
+
+    def latest(self, category: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the most recently scraped records of a category."""
+        table = self.table(category)
+        query = select(table.c.data).order_by(table.c.scraped_at.desc()).limit(limit)
+        with self.engine.connect() as conn:
+            return [json.loads(data) for data in conn.execute(query).scalars()]
+
+    def changed_since(self, category: str, since: Union[str, datetime],
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return records first seen or changed at or after ``since``, oldest change first."""
+        if isinstance(since, datetime):
+            since = since.isoformat()
+        table = self.table(category)
+        query = select(table.c.data).where(table.c.updated_at >= since).order_by(table.c.updated_at)
+        if limit is not None:
+            query = query.limit(limit)
+        with self.engine.connect() as conn:
+            return [json.loads(data) for data in conn.execute(query).scalars()]
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so readers don't block the writer during a sweep."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+class StorageSink(Sink):
+    """Pipeline sink that upserts each batch into the category table."""
+
+    def __init__(self, storage: Storage, category: str):
+        self.storage = storage
+        self.category = category
+
+    def write(self, batch: List[AnyRecord]):
+        self.storage.upsert(self.category, batch)
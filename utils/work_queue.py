@@ -0,0 +1,221 @@
+"""
+Work queue for spreading scraping across processes and machines.
+
+A coordinator enqueues work units (JSON payloads); workers lease one at a
+time, run it and ack it. A lease is only valid for the visibility timeout
+(workers extend it while they run): if a worker dies its unit becomes
+visible again. Failed units are retried with a delay and moved to the
+dead-letter state after ``max_attempts``.
+
+Backends are pluggable by URL scheme. ``sqlite:///path`` (the default) needs
+no external service; any number of worker processes can share the file on
+one machine, and multi-node setups can register another backend with
+``register_backend``.
+"""
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Type
+from config.config import WORK_QUEUE_MAX_ATTEMPTS, WORK_QUEUE_RETRY_DELAY, WORK_QUEUE_URL
+from utils.sqlite_store import open_db
+
+READY = 'ready'
+LEASED = 'leased'
+DONE = 'done'
+DEAD = 'dead'
+
+@dataclass
+class WorkItem:
+    """A leased unit of work."""
+    id: int
+    payload: Dict[str, Any]
+    attempts: int  # includes the current lease; doubles as the lease token
+    max_attempts: int
+
+class QueueBackend(ABC):
+    """Interface every queue backend implements."""
+
+    @abstractmethod
+    def enqueue(self, payloads: Iterable[Dict[str, Any]], max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS) -> int:
+        """Add work units; returns how many were added."""
+
+    @abstractmethod
+    def lease(self, worker: str, visibility_timeout: float) -> Optional[WorkItem]:
+        """Claim the next visible unit for ``visibility_timeout`` seconds, or None."""
+
+    @abstractmethod
+    def extend(self, item: WorkItem, visibility_timeout: float) -> bool:
+        """Push the lease deadline out; False if the lease was lost."""
+
+    @abstractmethod
+    def ack(self, item: WorkItem) -> bool:
+        """Mark a leased unit done; False if the lease was lost meanwhile."""
+
+    @abstractmethod
+    def nack(self, item: WorkItem, error: str, delay: float = WORK_QUEUE_RETRY_DELAY, count_attempt: bool = True):
+        """Fail a leased unit: retry it after ``delay`` or dead-letter it.
+
+        With ``count_attempt`` False the lease doesn't use up an attempt (the
+        unit couldn't run, e.g. its source's circuit was open) and the unit is
+        always retried.
+        """
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """Number of units in each state."""
+
+    @abstractmethod
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        """Dead-lettered units with their last error."""
+
+    @abstractmethod
+    def requeue_dead(self) -> int:
+        """Give dead-lettered units a fresh set of attempts; returns the count."""
+
+    def pending(self) -> int:
+        """Units that are still ready or leased."""
+        counts = self.counts()
+        return counts.get(READY, 0) + counts.get(LEASED, 0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    id INTEGER PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    visible_at REAL NOT NULL,
+    leased_by TEXT,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_work_items_status_visible_at ON work_items (status, visible_at);
+"""
+
+class SQLiteQueue(QueueBackend):
+    """Queue in a SQLite file, safe to share between processes on one host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        open_db(path, _SCHEMA).close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps this usable from any thread or process
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _transaction(self, work):
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = work(conn)
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+            return result
+        finally:
+            conn.close()
+
+    def enqueue(self, payloads: Iterable[Dict[str, Any]], max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS) -> int:
+        now = time.time()
+        rows = [(json.dumps(payload), READY, max_attempts, now, now, now) for payload in payloads]
+        self._transaction(lambda conn: conn.executemany(
+            'INSERT INTO work_items (payload, status, max_attempts, visible_at, created_at, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)', rows
+        ))
+        return len(rows)
+
+    def lease(self, worker: str, visibility_timeout: float) -> Optional[WorkItem]:
+        def claim(conn: sqlite3.Connection) -> Optional[WorkItem]:
+            now = time.time()
+            # Leases that expired on their last attempt belong in the dead-letter state
+            conn.execute(
+                "UPDATE work_items SET status = ?, last_error = COALESCE(last_error, 'visibility timeout expired'), "
+                'updated_at = ? WHERE status = ? AND visible_at <= ? AND attempts >= max_attempts',
+                (DEAD, now, LEASED, now)
+            )
+            row = conn.execute(
+                'SELECT id, payload, attempts, max_attempts FROM work_items '
+                'WHERE status IN (?, ?) AND visible_at <= ? ORDER BY visible_at, id LIMIT 1',
+                (READY, LEASED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            item_id, payload, attempts, max_attempts = row
+            conn.execute(
+                'UPDATE work_items SET status = ?, attempts = ?, visible_at = ?, leased_by = ?, updated_at = ? '
+                'WHERE id = ?',
+                (LEASED, attempts + 1, now + visibility_timeout, worker, now, item_id)
+            )
+            return WorkItem(item_id, json.loads(payload), attempts + 1, max_attempts)
+        return self._transaction(claim)
+
+    def _update_leased(self, item: WorkItem, sql: str, params: tuple) -> bool:
+        """Run an update that only applies while ``item`` still holds its lease."""
+        def update(conn: sqlite3.Connection) -> bool:
+            cursor = conn.execute(f'{sql} WHERE id = ? AND status = ? AND attempts = ?',
+                                  params + (item.id, LEASED, item.attempts))
+            return cursor.rowcount == 1
+        return self._transaction(update)
+
+    def extend(self, item: WorkItem, visibility_timeout: float) -> bool:
+        now = time.time()
+        return self._update_leased(item, 'UPDATE work_items SET visible_at = ?, updated_at = ?',
+                                   (now + visibility_timeout, now))
+
+    def ack(self, item: WorkItem) -> bool:
+        return self._update_leased(item, 'UPDATE work_items SET status = ?, updated_at = ?', (DONE, time.time()))
+
+    def nack(self, item: WorkItem, error: str, delay: float = WORK_QUEUE_RETRY_DELAY, count_attempt: bool = True):
+        now = time.time()
+        status = DEAD if count_attempt and item.attempts >= item.max_attempts else READY
+        attempts = item.attempts if count_attempt else item.attempts - 1
+        self._update_leased(item, 'UPDATE work_items SET status = ?, attempts = ?, visible_at = ?, last_error = ?, '
+                            'updated_at = ?', (status, attempts, now + delay, error, now))
+
+    def counts(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            return dict(conn.execute('SELECT status, COUNT(*) FROM work_items GROUP BY status').fetchall())
+        finally:
+            conn.close()
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT id, payload, attempts, last_error, updated_at FROM work_items WHERE status = ? ORDER BY id',
+                (DEAD,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [{'id': item_id, 'payload': json.loads(payload), 'attempts': attempts,
+                 'last_error': last_error, 'failed_at': updated_at}
+                for item_id, payload, attempts, last_error, updated_at in rows]
+
+    def requeue_dead(self) -> int:
+        now = time.time()
+        cursor = self._transaction(lambda conn: conn.execute(
+            'UPDATE work_items SET status = ?, attempts = 0, visible_at = ?, updated_at = ? WHERE status = ?',
+            (READY, now, now, DEAD)
+        ))
+        return cursor.rowcount
+
+_BACKENDS: Dict[str, Type[QueueBackend]] = {'sqlite': SQLiteQueue}
+
+def register_backend(scheme: str, backend: Type[QueueBackend]):
+    """Make a backend available to ``open_queue`` under a URL scheme."""
+    _BACKENDS[scheme] = backend
+
+def open_queue(url: str = WORK_QUEUE_URL) -> QueueBackend:
+    """Open the queue named by ``scheme://location`` (e.g. sqlite:///data/queue.db)."""
+    scheme, separator, location = url.partition('://')
+    if not separator or scheme not in _BACKENDS:
+        raise ValueError(f"Unsupported work queue URL: {url}")
+    if scheme == 'sqlite':
+        location = location[1:] if location.startswith('/') else location
+    return _BACKENDS[scheme](location)